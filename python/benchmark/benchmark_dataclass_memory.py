@@ -0,0 +1,64 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+"""
+Memory benchmark of decoded generations with __dict__ based, slotted and frozen slotted dataclasses.
+
+Run from the python folder:
+    python -m benchmark.benchmark_dataclass_memory --count 20000
+"""
+
+import argparse
+import gc
+import tracemalloc
+import orjson
+from microsoft_speech_client_common.client_common_dataclass import (
+    dataclass_variant
+)
+from microsoft_speech_client_common.client_common_decoder import (
+    decode_dataclass
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationDefinition
+)
+from benchmark.benchmark_decoder import (
+    build_page
+)
+
+
+def measure_bytes_per_object(values: list, dataclass_type) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    decoded = [decode_dataclass(value, dataclass_type) for value in values]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding the objects is the same for every variant, leave it out.
+    list_bytes = decoded.__sizeof__()
+    del decoded
+    return (after - before - list_bytes) / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    values = orjson.loads(build_page(args.count))["value"]
+    variants = [
+        ("__dict__ dataclass (before)", dataclass_variant(PodcastGenerationDefinition, frozen=False, slots=False)),
+        ("slotted dataclass", PodcastGenerationDefinition),
+        ("frozen slotted dataclass", dataclass_variant(PodcastGenerationDefinition)),
+    ]
+
+    print(f"{args.count} generations, each with nested content, config and output objects")
+    baseline = None
+    for name, dataclass_type in variants:
+        bytes_per_object = measure_bytes_per_object(values, dataclass_type)
+        if baseline is None:
+            baseline = bytes_per_object
+        print(f"{name:<32} {bytes_per_object:10.1f} bytes/generation {bytes_per_object / baseline:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
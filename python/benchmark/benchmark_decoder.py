@@ -0,0 +1,97 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+"""
+Micro-benchmark of the cached dataclass decoder against the previous dict_to_dataclass on large list pages.
+
+Run from the python folder:
+    python -m benchmark.benchmark_decoder --page_size 1000 --repeat 20
+"""
+
+import argparse
+import json
+import time
+import orjson
+from dataclasses import fields, is_dataclass
+from typing import Any, Type
+from microsoft_speech_client_common.client_common_decoder import (
+    decode_json_bytes
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PagedGenerationDefinition, PodcastGenerationDefinition
+)
+
+
+def legacy_dict_to_dataclass(data: dict, dataclass_type: Type[Any]) -> Any:
+    """dict_to_dataclass as it was before the cached decoder, list items stay raw dicts."""
+    if not is_dataclass(dataclass_type):
+        raise ValueError(f"{dataclass_type} is not a dataclass")
+
+    field_names = {field.name: field.type for field in fields(dataclass_type)}
+    filtered_data = {}
+
+    for key, value in data.items():
+        if key in field_names:
+            field_type = field_names[key]
+            if is_dataclass(field_type):
+                filtered_data[key] = legacy_dict_to_dataclass(value, field_type)
+            else:
+                filtered_data[key] = value
+
+    return dataclass_type(**filtered_data)
+
+
+def legacy_decode_items(data: dict) -> PagedGenerationDefinition:
+    """What callers had to do to get decoded items out of the previous dict_to_dataclass."""
+    paged = legacy_dict_to_dataclass(data, PagedGenerationDefinition)
+    paged.value = [legacy_dict_to_dataclass(value, PodcastGenerationDefinition) for value in paged.value]
+    return paged
+
+
+def build_page(page_size: int) -> bytes:
+    return orjson.dumps({
+        "value": [
+            {
+                "id": f"generation_{index}",
+                "displayName": "Generation Name",
+                "description": "Generation Description",
+                "createdDateTime": "2026-01-01T08:00:00.1234567Z",
+                "lastActionDateTime": "2026-01-01T08:05:00Z",
+                "status": "Succeeded",
+                "content": {"url": f"https://account.blob.core.windows.net/input/{index}.pdf", "kind": "AzureStorageBlobPublicUrl"},
+                "config": {"locale": "en-US", "focus": "technology"},
+                "output": {"audioFileUrl": f"https://account.blob.core.windows.net/output/{index}.wav"},
+            }
+            for index in range(page_size)
+        ],
+        "nextLink": "https://eastus.api.cognitive.microsoft.com/podcast/generations?skip=1000",
+    })
+
+
+def measure(name: str, repeat: int, page_size: int, decode):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<48} {elapsed / repeat * 1000:10.2f} ms/page {elapsed / (repeat * page_size) * 1e6:10.2f} us/item")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page_size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    page = build_page(args.page_size)
+    print(f"page size: {args.page_size} items, {len(page)} bytes")
+
+    measure("legacy json + dict_to_dataclass (items raw)", args.repeat, args.page_size,
+            lambda: legacy_dict_to_dataclass(json.loads(page), PagedGenerationDefinition))
+    measure("legacy json + dict_to_dataclass per item", args.repeat, args.page_size,
+            lambda: legacy_decode_items(json.loads(page)))
+    measure("orjson + decode_json_bytes (items decoded)", args.repeat, args.page_size,
+            lambda: decode_json_bytes(page, PagedGenerationDefinition))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+"""
+Benchmark of create request body encoding, the previous orjson.dumps(dataclasses.asdict(...)) path
+against encode_json_bytes, with multi-MB plain text content and with small blob URL bodies.
+
+Run from the python folder:
+    python -m benchmark.benchmark_encoder --text_mb 8 --repeat 20
+"""
+
+import argparse
+import dataclasses
+import time
+import tracemalloc
+import orjson
+import urllib3
+from microsoft_speech_client_common.client_common_encoder import (
+    encode_json_bytes
+)
+from microsoft_speech_client_common.client_common_util import (
+    json_default
+)
+from microsoft_client_podcast.podcast_enum import (
+    ContentSourceKind
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationConfig, PodcastGenerationContent, PodcastGenerationDefinition
+)
+
+
+def build_body(text_mb: int) -> PodcastGenerationDefinition:
+    paragraph = "Podcast generation turns documents into a conversation between two hosts. " * 16 + "\n"
+    text = paragraph * (text_mb * 1024 * 1024 // len(paragraph) + 1)
+    return PodcastGenerationDefinition(
+        displayName="Generation Name",
+        description="Generation Description",
+        content=PodcastGenerationContent(text=text, kind=ContentSourceKind.PlainText),
+        config=PodcastGenerationConfig(locale="en-US", focus="technology"),
+    )
+
+
+def build_url_body() -> PodcastGenerationDefinition:
+    return PodcastGenerationDefinition(
+        displayName="Generation Name",
+        description="Generation Description",
+        content=PodcastGenerationContent(
+            url=urllib3.util.parse_url("https://account.blob.core.windows.net/input/document.pdf?sv=2024-01-01&sig=signature"),
+            kind=ContentSourceKind.AzureStorageBlobPublicUrl),
+        config=PodcastGenerationConfig(locale="en-US"),
+    )
+
+
+def legacy_encode(body: PodcastGenerationDefinition) -> bytes:
+    """Create request encoding as it was before encode_json_bytes."""
+    return orjson.dumps(dataclasses.asdict(body), default=json_default)
+
+
+def measure(name: str, repeat: int, encode):
+    """Print the time per body, and the peak memory of one encoding traced in a separate pass."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode()
+    elapsed = time.perf_counter() - start
+
+    # Traced apart from the timed loop, tracemalloc slows down every allocation.
+    tracemalloc.start()
+    encoded = encode()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_body = f"{elapsed / repeat * 1e6:10.2f} us/body" if elapsed / repeat < 0.001 else f"{elapsed / repeat * 1000:10.2f} ms/body"
+    print(f"{name:<40} {per_body} {peak / 1024:12.1f} KiB peak {len(encoded) / 1024:12.1f} KiB output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--text_mb", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    body = build_body(args.text_mb)
+    print(f"plain text content: {len(body.content.text) / 1024 / 1024:.2f} MiB")
+    measure("orjson + dataclasses.asdict (before)", args.repeat, lambda: legacy_encode(body))
+    measure("encode_json_bytes", args.repeat, lambda: encode_json_bytes(body))
+
+    url_body = build_url_body()
+    print("blob URL content")
+    measure("orjson + dataclasses.asdict (before)", args.repeat * 5000, lambda: legacy_encode(url_body))
+    measure("encode_json_bytes", args.repeat * 5000, lambda: encode_json_bytes(url_body))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+"""
+Benchmark of operation polling over the default HTTP/1.1 transport against Http2Transport.
+
+Both transports poll the same operations from many threads against local stand-in servers that
+answer each GET after a fixed delay, emulating the network round trip. The servers run in a child
+process so they do not compete with the client for the GIL. Reported are the poll throughput and
+latency, and the number of sockets the server accepted. Requires httpx with HTTP/2 support.
+
+Run from the python folder:
+    python -m benchmark.benchmark_http2_transport --operations 2000 --threads 64
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from microsoft_speech_client_common.client_common_http_pool import (
+    HttpPoolConfig
+)
+from microsoft_speech_client_common.client_common_transport import (
+    Http2Transport
+)
+from microsoft_client_podcast.podcast_client import (
+    PodcastClient
+)
+
+
+OPERATION_BODY = b'{"id": "operation", "status": "Running"}'
+
+
+class Http1StandInServer:
+    def __init__(self, delay_seconds: float, accepted_sockets):
+        self.accepted_sockets = accepted_sockets
+        stand_in = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(delay_seconds)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(OPERATION_BODY)))
+                self.end_headers()
+                self.wfile.write(OPERATION_BODY)
+
+        class CountingServer(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 1024
+
+            def get_request(self):
+                request = super().get_request()
+                with stand_in.accepted_sockets.get_lock():
+                    stand_in.accepted_sockets.value += 1
+                return request
+
+        self._server = CountingServer(("127.0.0.1", 0), RequestHandler)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+
+class Http2StandInServer:
+    """Cleartext HTTP/2 server with prior knowledge, every stream answered after the delay."""
+
+    def __init__(self, delay_seconds: float, accepted_sockets):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        self.accepted_sockets = accepted_sockets
+        stand_in = self
+
+        class Http2Protocol(asyncio.Protocol):
+            def connection_made(self, transport):
+                with stand_in.accepted_sockets.get_lock():
+                    stand_in.accepted_sockets.value += 1
+                self.transport = transport
+                self.connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+                self.connection.initiate_connection()
+                self.transport.write(self.connection.data_to_send())
+
+            def data_received(self, data):
+                for event in self.connection.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        asyncio.get_running_loop().call_later(delay_seconds, self.respond, event.stream_id)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        self.transport.close()
+                self.transport.write(self.connection.data_to_send())
+
+            def respond(self, stream_id: int):
+                if self.transport.is_closing():
+                    return
+                self.connection.send_headers(stream_id, [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(OPERATION_BODY))),
+                ])
+                self.connection.send_data(stream_id, OPERATION_BODY, end_stream=True)
+                self.transport.write(self.connection.data_to_send())
+
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            self._loop.create_server(Http2Protocol, "127.0.0.1", 0, backlog=1024))
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    def serve_forever(self):
+        self._loop.run_forever()
+
+
+def run_stand_in_server(server_type, delay_seconds: float, accepted_sockets, ports):
+    server = server_type(delay_seconds, accepted_sockets)
+    ports.put(server.port)
+    server.serve_forever()
+
+
+class StandInServerProcess:
+    def __init__(self, server_type, delay_seconds: float):
+        self.accepted_sockets = multiprocessing.Value("i", 0)
+        ports = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=run_stand_in_server,
+            args=(server_type, delay_seconds, self.accepted_sockets, ports),
+            daemon=True)
+        self._process.start()
+        self.url = f"http://127.0.0.1:{ports.get(timeout=30)}"
+
+    def close(self):
+        self._process.terminate()
+        self._process.join()
+
+
+def measure(name: str, client: PodcastClient, server: StandInServerProcess, operations: int, threads: int):
+    operation_locations = [client.build_operation_url(f"operation_{index}") for index in range(operations)]
+
+    def poll(operation_location) -> float:
+        start = time.perf_counter()
+        success, _, _, _ = client.request_get_operation_with_retry_after(operation_location)
+        if not success:
+            raise RuntimeError(f"Poll of {operation_location} failed")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(poll, operation_locations))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {operations / elapsed:10.0f} polls/s "
+          f"p50 {statistics.median(latencies) * 1000:8.2f} ms "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:8.2f} ms "
+          f"{server.accepted_sockets.value:6} sockets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--delay_ms", type=float, default=20)
+    parser.add_argument("--max_connections", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.operations} polls from {args.threads} threads, {args.delay_ms} ms server delay")
+
+    server = StandInServerProcess(Http1StandInServer, args.delay_ms / 1000)
+    client = PodcastClient(server.url, "key", "2026-01-01-preview", http_pool_config=HttpPoolConfig(maxsize=args.threads))
+    measure("HTTP/1.1 urllib3", client, server, args.operations, args.threads)
+    client.close()
+    server.close()
+
+    server = StandInServerProcess(Http2StandInServer, args.delay_ms / 1000)
+    transport = Http2Transport(max_connections=args.max_connections, prior_knowledge=True)
+    client = PodcastClient(server.url, "key", "2026-01-01-preview", transport=transport)
+    measure("HTTP/2 httpx", client, server, args.operations, args.threads)
+    transport.close()
+    client.close()
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
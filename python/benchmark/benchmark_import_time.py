@@ -0,0 +1,131 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+"""
+Import time benchmark of the CLI and the client packages, guarding a lean import graph.
+
+Each scenario runs in fresh interpreters with -X importtime, several times; reported per
+scenario are the median wall time of the process, the median import time after interpreter
+startup and the modules with the largest cumulative import time of the fastest run. Every
+scenario also lists modules it must not load, such as requests, sqlite3 or http.server on the get/list path: the
+run exits with status 1 when one of them is imported, or when --max_ms is given and a median
+import time exceeds it, so it can gate a change that makes startup heavier again.
+
+Run from the python folder:
+    python -m benchmark.benchmark_import_time --runs 5 --max_ms 150
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+PYTHON_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only the features needing them may load; csv is also loaded by urllib3 itself.
+HEAVY_MODULES = ("requests", "sqlite3", "http.server", "concurrent.futures.process")
+
+# Scenario name: (interpreter arguments, modules the scenario must not import).
+SCENARIOS = {
+    "cli_help": (["main_podcast.py", "--help"], ("urllib3", "orjson", "csv", *HEAVY_MODULES)),
+    "podcast_client": (["-c", "import microsoft_client_podcast.podcast_client"], HEAVY_MODULES),
+    "async_client": (["-c", "import microsoft_client_podcast.podcast_async_client"], HEAVY_MODULES),
+    "router_client": (["-c", "import microsoft_client_podcast.podcast_router_client"], HEAVY_MODULES),
+}
+
+
+def run_importtime(arguments: list[str]) -> tuple[float, list[tuple[str, int, int, int]]]:
+    """
+    Run one fresh interpreter with -X importtime.
+
+    Imports of the interpreter startup, up to and including site with its .pth files, are left
+    out: they depend on the environment, not on the imported code.
+
+    Returns:
+        Wall time in seconds, and (module, depth, self us, cumulative us) of every import
+    """
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", *arguments], cwd=PYTHON_DIRECTORY,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(arguments)} exited with status {process.returncode}: {process.stderr[-2000:]}")
+
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue
+        # Nested imports are indented two spaces per level below the first space.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0 and name.strip() == "site":
+            imports = []
+            continue
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return elapsed, imports
+
+
+def measure(name: str, runs: int, top: int) -> tuple[list[str], float]:
+    """
+    Measure one scenario and print its report.
+
+    Returns:
+        Forbidden modules the scenario imported, and its median total import time in ms
+    """
+    arguments, forbidden = SCENARIOS[name]
+    wall_times = []
+    import_times = []
+    fastest_imports = None
+    for _ in range(runs):
+        elapsed, imports = run_importtime(arguments)
+        import_time = sum(cumulative for _, depth, _, cumulative in imports if depth == 0) / 1000
+        if not import_times or import_time < min(import_times):
+            fastest_imports = imports
+        wall_times.append(elapsed * 1000)
+        import_times.append(import_time)
+
+    median_import_ms = statistics.median(import_times)
+    print(f"{name:<15} wall {statistics.median(wall_times):7.1f} ms  imports {median_import_ms:7.1f} ms  "
+          f"{len(fastest_imports)} modules")
+    for module, _, self_us, cumulative_us in sorted(fastest_imports, key=lambda entry: -entry[3])[:top]:
+        print(f"    {cumulative_us / 1000:7.1f} ms cumulative {self_us / 1000:6.1f} ms self  {module}")
+
+    imported = {module for module, _, _, _ in fastest_imports}
+    return [module for module in forbidden if module in imported], median_import_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma separated scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed per scenario")
+    parser.add_argument("--max_ms", type=float, help="Budget of the median import time of every scenario")
+    args = parser.parse_args()
+
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",")]
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"unknown scenario {scenario}, expected one of {', '.join(SCENARIOS)}")
+
+    violations = []
+    for scenario in scenarios:
+        imported_forbidden, median_import_ms = measure(scenario, args.runs, args.top)
+        for module in imported_forbidden:
+            violations.append(f"{scenario}: imports {module}")
+        if args.max_ms is not None and median_import_ms > args.max_ms:
+            violations.append(f"{scenario}: imports take {median_import_ms:.1f} ms, budget {args.max_ms:.1f} ms")
+
+    for violation in violations:
+        print(f"Violation: {violation}")
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+"""
+End-to-end load benchmark of PodcastClient against the local fake Podcast service.
+
+Each mode creates generations and waits until they terminate at increasing concurrency:
+sync runs create_generation_and_wait_until_terminated on a thread pool, batch runs
+create_generations_in_batch with one shared operation poller, async runs AsyncPodcastClient
+under asyncio, and webhook runs the batch with a WebhookNotificationReceiver the fake POSTs
+completions to, polling only as a fallback. Reported per level are the throughput, p50/p99 latency from submit to terminal
+result, the requests sent per generation, the 429 and 5xx responses injected by the fake, and
+the peak RSS of the client process. The fake runs in a child process.
+
+With --output the results are written as JSON; with --baseline the run is compared to such a
+file and exits with status 1 when throughput or p99 latency regressed by more than
+--max_regression, so it can gate a deploy.
+
+Run from the python folder:
+    python -m benchmark.benchmark_load --modes sync,batch,async --concurrency 4,16,64 --generations 64
+"""
+
+import argparse
+import asyncio
+import orjson
+import resource
+import statistics
+import sys
+import threading
+import time
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from microsoft_speech_client_common.client_common_http_pool import (
+    HttpPoolConfig
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy
+)
+from microsoft_speech_client_common.client_common_notification import (
+    OperationNotificationSource,
+    WebhookNotificationReceiver
+)
+from microsoft_client_podcast.podcast_async_client import (
+    AsyncPodcastClient
+)
+from microsoft_client_podcast.podcast_client import (
+    PodcastClient
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationBatchItem
+)
+from microsoft_client_podcast.podcast_enum import (
+    GenerationIdMode
+)
+from benchmark.fake_podcast_service import (
+    FakePodcastServiceConfig, FakePodcastServiceProcess
+)
+
+
+API_VERSION = "2026-01-01-preview"
+MODES = ("sync", "batch", "async", "webhook")
+
+
+@dataclass(kw_only=True, slots=True)
+class LoadResult:
+    mode: str
+    concurrency: int
+    generations: int
+    succeeded: int
+    seconds: float
+    generations_per_second: float
+    p50_latency_seconds: float
+    p99_latency_seconds: float
+    requests_per_generation: float
+    throttled: int
+    failed: int
+    peak_rss_mb: float
+
+
+class PeakRssSampler:
+    """Samples the resident set size of this process from a background thread."""
+
+    def __init__(self, interval_seconds: float = 0.05):
+        self.interval_seconds = interval_seconds
+        self.peak_bytes = 0
+        self._page_size = resource.getpagesize()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def read_rss_bytes(self) -> int:
+        try:
+            with open("/proc/self/statm") as file:
+                return int(file.read().split()[1]) * self._page_size
+        except OSError:
+            # ru_maxrss is the peak of the whole process lifetime, in KB on Linux and bytes on macOS.
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def __enter__(self) -> "PeakRssSampler":
+        self.peak_bytes = self.read_rss_bytes()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stopped.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.read_rss_bytes())
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_seconds):
+            self.peak_bytes = max(self.peak_bytes, self.read_rss_bytes())
+
+
+def read_service_statistics(http: urllib3.PoolManager, url: str) -> dict:
+    return orjson.loads(http.request("GET", f"{url}/stats").data)["requests"]
+
+
+def build_items(label: str, generations: int) -> list[PodcastGenerationBatchItem]:
+    # Distinct URLs give distinct generation IDs in content mode.
+    return [PodcastGenerationBatchItem(
+        input_file_url=urllib3.util.parse_url(f"https://example.com/load/{label}/input_{index}.txt"),
+        target_locale="en-US") for index in range(generations)]
+
+
+def run_sync(client: PodcastClient, items: list, concurrency: int) -> list[tuple[bool, float]]:
+    def create(item: PodcastGenerationBatchItem) -> tuple[bool, float]:
+        start = time.perf_counter()
+        success, _, _ = client.create_generation_and_wait_until_terminated(item.input_file_url, item.target_locale)
+        return success, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(create, items))
+
+
+def run_batch(client: PodcastClient, items: list, concurrency: int) -> list[tuple[bool, float]]:
+    # Items are consumed lazily, right before their submit.
+    submitted = {}
+
+    def iter_items():
+        for item in items:
+            submitted[str(item.input_file_url)] = time.perf_counter()
+            yield item
+
+    return [(result.success, time.perf_counter() - submitted[str(result.item.input_file_url)])
+            for result in client.create_generations_in_batch(iter_items(), max_concurrency=concurrency)]
+
+
+def run_async(client: AsyncPodcastClient, items: list, concurrency: int) -> list[tuple[bool, float]]:
+    async def run() -> list[tuple[bool, float]]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create(item: PodcastGenerationBatchItem) -> tuple[bool, float]:
+            async with semaphore:
+                start = time.perf_counter()
+                success, _, _ = await client.create_generation_and_wait_until_terminated(
+                    item.input_file_url, item.target_locale)
+                return success, time.perf_counter() - start
+
+        return await asyncio.gather(*[create(item) for item in items])
+
+    return asyncio.run(run())
+
+
+def measure(mode: str, url: str, concurrency: int, generations: int, label: str,
+            polling_policy: OperationPollingPolicy, stats_http: urllib3.PoolManager,
+            notification_source: OperationNotificationSource = None) -> LoadResult:
+    items = build_items(label, generations)
+    http_pool_config = HttpPoolConfig(maxsize=max(concurrency, 10))
+    if mode == "async":
+        client = AsyncPodcastClient(url, "key", API_VERSION, max_workers=concurrency, polling_policy=polling_policy,
+                                    generation_id_mode=GenerationIdMode.Content, http_pool_config=http_pool_config)
+    else:
+        client = PodcastClient(url, "key", API_VERSION, polling_policy=polling_policy,
+                               generation_id_mode=GenerationIdMode.Content, http_pool_config=http_pool_config,
+                               notification_source=notification_source if mode == "webhook" else None)
+
+    requests_before = read_service_statistics(stats_http, url)
+    start = time.perf_counter()
+    with PeakRssSampler() as sampler:
+        if mode == "sync":
+            outcomes = run_sync(client, items, concurrency)
+        elif mode in ["batch", "webhook"]:
+            outcomes = run_batch(client, items, concurrency)
+        else:
+            outcomes = run_async(client, items, concurrency)
+    elapsed = time.perf_counter() - start
+    requests_after = read_service_statistics(stats_http, url)
+    client.close()
+
+    requests = {name: count - requests_before.get(name, 0) for name, count in requests_after.items()}
+    api_requests = sum(count for name, count in requests.items()
+                       if name not in ["throttled", "failed"] and not name.startswith(("audio", "callback")))
+    latencies = sorted(latency for _, latency in outcomes)
+    return LoadResult(
+        mode=mode,
+        concurrency=concurrency,
+        generations=generations,
+        succeeded=sum(1 for success, _ in outcomes if success),
+        seconds=elapsed,
+        generations_per_second=generations / elapsed,
+        p50_latency_seconds=statistics.median(latencies),
+        p99_latency_seconds=latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+        requests_per_generation=api_requests / generations,
+        throttled=requests.get("throttled", 0),
+        failed=requests.get("failed", 0),
+        peak_rss_mb=sampler.peak_bytes / 1024 / 1024)
+
+
+def print_result(result: LoadResult):
+    print(f"{result.mode:<7} {result.concurrency:6} {result.succeeded:5}/{result.generations:<5} "
+          f"{result.generations_per_second:8.2f} gen/s "
+          f"p50 {result.p50_latency_seconds:7.2f} s p99 {result.p99_latency_seconds:7.2f} s "
+          f"{result.requests_per_generation:6.1f} req/gen "
+          f"{result.throttled:5} 429 {result.failed:5} 5xx "
+          f"{result.peak_rss_mb:7.1f} MB")
+
+
+def find_regressions(results: list[LoadResult], baseline: list[dict], max_regression: float) -> list[str]:
+    baseline_results = {(result["mode"], result["concurrency"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        expected = baseline_results.get((result.mode, result.concurrency))
+        if expected is None:
+            continue
+        name = f"{result.mode} at concurrency {result.concurrency}"
+        if result.generations_per_second < expected["generations_per_second"] * (1 - max_regression):
+            regressions.append(f"{name}: throughput {result.generations_per_second:.2f} gen/s, "
+                               f"baseline {expected['generations_per_second']:.2f} gen/s")
+        if result.p99_latency_seconds > expected["p99_latency_seconds"] * (1 + max_regression):
+            regressions.append(f"{name}: p99 latency {result.p99_latency_seconds:.2f} s, "
+                               f"baseline {expected['p99_latency_seconds']:.2f} s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma separated modes: sync, batch, async, webhook")
+    parser.add_argument("--concurrency", default="4,16,64", help="Comma separated concurrency levels")
+    parser.add_argument("--generations", type=int, default=64, help="Generations created per level")
+    parser.add_argument("--poll_interval", type=float, default=0.25)
+    parser.add_argument("--generation_seconds", type=float, default=2)
+    parser.add_argument("--latency_ms", type=float, default=5)
+    parser.add_argument("--throttle_ratio", type=float, default=0)
+    parser.add_argument("--error_ratio", type=float, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--max_regression", type=float, default=0.2,
+                        help="Allowed relative drop of throughput or rise of p99 latency against the baseline")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",")]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode}, expected one of {', '.join(MODES)}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    receiver = WebhookNotificationReceiver() if "webhook" in modes else None
+    service = FakePodcastServiceProcess(FakePodcastServiceConfig(
+        generation_seconds=args.generation_seconds,
+        latency_seconds=args.latency_ms / 1000,
+        throttle_ratio=args.throttle_ratio,
+        error_ratio=args.error_ratio,
+        callback_url=receiver.callback_url if receiver is not None else None))
+    stats_http = urllib3.PoolManager()
+    polling_policy = OperationPollingPolicy.fixed(args.poll_interval)
+    print(f"{args.generations} generations per level, {args.generation_seconds} s each, "
+          f"{args.latency_ms} ms latency, fake service at {service.url}")
+
+    results = []
+    try:
+        for mode in modes:
+            for level, concurrency in enumerate(levels):
+                result = measure(mode, service.url, concurrency, args.generations, f"{mode}_{level}",
+                                 polling_policy, stats_http, notification_source=receiver)
+                print_result(result)
+                results.append(result)
+    finally:
+        stats_http.clear()
+        service.close()
+        if receiver is not None:
+            receiver.close()
+
+    if args.output is not None:
+        with open(args.output, "wb") as file:
+            file.write(orjson.dumps([asdict(result) for result in results], option=orjson.OPT_INDENT_2))
+
+    if args.baseline is not None:
+        with open(args.baseline, "rb") as file:
+            regressions = find_regressions(results, orjson.loads(file.read()), args.max_regression)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+"""
+Local stand-in of the Podcast generations and operations endpoints, for load tests and benchmarks.
+
+Generations are kept in memory and go NotStarted, Running, then Succeeded (or Failed) after
+generation_seconds. Every request can be delayed by latency_seconds, and a share of the requests
+is answered 429 with Retry-After or 503 instead. Lists are paged with nextLink, succeeded
+generations have an audioFileUrl served by the fake, and GET /stats returns request counts.
+With callback_url, the terminal status of every operation is POSTed there as a webhook
+notification, signed with callback_secret, and callback_drop_ratio of them are lost.
+
+Run standalone from the python folder:
+    python -m benchmark.fake_podcast_service --port 8080 --generation_seconds 5
+and point the client at it with --region http://127.0.0.1:8080.
+"""
+
+import argparse
+import hashlib
+import hmac
+import multiprocessing
+import orjson
+import random
+import re
+import threading
+import time
+import urllib3
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+GENERATION_PATH = re.compile(r"^/podcast/generations/([^/]+)$")
+OPERATION_PATH = re.compile(r"^/podcast/operations/([^/]+)$")
+AUDIO_PATH = re.compile(r"^/audio/([^/]+)\.wav$")
+
+
+@dataclass(kw_only=True, slots=True)
+class FakePodcastServiceConfig:
+    generation_seconds: float = 2
+    # Share of the generation time spent NotStarted before Running.
+    not_started_ratio: float = 0.1
+    failure_ratio: float = 0
+    latency_seconds: float = 0
+    throttle_ratio: float = 0
+    error_ratio: float = 0
+    retry_after_seconds: int = 1
+    # Retry-After of Running operations, None to leave the polling interval to the client.
+    operation_retry_after_seconds: int = None
+    page_size: int = 100
+    audio_size: int = 64 * 1024
+    callback_url: str = None
+    callback_secret: str = None
+    callback_drop_ratio: float = 0
+    seed: int = 0
+
+
+class FakePodcastService:
+    """In-memory fake of the Podcast API on a threading HTTP server."""
+
+    def __init__(self,
+                 config: FakePodcastServiceConfig = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        self.config = config if config is not None else FakePodcastServiceConfig()
+        self.generations = {}
+        self.operations = {}
+        self.request_counts = {}
+        self._random = random.Random(self.config.seed)
+        self._audio = bytes(range(256)) * (self.config.audio_size // 256 + 1)
+        self._audio = self._audio[:self.config.audio_size]
+        self._lock = threading.Lock()
+        self._callback_http = urllib3.PoolManager() if self.config.callback_url is not None else None
+
+        service = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_PUT(self):
+                service.handle(self)
+
+            def do_GET(self):
+                service.handle(self)
+
+            def do_HEAD(self):
+                service.handle(self)
+
+            def do_DELETE(self):
+                service.handle(self)
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 1024
+
+        self._server = Server((host, port), RequestHandler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakePodcastService":
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {
+                "requests": dict(self.request_counts),
+                "generations": len(self.generations),
+            }
+
+    def handle(self, handler: BaseHTTPRequestHandler):
+        config = self.config
+        url = urlsplit(handler.path)
+        query = parse_qs(url.query)
+        body = handler.rfile.read(int(handler.headers.get("Content-Length", 0) or 0))
+
+        if url.path == "/stats":
+            return self.send(handler, 200, self.statistics())
+
+        endpoint = self.endpoint_name(handler.command, url.path)
+        with self._lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+            fault = self._random.random()
+        if config.latency_seconds > 0:
+            time.sleep(config.latency_seconds)
+
+        if not endpoint.startswith("audio"):
+            if fault < config.throttle_ratio:
+                self.count("throttled")
+                return self.send(handler, 429, {"error": {"code": "TooManyRequests"}},
+                                 {"Retry-After": str(config.retry_after_seconds)})
+            if fault < config.throttle_ratio + config.error_ratio:
+                self.count("failed")
+                return self.send(handler, 503, {"error": {"code": "ServiceUnavailable"}})
+
+        match = GENERATION_PATH.match(url.path)
+        if match is not None and handler.command == "PUT":
+            return self.create_generation(handler, match.group(1), body, query)
+        if match is not None and handler.command == "GET":
+            generation = self.get_generation(match.group(1), handler)
+            return self.send(handler, 200 if generation is not None else 404, generation or {})
+        if match is not None and handler.command == "DELETE":
+            with self._lock:
+                generation = self.generations.pop(match.group(1), None)
+            return self.send(handler, 204 if generation is not None else 404)
+        if url.path == "/podcast/generations" and handler.command == "GET":
+            return self.list_generations(handler, query)
+
+        match = OPERATION_PATH.match(url.path)
+        if match is not None and handler.command == "GET":
+            with self._lock:
+                generation_id = self.operations.get(match.group(1))
+            generation = self.get_generation(generation_id, handler) if generation_id is not None else None
+            if generation is None:
+                return self.send(handler, 404, {})
+            headers = {}
+            if config.operation_retry_after_seconds is not None and generation["status"] in ["NotStarted", "Running"]:
+                headers["Retry-After"] = str(config.operation_retry_after_seconds)
+            return self.send(handler, 200, {"id": match.group(1), "status": generation["status"]}, headers)
+
+        match = AUDIO_PATH.match(url.path)
+        if match is not None and handler.command in ["GET", "HEAD"]:
+            handler.send_response(200)
+            handler.send_header("Content-Type", "audio/wav")
+            handler.send_header("Content-Length", str(len(self._audio)))
+            handler.end_headers()
+            if handler.command == "GET":
+                handler.wfile.write(self._audio)
+            return
+
+        self.send(handler, 404, {})
+
+    def endpoint_name(self, method: str, path: str) -> str:
+        if GENERATION_PATH.match(path):
+            return f"{method} generation"
+        if OPERATION_PATH.match(path):
+            return f"{method} operation"
+        if AUDIO_PATH.match(path):
+            return f"audio {method}"
+        return f"{method} {path}"
+
+    def count(self, name: str):
+        with self._lock:
+            self.request_counts[name] = self.request_counts.get(name, 0) + 1
+
+    def create_generation(self, handler: BaseHTTPRequestHandler, generation_id: str, body: bytes, query: dict):
+        request = orjson.loads(body) if body else {}
+        operation_id = handler.headers.get("Operation-Id") or str(uuid.uuid4())
+        with self._lock:
+            if generation_id in self.generations:
+                return self.send(handler, 400, {"error": {"code": "BadRequest", "message": f"Generation {generation_id} already exists"}})
+            failed = self._random.random() < self.config.failure_ratio
+            self.generations[generation_id] = {
+                **{key: value for key, value in request.items() if value is not None},
+                "id": generation_id,
+                "createdDateTime": datetime.now(timezone.utc).isoformat(),
+                "_createdTime": time.monotonic(),
+                "_failed": failed,
+            }
+            self.operations[operation_id] = generation_id
+            dropped = self._random.random() < self.config.callback_drop_ratio
+        if self.config.callback_url is not None and not dropped:
+            timer = threading.Timer(self.config.generation_seconds + 0.001, self.post_callback, (operation_id, generation_id))
+            timer.daemon = True
+            timer.start()
+        api_version = query.get("api-version", [""])[0]
+        generation = self.get_generation(generation_id, handler)
+        self.send(handler, 201, generation, {
+            "Operation-Id": operation_id,
+            "Operation-Location": f"{self.url}/podcast/operations/{operation_id}?api-version={api_version}",
+        })
+
+    def post_callback(self, operation_id: str, generation_id: str):
+        generation = self.get_generation(generation_id, None)
+        if generation is None:
+            return
+        body = orjson.dumps({"operationId": operation_id, "status": generation["status"]})
+        headers = {"Content-Type": "application/json"}
+        if self.config.callback_secret is not None:
+            digest = hmac.new(self.config.callback_secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+            headers["X-Notification-Signature"] = f"sha256={digest}"
+        try:
+            self._callback_http.request("POST", self.config.callback_url, body=body, headers=headers, retries=False)
+        except urllib3.exceptions.HTTPError:
+            self.count("callback failed")
+        else:
+            self.count("callback sent")
+
+    def get_generation(self, generation_id: str, handler: BaseHTTPRequestHandler) -> dict:
+        config = self.config
+        with self._lock:
+            generation = self.generations.get(generation_id)
+            if generation is None:
+                return None
+            elapsed = time.monotonic() - generation["_createdTime"]
+            failed = generation["_failed"]
+            generation = {key: value for key, value in generation.items() if not key.startswith("_")}
+
+        if elapsed < config.generation_seconds * config.not_started_ratio:
+            generation["status"] = "NotStarted"
+        elif elapsed < config.generation_seconds:
+            generation["status"] = "Running"
+        elif failed:
+            generation["status"] = "Failed"
+            generation["failureReason"] = "Injected failure"
+        else:
+            generation["status"] = "Succeeded"
+            generation["output"] = {"audioFileUrl": f"{self.url}/audio/{generation_id}.wav"}
+        return generation
+
+    def list_generations(self, handler: BaseHTTPRequestHandler, query: dict):
+        skip = int(query.get("skip", ["0"])[0])
+        page_size = int(query.get("maxPageSize", [str(self.config.page_size)])[0])
+        with self._lock:
+            generation_ids = sorted(self.generations)
+        page = [self.get_generation(generation_id, handler) for generation_id in generation_ids[skip:skip + page_size]]
+        response = {"value": [generation for generation in page if generation is not None]}
+        if skip + page_size < len(generation_ids):
+            api_version = query.get("api-version", [""])[0]
+            response["nextLink"] = (f"{self.url}/podcast/generations?api-version={api_version}"
+                                    f"&skip={skip + page_size}&maxPageSize={page_size}")
+        self.send(handler, 200, response)
+
+    def send(self, handler: BaseHTTPRequestHandler, status: int, body: dict = None, headers: dict = None):
+        data = orjson.dumps(body) if body is not None else b""
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        if data:
+            handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(data)
+
+
+def run_fake_podcast_service(config: FakePodcastServiceConfig, urls):
+    service = FakePodcastService(config)
+    urls.put(service.url)
+    service.serve_forever()
+
+
+class FakePodcastServiceProcess:
+    """FakePodcastService in a child process, so it does not compete with the benchmarked client for the GIL."""
+
+    def __init__(self, config: FakePodcastServiceConfig = None):
+        urls = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=run_fake_podcast_service,
+            args=(config if config is not None else FakePodcastServiceConfig(), urls),
+            daemon=True)
+        self._process.start()
+        self.url = urls.get(timeout=30)
+
+    def close(self):
+        self._process.terminate()
+        self._process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    defaults = FakePodcastServiceConfig()
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name}", type=FakePodcastServiceConfig.__annotations__[name], default=value)
+    args = parser.parse_args()
+
+    config = FakePodcastServiceConfig(**{name: getattr(args, name) for name in asdict(defaults)})
+    service = FakePodcastService(config, host=args.host, port=args.port)
+    print(f"Fake Podcast service listening on {service.url}")
+    service.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
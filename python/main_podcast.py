@@ -2,19 +2,31 @@
 # Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
 
 import argparse
-import json
-import dataclasses
-import uuid
-import urllib3
-from datetime import datetime
-from termcolor import colored
-from microsoft_client_podcast.podcast_client import PodcastClient
+import logging
+import signal
+import threading
+from datetime import timedelta
+from microsoft_client_podcast.podcast_enum import GenerationIdMode, RetentionAgeField
+from microsoft_speech_client_common.client_common_enum import OneApiState
+
+# Only argparse and the enums above are imported up front, so --help and argument errors return
+# before urllib3 is loaded. Each handler imports the client and the features it uses.
+
+logger = logging.getLogger("main_podcast")
 
 
 ARGUMENT_HELP_INPUT_FILE_BLOB_URL = (
     'Input file url, supported formats are .pdf and .txt. '
     'The file should be publicly accessible or accessible with a SAS token.')
 
+ARGUMENT_HELP_INPUT_FILE_PATH = (
+    'Local input file, supported formats are .pdf and .txt. '
+    'The file is streamed to --upload_container_url first, instead of --input_file_url.')
+
+ARGUMENT_HELP_UPLOAD_CONTAINER_URL = (
+    'Azure Storage container URL with a SAS token granting create, write and read, '
+    'local input files are uploaded to it as block blobs.')
+
 ARGUMENT_HELP_TARGET_LOCALE = (
     'The locale of the podcast. Locale code follows BCP-47. You can find the text to speech locale list '
     'here https://learn.microsoft.com/azure/ai-services/speech-service/language-support?tabs=tts.'
@@ -26,22 +38,153 @@ ARGUMENT_HELP_FOCUS = (
 )
 
 def handle_create_generation_and_wait_until_terminated(args):
+    if (args.input_file_url is None) == (args.input_file_path is None):
+        logger.error("Specify exactly one of --input_file_url and --input_file_path")
+        return
+    if args.input_file_path is not None and args.upload_container_url is None:
+        logger.error("--upload_container_url is required with --input_file_path")
+        return
+
+    from microsoft_client_podcast.podcast_client import PodcastClient
+    from microsoft_client_podcast.podcast_content_uploader import AzureBlobContentUploader
+    from microsoft_speech_client_common.client_common_util import dataclass_to_json_string
+    client = PodcastClient(
+        region=args.region,
+        sub_key=args.sub_key,
+        api_version=args.api_version,
+        generation_id_mode=GenerationIdMode(args.generation_id_mode),
+    )
+    try:
+        if args.input_file_path is not None:
+            client.content_uploader = AzureBlobContentUploader(client.http, args.upload_container_url)
+
+        success, error, generation = client.create_generation_and_wait_until_terminated(
+            input_file_url=args.input_file_url,
+            target_locale=args.target_locale,
+            focus=args.focus,
+            input_file_path=args.input_file_path
+        )
+    finally:
+        client.close()
+    if not success:
+        return
+    logger.info("success")
+    print(dataclass_to_json_string(generation))
+
+ARGUMENT_HELP_GENERATION_ID_MODE = (
+    'How generation IDs are built. Timestamp creates a new generation on every run, '
+    'Content derives the ID from the input so rerunning the same input reuses the existing generation.'
+)
+
+ARGUMENT_HELP_BATCH_MANIFEST = (
+    'CSV manifest file with header row: input_file_url,target_locale,focus. '
+    'The focus column is optional.'
+)
+
+def read_generation_batch_manifest(manifest_path):
+    import csv
+    from microsoft_client_podcast.podcast_dataclass import PodcastGenerationBatchItem
+    with open(manifest_path, newline='', encoding='utf-8') as manifest_file:
+        for row in csv.DictReader(manifest_file):
+            yield PodcastGenerationBatchItem(
+                input_file_url=row["input_file_url"],
+                target_locale=row["target_locale"],
+                focus=row.get("focus") or None,
+            )
+
+def handle_create_generations_in_batch(args):
+    from microsoft_client_podcast.podcast_client import PodcastClient
+    from microsoft_client_podcast.podcast_job_ledger import PodcastJobLedger
+    from microsoft_client_podcast.podcast_audio_downloader import PodcastAudioDownloader
+    from microsoft_speech_client_common.client_common_rate_limiter import RateLimiter
+    from microsoft_speech_client_common.client_common_notification import WebhookNotificationReceiver
+    # Categories without a configured rate are not limited.
+    rate_limiter = RateLimiter(
+        create_per_second=args.max_creates_per_second,
+        read_per_second=args.max_reads_per_second,
+        poll_per_second=args.max_polls_per_second,
+        lock_path=args.rate_limit_file,
+    ) if any(rate is not None for rate in [
+        args.max_creates_per_second, args.max_reads_per_second, args.max_polls_per_second]) else None
+    notification_receiver = WebhookNotificationReceiver(
+        host=args.notification_host,
+        port=args.notification_port,
+        secret=args.notification_secret,
+    ) if args.notification_port is not None else None
+    if notification_receiver is not None:
+        logger.info("Receiving operation notifications on port %d", args.notification_port)
     client = PodcastClient(
         region=args.region,
         sub_key=args.sub_key,
         api_version=args.api_version,
+        generation_id_mode=GenerationIdMode(args.generation_id_mode),
+        rate_limiter=rate_limiter,
+        notification_source=notification_receiver,
     )
 
-    success, error, generation = client.create_generation_and_wait_until_terminated(
-        input_file_url=args.input_file_url,
-        target_locale=args.target_locale,
-        focus=args.focus
+    ledger = PodcastJobLedger(args.ledger) if args.ledger is not None else None
+    audio_downloader = PodcastAudioDownloader(client.http, args.output_directory) \
+        if args.output_directory is not None else None
+    try:
+        succeeded_count, failed_count = print_batch_results(client.create_generations_in_batch(
+            items=read_generation_batch_manifest(args.manifest),
+            max_concurrency=args.max_concurrency,
+            ledger=ledger,
+            audio_downloader=audio_downloader))
+    finally:
+        if ledger is not None:
+            ledger.close()
+        if audio_downloader is not None:
+            audio_downloader.close()
+        if notification_receiver is not None:
+            notification_receiver.close()
+    logger.info("Batch completed, succeeded: %d, failed: %d", succeeded_count, failed_count)
+
+def print_batch_results(results):
+    succeeded_count = 0
+    failed_count = 0
+    for result in results:
+        if result.success:
+            succeeded_count += 1
+            logger.info("Generation %s succeeded for %s", result.generation_id, result.item.input_file_url,
+                        extra={"generation_id": result.generation_id, "audio_file_path": result.audio_file_path})
+        else:
+            failed_count += 1
+            logger.error("Generation %s failed for %s with error: %s", result.generation_id, result.item.input_file_url,
+                         result.error, extra={"generation_id": result.generation_id})
+    return succeeded_count, failed_count
+
+def handle_download_generation_audio(args):
+    from microsoft_client_podcast.podcast_client import PodcastClient
+    from microsoft_client_podcast.podcast_audio_downloader import PodcastAudioDownloader
+    client = PodcastClient(
+        region=args.region,
+        sub_key=args.sub_key,
+        api_version=args.api_version,
     )
+    try:
+        success, error, generation = client.request_get_generation(
+            generation_id=args.id,
+        )
+        if not success:
+            logger.error("Failed to request get generation API with error: %s", error)
+            return
+        if generation is None:
+            logger.warning("Generation not found")
+            return
+
+        with PodcastAudioDownloader(client.http, args.output_directory) as audio_downloader:
+            success, error, audio_file_path = audio_downloader.download_generation(generation)
+    finally:
+        client.close()
     if not success:
+        logger.error("Failed to download audio of generation %s with error: %s", args.id, error)
         return
-    print(colored("success", "green"))
+    logger.info("Audio saved to %s", audio_file_path)
 
 def handle_request_get_generation_api(args):
+    from microsoft_client_podcast.podcast_client import PodcastClient
+    from microsoft_speech_client_common.client_common_util import dataclass_to_json_string
     client = PodcastClient(
         region=args.region,
         sub_key=args.sub_key,
@@ -52,32 +195,43 @@ def handle_request_get_generation_api(args):
         generation_id=args.id,
     )
     if not success:
-        print(colored(f"Failed to request get translation API with error: {error}", 'red'))
+        logger.error("Failed to request get generation API with error: %s", error)
         return
     if generation is None:
-        print(colored("Generation not found", 'yellow'))
+        logger.warning("Generation not found")
     else:
-        print(colored("succesfully get generation:", 'green'))
-        json_formatted_str = json.dumps(dataclasses.asdict(generation), indent=2)
+        logger.info("succesfully get generation:")
+        json_formatted_str = dataclass_to_json_string(generation)
         print(json_formatted_str)
 
 def handle_request_list_generations_api(args):
+    from microsoft_client_podcast.podcast_client import PodcastClient
+    from microsoft_speech_client_common.client_common_util import dataclass_to_json_string
     client = PodcastClient(
         region=args.region,
         sub_key=args.sub_key,
         api_version=args.api_version,
     )
 
-    success, error, generations = client.request_list_generations()
+    if args.all:
+        generation_count = 0
+        for generation in client.iter_generations(maxPageSize=args.max_page_size, prefetch=True):
+            generation_count += 1
+            print(dataclass_to_json_string(generation))
+        logger.info("succesfully list %d generations.", generation_count)
+        return
+
+    success, error, generations = client.request_list_generations(maxPageSize=args.max_page_size)
     if not success:
-        print(colored(f"Failed to request list generation API with error: {error}", 'red'))
+        logger.error("Failed to request list generation API with error: %s", error)
         return
-    print(colored("succesfully list generations:", 'green'))
-    json_formatted_str = json.dumps(dataclasses.asdict(generations), indent=2)
+    logger.info("succesfully list generations:")
+    json_formatted_str = dataclass_to_json_string(generations)
     print(json_formatted_str)
 
 
 def handle_request_delete_generation_api(args):
+    from microsoft_client_podcast.podcast_client import PodcastClient
     client = PodcastClient(
         region=args.region,
         sub_key=args.sub_key,
@@ -86,9 +240,100 @@ def handle_request_delete_generation_api(args):
 
     success, error = client.request_delete_generation(args.id)
     if not success:
-        print(colored(f"Failed to request delete generation API with error: {error}", 'red'))
+        logger.error("Failed to request delete generation API with error: %s", error)
         return
-    print(colored("succesfully delete generation.", 'green'))
+    logger.info("succesfully delete generation.")
+
+def handle_collect_garbage(args):
+    from microsoft_client_podcast.podcast_client import PodcastClient
+    from microsoft_client_podcast.podcast_retention import PodcastRetentionPolicy
+    if args.max_age_days is None and args.keep_latest is None:
+        logger.error("Specify --max_age_days, --keep_latest or both")
+        return
+    client = PodcastClient(
+        region=args.region,
+        sub_key=args.sub_key,
+        api_version=args.api_version,
+    )
+
+    policy = PodcastRetentionPolicy(
+        max_age=timedelta(days=args.max_age_days) if args.max_age_days is not None else None,
+        keep_latest=args.keep_latest,
+        statuses=tuple(OneApiState(status) for status in args.statuses.split(',')),
+        age_field=RetentionAgeField(args.age_field),
+    )
+
+    def print_gc_result(result):
+        if args.dry_run:
+            print(f"{result.generation_id}\t{result.status.value}\t{result.timestamp.isoformat()}\t{result.reason}")
+        elif result.deleted:
+            logger.info("Deleted generation %s (%s, %s)", result.generation_id, result.status.value, result.reason)
+
+    summary = client.collect_garbage(
+        policy=policy,
+        dry_run=args.dry_run,
+        max_concurrency=args.max_concurrency,
+        deletes_per_second=args.max_deletes_per_second,
+        maxPageSize=args.max_page_size,
+        result_callback=print_gc_result,
+    )
+    logger.info("%s %d of %d generations (%s), deleted: %d, failed: %d",
+                "Would delete" if summary.dry_run else "Selected",
+                summary.selected, summary.scanned,
+                ", ".join(f"{status}: {count}" for status, count in summary.selected_by_status.items()) or "none",
+                summary.deleted, summary.failed)
+
+def handle_daemon(args):
+    from microsoft_client_podcast.podcast_client import PodcastClient
+    from microsoft_client_podcast.podcast_job_ledger import PodcastJobLedger
+    from microsoft_client_podcast.podcast_gateway import PodcastGateway, PodcastGatewayServer, PodcastGatewaySpool
+    from microsoft_speech_client_common.client_common_rate_limiter import RateLimiter
+    from microsoft_speech_client_common.client_common_notification import WebhookNotificationReceiver
+    # Categories without a configured rate are not limited.
+    rate_limiter = RateLimiter(
+        create_per_second=args.max_creates_per_second,
+        read_per_second=args.max_reads_per_second,
+        poll_per_second=args.max_polls_per_second,
+        lock_path=args.rate_limit_file,
+    ) if any(rate is not None for rate in [
+        args.max_creates_per_second, args.max_reads_per_second, args.max_polls_per_second]) else None
+    notification_receiver = WebhookNotificationReceiver(
+        host=args.notification_host,
+        port=args.notification_port,
+        secret=args.notification_secret,
+    ) if args.notification_port is not None else None
+    client = PodcastClient(
+        region=args.region,
+        sub_key=args.sub_key,
+        api_version=args.api_version,
+        generation_id_mode=GenerationIdMode(args.generation_id_mode),
+        rate_limiter=rate_limiter,
+        notification_source=notification_receiver,
+    )
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+    ledger = PodcastJobLedger(args.ledger)
+    gateway = PodcastGateway(client, ledger, max_concurrency=args.max_concurrency)
+    server = PodcastGatewayServer(gateway, host=args.host, port=args.port, unix_socket_path=args.unix_socket)
+    spool = PodcastGatewaySpool(gateway, args.spool_directory) if args.spool_directory is not None else None
+    logger.info("Gateway listening on %s%s, ledger %s", server.url,
+                f", spool directory {args.spool_directory}" if spool is not None else "", args.ledger)
+    try:
+        while not stopped.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info("Stopping gateway, unfinished jobs resume on the next start")
+        if spool is not None:
+            spool.close()
+        server.close()
+        gateway.close()
+        ledger.close()
+        if notification_receiver is not None:
+            notification_receiver.close()
+        client.close()
 
 
 root_parser = argparse.ArgumentParser(
@@ -100,6 +345,10 @@ root_parser = argparse.ArgumentParser(
 root_parser.add_argument("--region", required=True, help="specify speech resource region.")
 root_parser.add_argument("--sub_key", required=True, help="specify speech resource subscription key.")
 root_parser.add_argument("--api_version", required=True, help="specify API version.")
+root_parser.add_argument("--log_level", required=False, default="INFO",
+                         choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="specify log level, DEBUG logs every request.")
+root_parser.add_argument("--log_format", required=False, default="text",
+                         choices=["text", "json"], help="specify log format, json writes one JSON object per line.")
 sub_parsers = root_parser.add_subparsers(required=True, help='subcommand help')
 
 translate_parser = sub_parsers.add_parser(
@@ -107,20 +356,119 @@ translate_parser = sub_parsers.add_parser(
     help='Create podcast generation with pdf/txt file blob url.')
 
 translate_parser.add_argument('--input_file_url', required=False, type=str, help=ARGUMENT_HELP_INPUT_FILE_BLOB_URL)
+translate_parser.add_argument('--input_file_path', required=False, type=str, help=ARGUMENT_HELP_INPUT_FILE_PATH)
+translate_parser.add_argument('--upload_container_url', required=False, type=str, help=ARGUMENT_HELP_UPLOAD_CONTAINER_URL)
 translate_parser.add_argument('--target_locale', required=True, type=str, help=ARGUMENT_HELP_TARGET_LOCALE)
 translate_parser.add_argument('--focus', required=False, type=str, help=ARGUMENT_HELP_FOCUS)
+translate_parser.add_argument('--generation_id_mode', required=False, type=str, default=GenerationIdMode.Timestamp.value,
+                              choices=[mode.value for mode in GenerationIdMode], help=ARGUMENT_HELP_GENERATION_ID_MODE)
 translate_parser.set_defaults(func=handle_create_generation_and_wait_until_terminated)
 
+translate_parser = sub_parsers.add_parser(
+    'create_generations_in_batch',
+    help='Create podcast generations for every row of a manifest with bounded concurrency.')
+translate_parser.add_argument('--manifest', required=True, type=str, help=ARGUMENT_HELP_BATCH_MANIFEST)
+translate_parser.add_argument('--max_concurrency', required=False, type=int, default=8,
+                              help='Maximum number of generations running at the same time.')
+translate_parser.add_argument('--ledger', required=False, type=str,
+                              help='SQLite job ledger file. Rerunning the batch with the same ledger resumes it without duplicate generations.')
+translate_parser.add_argument('--generation_id_mode', required=False, type=str, default=GenerationIdMode.Timestamp.value,
+                              choices=[mode.value for mode in GenerationIdMode], help=ARGUMENT_HELP_GENERATION_ID_MODE)
+translate_parser.add_argument('--output_directory', required=False, type=str,
+                              help='Download the audio of succeeded generations to this directory while the batch runs.')
+translate_parser.add_argument('--max_creates_per_second', required=False, type=float,
+                              help='Client-side rate limit of creates, creates above it wait instead of being throttled by the service.')
+translate_parser.add_argument('--max_reads_per_second', required=False, type=float,
+                              help='Client-side rate limit of gets, lists and deletes, unlimited by default.')
+translate_parser.add_argument('--max_polls_per_second', required=False, type=float,
+                              help='Client-side rate limit of operation polls, unlimited by default.')
+translate_parser.add_argument('--rate_limit_file', required=False, type=str,
+                              help='File sharing the rate limits with other batches running on this machine.')
+translate_parser.add_argument('--notification_port', required=False, type=int,
+                              help='Receive operation completion webhooks POSTed to /notifications on this port, and poll only as a fallback.')
+translate_parser.add_argument('--notification_host', required=False, type=str, default='127.0.0.1',
+                              help='Interface the webhooks are received on, any other than loopback requires --notification_secret.')
+translate_parser.add_argument('--notification_secret', required=False, type=str,
+                              help='Shared secret the webhook bodies are signed with, see X-Notification-Signature.')
+translate_parser.set_defaults(func=handle_create_generations_in_batch)
+
 translate_parser = sub_parsers.add_parser('get', help='Request get generation API.')
 translate_parser.add_argument('--id', required=True, type=str, help='Generation ID.')
 translate_parser.set_defaults(func=handle_request_get_generation_api)
 
+translate_parser = sub_parsers.add_parser('download', help='Download the audio of a succeeded generation.')
+translate_parser.add_argument('--id', required=True, type=str, help='Generation ID.')
+translate_parser.add_argument('--output_directory', required=False, type=str, default='.',
+                              help='Directory the audio file is written to, an interrupted download is resumed.')
+translate_parser.set_defaults(func=handle_download_generation_audio)
+
 translate_parser = sub_parsers.add_parser('list', help='Request list generations API.')
+translate_parser.add_argument('--all', action='store_true', help='List all generations by following nextLink page by page.')
+translate_parser.add_argument('--max_page_size', required=False, type=int, help='Maximum number of generations per page.')
 translate_parser.set_defaults(func=handle_request_list_generations_api)
 
 translate_parser = sub_parsers.add_parser('delete', help='Request delete generation API.')
 translate_parser.add_argument('--id', required=True, type=str, help='Generation ID.')
 translate_parser.set_defaults(func=handle_request_delete_generation_api)
 
-args = root_parser.parse_args()
-args.func(args)
+translate_parser = sub_parsers.add_parser('gc', help='Delete generations by retention policy: age, status and number kept.')
+translate_parser.add_argument('--max_age_days', required=False, type=float,
+                              help='Delete generations older than this many days.')
+translate_parser.add_argument('--keep_latest', required=False, type=int,
+                              help='Keep only this many of the newest matching generations, delete the older ones.')
+translate_parser.add_argument('--statuses', required=False, type=str,
+                              default=f'{OneApiState.Succeeded.value},{OneApiState.Failed.value}',
+                              help='Comma separated statuses of the generations that may be deleted.')
+translate_parser.add_argument('--age_field', required=False, type=str, default=RetentionAgeField.CreatedDateTime.value,
+                              choices=[field.value for field in RetentionAgeField],
+                              help='Timestamp the age of a generation is measured from.')
+translate_parser.add_argument('--dry_run', action='store_true',
+                              help='Print the generations that would be deleted without deleting them.')
+translate_parser.add_argument('--max_concurrency', required=False, type=int, default=8,
+                              help='Maximum number of deletes in flight.')
+translate_parser.add_argument('--max_deletes_per_second', required=False, type=float,
+                              help='Rate limit of the deletes.')
+translate_parser.add_argument('--max_page_size', required=False, type=int, help='Maximum number of generations per list page.')
+translate_parser.set_defaults(func=handle_collect_garbage)
+
+translate_parser = sub_parsers.add_parser(
+    'daemon',
+    help='Run a local gateway queueing generation jobs submitted over HTTP or a spool directory, with one shared client.')
+translate_parser.add_argument('--ledger', required=False, type=str, default='podcast_gateway.sqlite',
+                              help='SQLite job ledger of the gateway, deduplicating jobs and resuming them after a restart.')
+translate_parser.add_argument('--host', required=False, type=str, default='127.0.0.1', help='Interface the HTTP API listens on.')
+translate_parser.add_argument('--port', required=False, type=int, default=8765, help='Port the HTTP API listens on.')
+translate_parser.add_argument('--unix_socket', required=False, type=str,
+                              help='Serve the HTTP API on this Unix socket instead of --host and --port.')
+translate_parser.add_argument('--spool_directory', required=False, type=str,
+                              help='Also take job files dropped in this directory, results are written to its results folder.')
+translate_parser.add_argument('--max_concurrency', required=False, type=int, default=8,
+                              help='Maximum number of generations running at the same time.')
+translate_parser.add_argument('--generation_id_mode', required=False, type=str, default=GenerationIdMode.Content.value,
+                              choices=[mode.value for mode in GenerationIdMode], help=ARGUMENT_HELP_GENERATION_ID_MODE)
+translate_parser.add_argument('--max_creates_per_second', required=False, type=float,
+                              help='Client-side rate limit of generation creates.')
+translate_parser.add_argument('--max_reads_per_second', required=False, type=float,
+                              help='Client-side rate limit of gets, lists and deletes, unlimited by default.')
+translate_parser.add_argument('--max_polls_per_second', required=False, type=float,
+                              help='Client-side rate limit of operation polls, unlimited by default.')
+translate_parser.add_argument('--rate_limit_file', required=False, type=str,
+                              help='File sharing the rate limits with other processes on this machine.')
+translate_parser.add_argument('--notification_port', required=False, type=int,
+                              help='Receive operation completion webhooks POSTed to /notifications on this port, and poll only as a fallback.')
+translate_parser.add_argument('--notification_host', required=False, type=str, default='127.0.0.1',
+                              help='Interface the webhooks are received on, any other than loopback requires --notification_secret.')
+translate_parser.add_argument('--notification_secret', required=False, type=str,
+                              help='Shared secret the webhook bodies are signed with, see X-Notification-Signature.')
+translate_parser.set_defaults(func=handle_daemon)
+
+
+def main():
+    args = root_parser.parse_args()
+    from microsoft_speech_client_common.client_common_logging import configure_logging
+    configure_logging(level=logging.getLevelName(args.log_level), json_output=args.log_format == "json")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
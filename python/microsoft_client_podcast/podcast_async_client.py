@@ -0,0 +1,190 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import asyncio
+import urllib3
+from typing import TYPE_CHECKING, AsyncIterator
+from urllib3.util import Url
+from microsoft_speech_client_common.client_common_async_client_base import (
+    AsyncSpeechLongRunningTaskClientBase
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy
+)
+from microsoft_speech_client_common.client_common_resource_cache import (
+    ResourceCache
+)
+from microsoft_speech_client_common.client_common_decoder import (
+    decode_dataclass
+)
+from microsoft_client_podcast.podcast_enum import (
+    GenerationIdMode
+)
+from microsoft_speech_client_common.client_common_http_pool import (
+    HttpPoolConfig
+)
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport
+)
+from microsoft_speech_client_common.client_common_retry_policy import (
+    RetryPolicy
+)
+from microsoft_speech_client_common.client_common_rate_limiter import (
+    RateLimiter
+)
+from microsoft_speech_client_common.client_common_events import (
+    ClientEventHooks
+)
+from microsoft_speech_client_common.client_common_notification import (
+    OperationNotificationSource
+)
+from microsoft_client_podcast.podcast_client import (
+    PodcastClient
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationDefinition, PagedGenerationDefinition
+)
+
+if TYPE_CHECKING:
+    from microsoft_client_podcast.podcast_content_uploader import (
+        PodcastContentUploader
+    )
+
+
+class AsyncPodcastClient(AsyncSpeechLongRunningTaskClientBase):
+    """Asyncio counterpart of PodcastClient, sharing its request building and decoding."""
+
+    def __init__(self,
+                 region,
+                 sub_key,
+                 api_version,
+                 max_workers: int = 32,
+                 polling_policy: OperationPollingPolicy = None,
+                 generation_cache: ResourceCache = None,
+                 generation_id_mode: GenerationIdMode = GenerationIdMode.Timestamp,
+                 content_uploader: "PodcastContentUploader" = None,
+                 http_pool_config: HttpPoolConfig = None,
+                 http: urllib3.PoolManager = None,
+                 transport: HttpTransport = None,
+                 retry_policy: RetryPolicy = None,
+                 rate_limiter: RateLimiter = None,
+                 hooks: ClientEventHooks = None,
+                 notification_source: OperationNotificationSource = None):
+        super().__init__(
+            client=PodcastClient(
+                region=region,
+                sub_key=sub_key,
+                api_version=api_version,
+                polling_policy=polling_policy,
+                generation_cache=generation_cache,
+                generation_id_mode=generation_id_mode,
+                content_uploader=content_uploader,
+                # Size the connection pool for the worker threads unless configured.
+                http_pool_config=http_pool_config if http_pool_config is not None else HttpPoolConfig(maxsize=max_workers),
+                http=http,
+                transport=transport,
+                retry_policy=retry_policy,
+                rate_limiter=rate_limiter,
+                hooks=hooks,
+                notification_source=notification_source),
+            max_workers=max_workers
+        )
+
+    async def create_generation_and_wait_until_terminated(
+        self,
+        input_file_url: Url,
+        target_locale: str,
+        focus: str = None,
+        input_file_path: str = None
+    ) -> tuple[bool, str, PodcastGenerationDefinition]:
+        if input_file_path is not None:
+            success, error, input_file_url = await self.run_in_executor(self.client.upload_input_file, input_file_path)
+            if not success:
+                return False, error, None
+        if input_file_url is None or target_locale is None:
+            raise ValueError
+
+        success, error, generation_id, operation_location = await self.run_in_executor(
+            self.client.submit_generation,
+            input_file_url=input_file_url,
+            target_locale=target_locale,
+            focus=focus)
+        if not success:
+            return False, error, None
+
+        await self.request_operation_until_terminated(operation_location)
+
+        success, error, response_generation = await self.request_get_generation(generation_id)
+        return self.client.evaluate_terminated_generation(
+            generation_id=generation_id,
+            success=success,
+            error=error,
+            response_generation=response_generation)
+
+    async def request_get_generation(self,
+                                     generation_id: str) -> tuple[bool, str, PodcastGenerationDefinition]:
+        return await self.run_in_executor(self.client.request_get_generation, generation_id)
+
+    async def request_list_generations(self,
+                                       top: int = None,
+                                       skip: int = None,
+                                       maxPageSize: int = None) -> tuple[bool, str, PagedGenerationDefinition]:
+        return await self.run_in_executor(
+            self.client.request_list_generations,
+            top=top,
+            skip=skip,
+            maxPageSize=maxPageSize)
+
+    async def iter_generations(self,
+                               maxPageSize: int = None,
+                               prefetch: bool = False) -> AsyncIterator[PodcastGenerationDefinition]:
+        """
+        Asynchronously iterate over all generations, following nextLink page by page.
+
+        Args:
+            maxPageSize: Maximum number of generations per page
+            prefetch: Whether to request the next page while the current one is being consumed
+
+        Returns:
+            Async iterator of generations
+        """
+        url = self.client.build_generations_page_url(maxPageSize=maxPageSize)
+        next_page_task = None
+        try:
+            while url is not None:
+                if next_page_task is not None:
+                    success, error, page_values, url = await next_page_task
+                else:
+                    success, error, page_values, url = await self.request_list_page_with_url(url)
+                if not success:
+                    raise RuntimeError(f"Failed to request list generation API with error: {error}")
+
+                next_page_task = None
+                if prefetch and url is not None:
+                    next_page_task = asyncio.ensure_future(self.request_list_page_with_url(url))
+
+                for page_value in page_values:
+                    yield decode_dataclass(
+                        data=page_value,
+                        dataclass_type=PodcastGenerationDefinition)
+        finally:
+            if next_page_task is not None:
+                next_page_task.cancel()
+
+    async def request_delete_generation(self,
+                                        generation_id: str) -> tuple[bool, str]:
+        return await self.run_in_executor(self.client.request_delete_generation, generation_id)
+
+    async def request_create_generation(
+            self,
+            generation_id: str,
+            request_body: PodcastGenerationDefinition,
+            operation_id: str = None,
+            retryable: bool = False,
+            ) -> tuple[bool, str, PodcastGenerationDefinition, Url]:
+        return await self.run_in_executor(
+            self.client.request_create_generation,
+            generation_id=generation_id,
+            request_body=request_body,
+            operation_id=operation_id,
+            retryable=retryable)
@@ -0,0 +1,268 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import os
+import orjson
+import threading
+import urllib3
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_ACCEPT_RANGES,
+    HTTP_HEADERS_CONTENT_LENGTH,
+    HTTP_HEADERS_ETAG,
+    HTTP_HEADERS_RANGE
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationDefinition
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+class PodcastAudioDownloader:
+    """
+    Parallel, resumable downloader of generation output audio.
+
+    Bodies are streamed to disk chunk by chunk. Files served with Accept-Ranges are resumed from a
+    .part file after a failure, and files of at least two segments are downloaded as concurrent
+    Range requests, with finished segments recorded next to the .part file so a resumed download
+    only fetches the missing ones. The final file length is checked against Content-Length before
+    the .part file is renamed.
+    """
+
+    PART_FILE_SUFFIX = ".part"
+    STATE_FILE_SUFFIX = ".part.json"
+    DEFAULT_AUDIO_FILE_EXTENSION = ".wav"
+
+    def __init__(self,
+                 http: urllib3.PoolManager,
+                 output_directory: str = ".",
+                 max_workers: int = 4,
+                 max_segments_per_file: int = 4,
+                 segment_size: int = 8 * 1024 * 1024,
+                 chunk_size: int = 64 * 1024):
+        """
+        Initialize the downloader.
+
+        Args:
+            http: Connection pool to download with, usually the http pool of the client
+            output_directory: Directory audio files are written to, created if missing
+            max_workers: Maximum number of files downloaded at the same time
+            max_segments_per_file: Maximum number of concurrent Range requests per file, 1 disables segmented download
+            segment_size: Size of one Range request of a segmented download
+            chunk_size: Size of the chunks streamed from the response to disk
+        """
+        if http is None:
+            raise ValueError("http is required")
+        if max_workers is None or max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if max_segments_per_file is None or max_segments_per_file <= 0:
+            raise ValueError("max_segments_per_file must be positive")
+        if segment_size is None or segment_size <= 0 or chunk_size is None or chunk_size <= 0:
+            raise ValueError("segment_size and chunk_size must be positive")
+
+        self.http = http
+        self.output_directory = output_directory
+        self.max_segments_per_file = max_segments_per_file
+        self.segment_size = segment_size
+        self.chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="podcast-audio-download")
+        # Segments run on their own pool, a file download waiting for its segments must not hold the workers they need.
+        self._segment_executor = ThreadPoolExecutor(
+            max_workers=max_workers * max_segments_per_file,
+            thread_name_prefix="podcast-audio-segment") if max_segments_per_file > 1 else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        if self._segment_executor is not None:
+            self._segment_executor.shutdown(wait=True)
+
+    def submit(self, generation: PodcastGenerationDefinition) -> Future:
+        """Download the audio of a generation in the background, the future resolves to (success, error, file_path)."""
+        return self._executor.submit(self.download_generation, generation)
+
+    def build_audio_file_path(self, generation: PodcastGenerationDefinition) -> str:
+        audio_file_url = urllib3.util.parse_url(str(generation.output.audioFileUrl))
+        _, extension = os.path.splitext(audio_file_url.path or "")
+        return os.path.join(self.output_directory, f"{generation.id}{extension or self.DEFAULT_AUDIO_FILE_EXTENSION}")
+
+    def download_generation(self, generation: PodcastGenerationDefinition) -> tuple[bool, str, str]:
+        if generation is None or generation.id is None:
+            raise ValueError
+        if generation.output is None or generation.output.audioFileUrl is None:
+            return False, f"Generation {generation.id} has no output audio", None
+
+        return self.download(str(generation.output.audioFileUrl), self.build_audio_file_path(generation))
+
+    def download(self,
+                 url: str,
+                 file_path: str) -> tuple[bool, str, str]:
+        """
+        Download url to file_path, resuming a previous partial download of the same file.
+
+        Returns:
+            Tuple of (success, error, file_path)
+        """
+        if url is None or file_path is None:
+            raise ValueError
+
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        try:
+            response = self.http.request("HEAD", url)
+            if response.status == 200:
+                length = response.headers.get(HTTP_HEADERS_CONTENT_LENGTH)
+                length = int(length) if length is not None else None
+                accepts_ranges = response.headers.get(HTTP_HEADERS_ACCEPT_RANGES, "").lower() == "bytes"
+                etag = response.headers.get(HTTP_HEADERS_ETAG)
+            else:
+                # Some storage endpoints reject HEAD, download without resume in that case.
+                length, accepts_ranges, etag = None, False, None
+
+            if length is not None and os.path.isfile(file_path) and os.path.getsize(file_path) == length:
+                return True, None, file_path
+
+            if accepts_ranges and length is not None and self._segment_executor is not None and \
+                    length >= 2 * self.segment_size:
+                success, error = self._download_segmented(url, file_path, length, etag)
+            else:
+                success, error = self._download_sequential(url, file_path, length, accepts_ranges)
+        except (urllib3.exceptions.HTTPError, OSError) as exception:
+            success, error = False, str(exception)
+
+        if not success:
+            logger.error("Failed to download %s to %s with error: %s", url, file_path, error)
+            return False, error, None
+
+        os.replace(file_path + self.PART_FILE_SUFFIX, file_path)
+        logger.info("Downloaded %s to %s", url, file_path)
+        return True, None, file_path
+
+    def _download_sequential(self,
+                             url: str,
+                             file_path: str,
+                             length: Optional[int],
+                             accepts_ranges: bool) -> tuple[bool, str]:
+        part_path = file_path + self.PART_FILE_SUFFIX
+        # A segmented download state does not describe a sequentially written .part file.
+        self._remove_file(file_path + self.STATE_FILE_SUFFIX)
+        offset = os.path.getsize(part_path) if accepts_ranges and os.path.isfile(part_path) else 0
+        if length is not None and offset > length:
+            offset = 0
+        if length is not None and offset == length and offset > 0:
+            return True, None
+
+        headers = {HTTP_HEADERS_RANGE: f"bytes={offset}-"} if offset > 0 else {}
+        response = self.http.request("GET", url, headers=headers, preload_content=False)
+        try:
+            if response.status == 200:
+                offset = 0
+            elif response.status != 206:
+                return False, response.reason
+
+            with open(part_path, "r+b" if offset > 0 else "wb") as part_file:
+                part_file.seek(offset)
+                for chunk in response.stream(self.chunk_size):
+                    part_file.write(chunk)
+                written_length = part_file.tell()
+        finally:
+            response.release_conn()
+
+        if length is not None and written_length != length:
+            return False, f"Downloaded {written_length} bytes, expected {length}"
+        return True, None
+
+    def _download_segmented(self,
+                            url: str,
+                            file_path: str,
+                            length: int,
+                            etag: Optional[str]) -> tuple[bool, str]:
+        part_path = file_path + self.PART_FILE_SUFFIX
+        state_path = file_path + self.STATE_FILE_SUFFIX
+
+        done_segments = set()
+        state = self._read_state(state_path)
+        if state is not None and state.get("length") == length and state.get("etag") == etag and \
+                os.path.isfile(part_path) and os.path.getsize(part_path) == length:
+            done_segments.update(state.get("doneSegments", []))
+        else:
+            with open(part_path, "wb") as part_file:
+                part_file.truncate(length)
+
+        segment_count = (length + self.segment_size - 1) // self.segment_size
+        state_lock = threading.Lock()
+
+        def download_segment(index: int) -> tuple[bool, str]:
+            success, error = self._download_segment(url, part_path, index, length)
+            if success:
+                with state_lock:
+                    done_segments.add(index)
+                    self._write_state(state_path, {"length": length, "etag": etag, "doneSegments": sorted(done_segments)})
+            return success, error
+
+        futures = [self._segment_executor.submit(download_segment, index)
+                   for index in range(segment_count) if index not in done_segments]
+        errors = [error for success, error in (future.result() for future in futures) if not success]
+        if len(errors) > 0:
+            return False, errors[0]
+
+        if os.path.getsize(part_path) != length:
+            return False, f"Downloaded {os.path.getsize(part_path)} bytes, expected {length}"
+        self._remove_file(state_path)
+        return True, None
+
+    def _download_segment(self,
+                          url: str,
+                          part_path: str,
+                          index: int,
+                          length: int) -> tuple[bool, str]:
+        start = index * self.segment_size
+        end = min(start + self.segment_size, length) - 1
+        try:
+            response = self.http.request("GET", url, headers={HTTP_HEADERS_RANGE: f"bytes={start}-{end}"},
+                                         preload_content=False)
+            try:
+                if response.status != 206:
+                    return False, f"Range request of segment {index} returned {response.status} {response.reason}"
+                with open(part_path, "r+b") as part_file:
+                    part_file.seek(start)
+                    for chunk in response.stream(self.chunk_size):
+                        part_file.write(chunk)
+                    written_length = part_file.tell() - start
+            finally:
+                response.release_conn()
+        except (urllib3.exceptions.HTTPError, OSError) as exception:
+            return False, str(exception)
+
+        if written_length != end - start + 1:
+            return False, f"Segment {index} has {written_length} bytes, expected {end - start + 1}"
+        return True, None
+
+    def _read_state(self, state_path: str) -> Optional[dict]:
+        try:
+            with open(state_path, "rb") as state_file:
+                return orjson.loads(state_file.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def _write_state(self, state_path: str, state: dict):
+        temporary_path = state_path + ".tmp"
+        with open(temporary_path, "wb") as state_file:
+            state_file.write(orjson.dumps(state))
+        os.replace(temporary_path, state_path)
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -4,65 +4,507 @@
 import urllib3
 import orjson
 import uuid
-import requests
-import locale
-import json
+import hashlib
 import dataclasses
-from termcolor import colored
 from datetime import datetime
 from urllib3.util import Url
 from microsoft_speech_client_common.client_common_const import (
-    HTTP_HEADERS_OPERATION_LOCATION
+    HTTP_HEADERS_OPERATION_LOCATION,
+    HTTP_HEADERS_ETAG,
+    HTTP_HEADERS_IF_NONE_MATCH
 )
 from microsoft_speech_client_common.client_common_enum import (
-    OperationStatus
+    OperationStatus, OneApiState
 )
-from microsoft_client_podcast.podcast_enum import (
-    ContentSourceKind
+from microsoft_speech_client_common.client_common_http_pool import (
+    HttpPoolConfig
 )
-from microsoft_client_podcast.podcast_dataclass import (
-    ContentSourceKind
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport
+)
+from microsoft_speech_client_common.client_common_retry_policy import (
+    RetryPolicy
+)
+from microsoft_speech_client_common.client_common_rate_limiter import (
+    RateLimiter
+)
+from microsoft_speech_client_common.client_common_events import (
+    ClientEventHooks
+)
+from microsoft_speech_client_common.client_common_notification import (
+    OperationNotificationSource
+)
+from microsoft_speech_client_common.client_common_resource_cache import (
+    ResourceCache
+)
+from microsoft_client_podcast.podcast_enum import (
+    ContentSourceKind, GenerationIdMode
 )
 from microsoft_speech_client_common.client_common_dataclass import (
     OperationDefinition
 )
 from microsoft_speech_client_common.client_common_util import (
-    dict_to_dataclass, append_url_args
+    append_url_args
+)
+from microsoft_speech_client_common.client_common_decoder import (
+    decode_dataclass, decode_json_bytes
 )
 from microsoft_speech_client_common.client_common_client_base import (
     SpeechLongRunningTaskClientBase
 )
 from microsoft_client_podcast.podcast_dataclass import (
-    PodcastGenerationDefinition, PodcastGenerationContent, PodcastGenerationConfig, PodcastGenerationOutput, PagedGenerationDefinition
+    PodcastGenerationDefinition, PodcastGenerationContent, PodcastGenerationConfig, PodcastGenerationOutput, PagedGenerationDefinition,
+    PodcastGenerationBatchItem, PodcastGenerationBatchResult
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy
+)
+from microsoft_speech_client_common.client_common_logging import (
+    LazyJson,
+    get_logger
 )
-import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import functools
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+# Batch, ledger, download, upload and retention support is imported where it is used, so the
+# get/list/delete paths do not load sqlite3 or http.server.
+if TYPE_CHECKING:
+    from microsoft_speech_client_common.client_common_operation_poller import (
+        OperationPoller
+    )
+    from microsoft_client_podcast.podcast_job_ledger import (
+        PodcastJobLedger, PodcastJobLedgerRecord
+    )
+    from microsoft_client_podcast.podcast_audio_downloader import (
+        PodcastAudioDownloader
+    )
+    from microsoft_client_podcast.podcast_content_uploader import (
+        PodcastContentUploader
+    )
+    from microsoft_client_podcast.podcast_retention import (
+        PodcastGcResult, PodcastGcSummary, PodcastRetentionPolicy
+    )
+
+
+logger = get_logger(__name__)
+
+
+class PodcastGenerationWorkflowMixin:
+    """
+    Generation workflows of PodcastClient and PodcastRouterClient, built on their request methods.
+
+    Classes using the mixin provide submit_generation, build_generation_id, build_operation_id,
+    build_generation_operation_url, create_generation_creation_body, upload_input_file, request_get_generation,
+    request_delete_generation, iter_generations, request_operation_until_terminated, and the
+    resolve_polling_policy, hooks, polling_statistics and request_get_operation_with_retry_after
+    used by OperationPoller.
+    """
+
+    def create_generation_and_wait_until_terminated(
+        self,
+        input_file_url: Url,
+        target_locale: str,
+        focus: str = None,
+        input_file_path: str = None
+    ) -> tuple[bool, str, PodcastGenerationDefinition]:
+        """
+        Create a generation and wait until it terminates.
+
+        The input is either input_file_url, or a local input_file_path uploaded with the
+        content uploader of the client first.
+        """
+        if input_file_path is not None:
+            success, error, input_file_url = self.upload_input_file(input_file_path)
+            if not success:
+                return False, error, None
+        if input_file_url is None or target_locale is None:
+            raise ValueError
+
+        success, error, generation_id, operation_location = self.submit_generation(
+            input_file_url=input_file_url,
+            target_locale=target_locale,
+            focus=focus)
+        if not success:
+            return False, error, None
+
+        self.request_operation_until_terminated(operation_location)
+
+        success, error, response_generation = self.request_get_generation(generation_id)
+        return self.evaluate_terminated_generation(
+            generation_id=generation_id,
+            success=success,
+            error=error,
+            response_generation=response_generation)
+
+    def create_generations_in_batch(
+        self,
+        items: Iterable[PodcastGenerationBatchItem],
+        max_concurrency: int = 8,
+        operation_poller: "OperationPoller" = None,
+        ledger: "PodcastJobLedger" = None,
+        audio_downloader: "PodcastAudioDownloader" = None
+    ) -> Iterator[PodcastGenerationBatchResult]:
+        """
+        Create podcast generations for many inputs and yield each result as soon as it terminates.
+
+        At most max_concurrency generations are in flight at any time; all of them are watched
+        by one operation poller, and a new item is submitted whenever one finishes.
+
+        With a ledger, every create, status transition and result is recorded, and items the
+        ledger already knows are not created again: terminated ones are reported from the
+        service, unfinished ones are polled again. Running the same batch with the same ledger
+        therefore resumes a batch run that died.
+
+        With an audio downloader, the audio of each succeeded generation is downloaded in the
+        background while the remaining generations are polled, and the result is yielded once
+        its audio file is on disk.
+
+        Args:
+            items: Batch items to generate, consumed lazily
+            max_concurrency: Maximum number of generations running at the same time
+            operation_poller: Optional poller shared with other callers, one is created for the batch if not provided
+            ledger: Optional job ledger making the batch resumable
+            audio_downloader: Optional downloader of the output audio of succeeded generations
+
+        Returns:
+            Iterator of batch results in completion order
+        """
+        if items is None:
+            raise ValueError
+        if max_concurrency is None or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+
+        owns_poller = operation_poller is None
+        if owns_poller:
+            from microsoft_speech_client_common.client_common_operation_poller import OperationPoller
+            operation_poller = OperationPoller(client=self)
+
+        try:
+            pending_items = enumerate(items)
+            in_flight = {}
+            downloading = {}
+            items_exhausted = False
+            while True:
+                while not items_exhausted and len(in_flight) < max_concurrency:
+                    index, item = next(pending_items, (None, None))
+                    if item is None:
+                        items_exhausted = True
+                        break
+
+                    job_key = ledger.build_job_key(item) if ledger is not None else None
+                    record = ledger.find_job(job_key) if ledger is not None else None
+                    if record is not None and record.submitted:
+                        generation_id = record.generation_id
+                        if record.terminated:
+                            result = self.build_batch_result(
+                                item=item,
+                                generation_id=generation_id,
+                                operation_result=(True, None, OperationDefinition(id=record.operation_id, status=record.status)))
+                            self.record_batch_result(ledger, job_key, result)
+                            if audio_downloader is not None and result.success:
+                                downloading[audio_downloader.submit(result.generation)] = result
+                            else:
+                                yield result
+                            continue
+                        logger.info("Resuming generation %s from ledger %s", generation_id, ledger.path)
+                        operation_location = urllib3.util.parse_url(record.operation_location)
+                    else:
+                        success, error, generation_id, operation_location = self.submit_ledger_job(
+                            item=item,
+                            suffix=str(index),
+                            ledger=ledger,
+                            job_key=job_key,
+                            record=record)
+                        if not success:
+                            yield PodcastGenerationBatchResult(
+                                item=item,
+                                success=False,
+                                generation_id=generation_id,
+                                error=error)
+                            continue
+
+                    status_callback = None
+                    if ledger is not None:
+                        status_callback = functools.partial(self.record_batch_status, ledger, job_key)
+                    future = operation_poller.register(operation_location, status_callback=status_callback)
+                    in_flight[future] = (item, generation_id, job_key)
+
+                if not in_flight and not downloading:
+                    return
+
+                done_futures, _ = wait([*in_flight, *downloading], return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    if future in downloading:
+                        result = downloading.pop(future)
+                        success, error, result.audio_file_path = future.result()
+                        if not success:
+                            result.success = False
+                            result.error = f"Failed to download audio of generation {result.generation_id}: {error}"
+                        yield result
+                        continue
+
+                    item, generation_id, job_key = in_flight.pop(future)
+                    result = self.build_batch_result(
+                        item=item,
+                        generation_id=generation_id,
+                        operation_result=future.result())
+                    if ledger is not None:
+                        self.record_batch_result(ledger, job_key, result)
+                    if audio_downloader is not None and result.success:
+                        downloading[audio_downloader.submit(result.generation)] = result
+                    else:
+                        yield result
+        finally:
+            if owns_poller:
+                operation_poller.close()
+
+    def submit_ledger_job(
+        self,
+        item: PodcastGenerationBatchItem,
+        suffix: str,
+        ledger: "PodcastJobLedger" = None,
+        job_key: str = None,
+        record: "PodcastJobLedgerRecord" = None
+    ) -> tuple[bool, str, str, Url]:
+        """
+        Create the generation of a batch item, recording the create in the ledger.
+
+        The generation ID and Operation-Id are recorded before the create is sent. When record
+        shows such a create interrupted by a crash, the generation is looked up first and only
+        created again, with the same IDs, if the service does not have it.
+
+        Args:
+            item: Batch item to generate
+            suffix: Suffix of the generation ID in GenerationIdMode.Timestamp
+            ledger: Optional job ledger
+            job_key: Ledger key of the item
+            record: Ledger record of the item, if any
+
+        Returns:
+            Tuple of (success, error_message, generation_id, operation_location)
+        """
+        if record is not None and record.submitting:
+            generation_id, operation_id = record.generation_id, record.operation_id
+            success, _, existing_generation = self.request_get_generation(generation_id)
+            if success and existing_generation is not None:
+                logger.info("Generation %s of an interrupted create exists, resuming it.", generation_id)
+                operation_location = self.build_generation_operation_url(generation_id, operation_id)
+                ledger.record_submitted(job_key, generation_id, operation_id, operation_location)
+                return True, None, generation_id, operation_location
+        else:
+            generation_id = self.build_generation_id(
+                target_locale=item.target_locale,
+                suffix=suffix,
+                request_body=self.create_generation_creation_body(
+                    input_file_url=item.input_file_url,
+                    target_locale=item.target_locale,
+                    focus=item.focus))
+            operation_id = self.build_operation_id(generation_id)
+
+        if ledger is not None:
+            ledger.record_submitting(job_key, generation_id, operation_id)
+        success, error, generation_id, operation_location = self.submit_generation(
+            input_file_url=item.input_file_url,
+            target_locale=item.target_locale,
+            focus=item.focus,
+            generation_id=generation_id,
+            operation_id=operation_id)
+        if ledger is not None:
+            if success:
+                ledger.record_submitted(job_key, generation_id, operation_id, operation_location)
+            else:
+                ledger.record_submit_failed(job_key, generation_id, operation_id, error)
+        return success, error, generation_id, operation_location
+
+    def record_batch_status(self,
+                            ledger: "PodcastJobLedger",
+                            job_key: str,
+                            operation: OperationDefinition):
+        # Terminal statuses are recorded with the generation result.
+        if operation.status in [OperationStatus.NotStarted, OperationStatus.Running]:
+            ledger.record_status(job_key, operation.status)
+
+    def record_batch_result(self,
+                            ledger: "PodcastJobLedger",
+                            job_key: str,
+                            result: PodcastGenerationBatchResult):
+        generation = result.generation
+        if generation is not None:
+            output_url = generation.output.audioFileUrl if generation.output is not None else None
+            ledger.record_status(job_key, generation.status, output_url=output_url, error=result.error)
+        elif result.error is not None:
+            ledger.record_status(job_key, OperationStatus.Failed, error=result.error)
+
+    def build_batch_result(
+        self,
+        item: PodcastGenerationBatchItem,
+        generation_id: str,
+        operation_result: tuple[bool, str, OperationDefinition]
+    ) -> PodcastGenerationBatchResult:
+        success, error, response_operation = operation_result
+        # An unknown operation is not final, the generation itself tells whether it terminated.
+        if not success:
+            return PodcastGenerationBatchResult(
+                item=item,
+                success=False,
+                generation_id=generation_id,
+                error=error)
+
+        success, error, response_generation = self.request_get_generation(generation_id)
+        success, error, response_generation = self.evaluate_terminated_generation(
+            generation_id=generation_id,
+            success=success,
+            error=error,
+            response_generation=response_generation)
+        return PodcastGenerationBatchResult(
+            item=item,
+            success=success,
+            generation_id=generation_id,
+            error=error,
+            generation=response_generation)
+
+    def evaluate_terminated_generation(
+            self,
+            generation_id: str,
+            success: bool,
+            error: str,
+            response_generation: PodcastGenerationDefinition,
+            ) -> tuple[bool, str, PodcastGenerationDefinition]:
+        if not success:
+            logger.error("Failed to query generation %s with error: %s", generation_id, error)
+            return False, error, None
+        if response_generation is None:
+            error = f"Generation {generation_id} not found"
+            logger.error("Generation %s not found", generation_id)
+            return False, error, None
+        if response_generation.status != OperationStatus.Succeeded:
+            logger.error("Generation %s failed with error: %s", generation_id, response_generation.failureReason)
+            logger.debug("Generation %s: %s", generation_id, LazyJson(response_generation))
+            return False, response_generation.failureReason, None
+
+        logger.info("Successfully generated podcast %s", generation_id)
+        logger.debug("Generation %s: %s", generation_id, LazyJson(response_generation))
+
+        return True, None, response_generation
 
+    def collect_garbage(self,
+                        policy: "PodcastRetentionPolicy",
+                        dry_run: bool = False,
+                        max_concurrency: int = 8,
+                        deletes_per_second: float = None,
+                        maxPageSize: int = None,
+                        result_callback: Callable[["PodcastGcResult"], None] = None) -> "PodcastGcSummary":
+        """
+        Delete the generations selected by a retention policy, streaming the generation list.
 
-class PodcastClient(SpeechLongRunningTaskClientBase):
+        Args:
+            policy: Retention policy by age, status and count of generations to keep
+            dry_run: Only report the generations that would be deleted
+            max_concurrency: Maximum number of deletes in flight
+            deletes_per_second: Optional rate limit of the deletes
+            maxPageSize: Maximum number of generations per list page
+            result_callback: Optional function called with every selected generation, after its delete
+
+        Returns:
+            Summary of the scanned, selected, deleted and failed generations
+        """
+        from microsoft_client_podcast.podcast_retention import collect_generation_garbage
+        return collect_generation_garbage(
+            generations=self.iter_generations(maxPageSize=maxPageSize, prefetch=True),
+            delete_generation=self.request_delete_generation,
+            policy=policy,
+            dry_run=dry_run,
+            max_concurrency=max_concurrency,
+            deletes_per_second=deletes_per_second,
+            result_callback=result_callback)
+
+
+class PodcastClient(PodcastGenerationWorkflowMixin, SpeechLongRunningTaskClientBase):
     URL_PATH_ROOT = "podcast"
     URL_SEGMENT_NAME_GENERATIONS = "generations"
 
-    def __init__(self, region, sub_key, api_version):
+    CONTENT_GENERATION_ID_HASH_LENGTH = 40
+
+    generation_cache = None
+    content_uploader = None
+    generation_id_mode = GenerationIdMode.Timestamp
+
+    def __init__(self,
+                 region,
+                 sub_key,
+                 api_version,
+                 polling_policy: OperationPollingPolicy = None,
+                 generation_cache: ResourceCache = None,
+                 generation_id_mode: GenerationIdMode = GenerationIdMode.Timestamp,
+                 content_uploader: "PodcastContentUploader" = None,
+                 http_pool_config: HttpPoolConfig = None,
+                 http: urllib3.PoolManager = None,
+                 transport: HttpTransport = None,
+                 retry_policy: RetryPolicy = None,
+                 rate_limiter: RateLimiter = None,
+                 hooks: ClientEventHooks = None,
+                 notification_source: OperationNotificationSource = None):
+        """
+        Initialize the podcast client.
+
+        Args:
+            region: Azure region of the speech resource, or the service root URL
+            sub_key: Subscription key for authentication
+            api_version: API version to use
+            polling_policy: How operations are polled, adaptive backoff by default
+            generation_cache: Optional cache of request_get_generation results, disabled by default
+            generation_id_mode: How generation IDs are built, GenerationIdMode.Content makes creates idempotent
+            content_uploader: Optional storage target local input files are uploaded to
+            http_pool_config: Settings of the connection pool created for this client
+            http: Pool manager shared with other clients, see create_http_pool
+            transport: Transport of the API requests, see Http2Transport
+            retry_policy: Retries, retry budget and circuit breakers of the API requests
+            rate_limiter: Optional client-side rate limits of creates, reads and operation polls
+            hooks: Listeners of requests, retries and operation status changes, see PrometheusExporter
+            notification_source: Optional source of operation notifications replacing most polls, see WebhookNotificationReceiver
+        """
+        self.generation_cache = generation_cache
+        self.generation_id_mode = generation_id_mode
+        self.content_uploader = content_uploader
         super().__init__(
             region=region,
             sub_key=sub_key,
             api_version=api_version,
             service_url_segment_name=self.URL_PATH_ROOT,
-            long_running_tasks_url_segment_name=self.URL_SEGMENT_NAME_GENERATIONS
+            long_running_tasks_url_segment_name=self.URL_SEGMENT_NAME_GENERATIONS,
+            polling_policy=polling_policy,
+            http_pool_config=http_pool_config,
+            http=http,
+            transport=transport,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            hooks=hooks,
+            notification_source=notification_source
         )
 
-    def create_generation_and_wait_until_terminated(
+    def upload_input_file(self, input_file_path: str) -> tuple[bool, str, Url]:
+        """Stream a local PDF/TXT file to the content uploader, returning the URL to create the generation with."""
+        if self.content_uploader is None:
+            raise ValueError("content_uploader is required to create generations from local files")
+        return self.content_uploader.upload(input_file_path)
+
+    def submit_generation(
         self,
         input_file_url: Url,
-        target_locale: locale,
-        focus: str = None
-    ) -> tuple[bool, str, PodcastGenerationDefinition]:
+        target_locale: str,
+        focus: str = None,
+        generation_id: str = None,
+        operation_id: str = None
+    ) -> tuple[bool, str, str, Url]:
+        """
+        Create a generation without waiting, returning its ID and operation location.
+
+        In GenerationIdMode.Content, an existing generation with the same ID is reused instead of
+        being created again, see request_create_generation_idempotent.
+        """
         if input_file_url is None or target_locale is None:
             raise ValueError
-        
-        now = datetime.now()
-        nowString = now.strftime("%m%d%Y%H%M%S")
-        generation_id = f"{nowString}_{target_locale}"
 
         request_body = self.create_generation_creation_body(
             input_file_url=input_file_url,
@@ -70,41 +512,168 @@ class PodcastClient(SpeechLongRunningTaskClientBase):
             focus=focus
         )
 
-        success, error, response_generation, operation_location = self.request_create_generation(
-            generation_id=generation_id,
-            request_body=request_body)
+        if generation_id is None:
+            generation_id = self.build_generation_id(target_locale, request_body=request_body)
+        if operation_id is None:
+            operation_id = self.build_operation_id(generation_id)
+
+        if self.generation_id_mode == GenerationIdMode.Content:
+            success, error, response_generation, operation_location = self.request_create_generation_idempotent(
+                generation_id=generation_id,
+                request_body=request_body,
+                operation_id=operation_id)
+        else:
+            success, error, response_generation, operation_location = self.request_create_generation(
+                generation_id=generation_id,
+                request_body=request_body,
+                operation_id=operation_id)
         if not success:
-            print(colored(f"Failed to create generation with ID {generation_id} with error: {error}",
-                          'red'))
-            return False, error, None
+            logger.error("Failed to create generation with ID %s with error: %s", generation_id, error)
+            return False, error, generation_id, None
+        return True, None, generation_id, operation_location
 
-        self.request_operation_until_terminated(operation_location)
+    def build_generation_id(self,
+                            target_locale: str,
+                            suffix: str = None,
+                            request_body: PodcastGenerationDefinition = None) -> str:
+        if self.generation_id_mode == GenerationIdMode.Content and request_body is not None:
+            return self.build_content_generation_id(request_body)
 
-        success, error, response_generation = self.request_get_generation(generation_id)
-        if not success:
-            print(colored(f"Failed to query generation {generation_id} with error: {error}", 'red'))
-            return False, error, None
-        generation = json.dumps(dataclasses.asdict(response_generation), indent=2)
-        if response_generation.status != OperationStatus.Succeeded:
-            print(colored(f"Generation creation failed with error: {error}", 'red'))
-            print(generation)
-            return False, response_generation.FailureReason, None
-        else:
-            print(colored(f"Succesfully generated podcast:", 'green'))
-            print(generation)
+        now = datetime.now()
+        nowString = now.strftime("%m%d%Y%H%M%S")
+        if suffix is not None:
+            return f"{nowString}_{suffix}_{target_locale}"
+        return f"{nowString}_{target_locale}"
 
-        return True, None, response_generation
+    def build_content_generation_id(self,
+                                    request_body: PodcastGenerationDefinition) -> str:
+        """Generation ID derived from the content source, locale, focus and config of a creation request."""
+        content = request_body.content
+        config = request_body.config
+        content_key = {
+            "kind": content.kind,
+            "url": str(content.url) if content.url is not None else None,
+            "textSha256": hashlib.sha256(content.text.encode('utf-8')).hexdigest() if content.text is not None else None,
+            "config": dataclasses.asdict(config) if config is not None else None,
+        }
+        digest = hashlib.sha256(orjson.dumps(content_key, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        locale_name = config.locale if config is not None else ""
+        return f"{digest[:self.CONTENT_GENERATION_ID_HASH_LENGTH]}_{locale_name}"
+
+    def build_operation_id(self,
+                           generation_id: str) -> str:
+        """Operation-Id of a create, derived from the generation ID in content mode so retries reuse it."""
+        if self.generation_id_mode == GenerationIdMode.Content:
+            return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{self.URL_PATH_ROOT}/{self.URL_SEGMENT_NAME_GENERATIONS}/{generation_id}"))
+        return str(uuid.uuid4())
+
+    def build_generation_operation_url(self,
+                                       generation_id: str,
+                                       operation_id: str) -> Url:
+        """Operation URL of an existing generation created with operation_id."""
+        return self.build_operation_url(operation_id)
+
+    def request_create_generation_idempotent(
+            self,
+            generation_id: str,
+            request_body: PodcastGenerationDefinition,
+            operation_id: str,
+            ) -> tuple[bool, str, PodcastGenerationDefinition, Url]:
+        """
+        Create a generation unless it already exists, retrying failed creates with the same Operation-Id.
+
+        The PUT is retried by the retry policy, up to its max_create_attempts. The generation is
+        looked up before the PUT and once more if it failed, so a create that reached the service
+        before failing on the client side costs a GET instead of a failed generation. Existing
+        generations are returned with the operation URL of operation_id.
+        """
+        if generation_id is None or operation_id is None:
+            raise ValueError
+
+        success, error, existing_generation = self.request_get_generation(generation_id)
+        if success and existing_generation is not None:
+            logger.info("Generation %s already exists, reusing it.", generation_id)
+            return True, None, existing_generation, self.build_operation_url(operation_id)
+
+        try:
+            # The generation ID and operation_id identify this create, the retry policy may repeat it.
+            success, error, response_generation, operation_location = self.request_create_generation(
+                generation_id=generation_id,
+                request_body=request_body,
+                operation_id=operation_id,
+                retryable=True)
+        except urllib3.exceptions.HTTPError as exception:
+            success, error = False, str(exception)
+        if success:
+            return True, None, response_generation, operation_location
+
+        logger.warning("Create of generation %s failed with error: %s", generation_id, error)
+        get_success, _, existing_generation = self.request_get_generation(generation_id)
+        if get_success and existing_generation is not None:
+            return True, None, existing_generation, self.build_operation_url(operation_id)
+        return False, error, None, None
 
     def request_get_generation(self,
                                 generation_id: str) -> tuple[bool, str, PodcastGenerationDefinition]:
+        if self.generation_cache is not None:
+            return self.request_get_generation_with_cache(generation_id)
+
         success, error, response = self.request_get_long_running_task(generation_id)
         if not success:
             return False, error, None
-        response_translation_json = response.json()
-        response_translation = dict_to_dataclass(
-            data=response_translation_json,
+        if response is None:
+            return True, None, None
+        response_translation = decode_json_bytes(
+            data=response.data,
             dataclass_type=PodcastGenerationDefinition)
         return True, None, response_translation
+
+    def request_get_generation_with_cache(self,
+                                          generation_id: str) -> tuple[bool, str, PodcastGenerationDefinition]:
+        """
+        Query a generation through the generation cache.
+
+        Fresh cached generations are returned without a request, stale ones are revalidated with
+        If-None-Match when the service returned an ETag for them.
+        """
+        if generation_id is None:
+            raise ValueError
+
+        hit, entry = self.generation_cache.lookup(generation_id)
+        if hit:
+            return True, None, entry.resource
+
+        additional_headers = None
+        if entry is not None and entry.etag is not None:
+            additional_headers = {HTTP_HEADERS_IF_NONE_MATCH: entry.etag}
+        success, error, response = self.request_get_long_running_task(
+            generation_id,
+            additional_headers=additional_headers)
+        if not success:
+            return False, error, None
+        if response is None:
+            self.generation_cache.invalidate(generation_id)
+            return True, None, None
+
+        if response.status == 304 and entry is not None:
+            self.generation_cache.revalidated(
+                generation_id,
+                terminal=self.is_generation_terminated(entry.resource))
+            return True, None, entry.resource
+
+        response_generation = decode_json_bytes(
+            data=response.data,
+            dataclass_type=PodcastGenerationDefinition)
+        self.generation_cache.put(
+            generation_id,
+            response_generation,
+            terminal=self.is_generation_terminated(response_generation),
+            etag=response.headers.get(HTTP_HEADERS_ETAG))
+        return True, None, response_generation
+
+    def is_generation_terminated(self,
+                                 generation: PodcastGenerationDefinition) -> bool:
+        return generation.status in [OneApiState.Succeeded, OneApiState.Failed]
     
     def request_list_generations(self,
                                   top: int = None,
@@ -118,20 +687,68 @@ class PodcastClient(SpeechLongRunningTaskClientBase):
         if not success:
             return False, error, None
         
-        response_generations_json = response.json()
-        response_generations = dict_to_dataclass(
-            data=response_generations_json,
+        response_generations = decode_json_bytes(
+            data=response.data,
             dataclass_type=PagedGenerationDefinition)
         return True, None, response_generations
 
+    def iter_generations(self,
+                         maxPageSize: int = None,
+                         prefetch: bool = False) -> Iterator[PodcastGenerationDefinition]:
+        """
+        Iterate over all generations, following nextLink page by page.
+
+        Each generation is decoded and yielded as soon as its page arrives, and only the current
+        page (plus the next one when prefetching) is held in memory.
+
+        Args:
+            maxPageSize: Maximum number of generations per page
+            prefetch: Whether to request the next page while the current one is being consumed
+
+        Returns:
+            Iterator of generations
+        """
+        url = self.build_generations_page_url(maxPageSize=maxPageSize)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        next_page_future = None
+        try:
+            while url is not None:
+                if next_page_future is not None:
+                    success, error, page_values, url = next_page_future.result()
+                else:
+                    success, error, page_values, url = self.request_list_page_with_url(url)
+                if not success:
+                    raise RuntimeError(f"Failed to request list generation API with error: {error}")
+
+                next_page_future = None
+                if executor is not None and url is not None:
+                    next_page_future = executor.submit(self.request_list_page_with_url, url)
+
+                for page_value in page_values:
+                    yield decode_dataclass(
+                        data=page_value,
+                        dataclass_type=PodcastGenerationDefinition)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def build_generations_page_url(self,
+                                   maxPageSize: int = None) -> Url:
+        url = self.build_long_running_tasks_url()
+        if maxPageSize is not None:
+            url = append_url_args(url, {"maxPageSize": maxPageSize})
+        return url
+
     def request_delete_generation(self,
                                    generation_id: str) -> tuple[bool, str]:
+        if self.generation_cache is not None:
+            self.generation_cache.invalidate(generation_id)
         return self.request_delete_long_running_task(generation_id)
 
     def create_generation_creation_body(
             self,
             input_file_url: Url,
-            target_locale: locale,
+            target_locale: str,
             focus: str = None
             ) -> PodcastGenerationDefinition:
         if target_locale is None:
@@ -162,18 +779,23 @@ class PodcastClient(SpeechLongRunningTaskClientBase):
             self,
             generation_id: str,
             request_body: PodcastGenerationDefinition,
+            operation_id: str = None,
+            retryable: bool = False,
             ) -> tuple[bool, str, PodcastGenerationDefinition, Url]:
         if generation_id is None:
             raise ValueError
 
+        if self.generation_cache is not None:
+            self.generation_cache.invalidate(generation_id)
         success, error, response, operation_location_url = self.request_create_long_running_task_with_id(
             id=generation_id,
-            creation_body=request_body)
+            creation_body=request_body,
+            operation_id=operation_id,
+            retryable=retryable)
         if not success:
             return False, error, None, None
         
-        response_generation_json = response.json()
-        response_generation = dict_to_dataclass(
-            data=response_generation_json,
+        response_generation = decode_json_bytes(
+            data=response.data,
             dataclass_type=PodcastGenerationDefinition)
         return True, None, response_generation, operation_location_url
\ No newline at end of file
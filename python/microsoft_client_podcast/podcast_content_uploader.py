@@ -0,0 +1,246 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import hashlib
+import mmap
+import os
+import shutil
+import threading
+import urllib3
+from abc import ABC, abstractmethod
+from typing import Iterator
+from urllib3.util import Url
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_CONTENT_LENGTH,
+    HTTP_HEADERS_CONTENT_TYPE
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+HTTP_HEADERS_BLOB_TYPE = "x-ms-blob-type"
+
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".txt": "text/plain; charset=utf-8",
+}
+
+
+def iter_file_chunks(file_path: str, chunk_size: int) -> Iterator[memoryview]:
+    """
+    Yield the content of a file as memoryview slices of a read-only memory map.
+
+    The slices are not copies, each one is only valid until the next one is requested.
+    """
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            for offset in range(0, size, chunk_size):
+                with view[offset:offset + chunk_size] as chunk:
+                    yield chunk
+
+
+class MappedFileChunks:
+    """Request body iterating over iter_file_chunks, each iteration maps the file again."""
+
+    __slots__ = ("file_path", "chunk_size")
+
+    def __init__(self, file_path: str, chunk_size: int):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return iter_file_chunks(self.file_path, self.chunk_size)
+
+
+class PodcastContentUploader(ABC):
+    """
+    Storage target that local input files are uploaded to before a generation is created.
+
+    Subclasses implement upload_file. Uploaded content is named after its SHA-256, so uploading
+    the same file twice gives the same URL and content based generation IDs stay stable.
+    """
+
+    def upload(self, file_path: str) -> tuple[bool, str, Url]:
+        """
+        Upload a local file.
+
+        Returns:
+            Tuple of (success, error, url the service can read the content from)
+        """
+        if file_path is None:
+            raise ValueError
+        if not os.path.isfile(file_path):
+            return False, f"Input file {file_path} not found", None
+
+        return self.upload_file(file_path, self.build_content_name(file_path))
+
+    @abstractmethod
+    def upload_file(self, file_path: str, content_name: str) -> tuple[bool, str, Url]:
+        pass
+
+    def build_content_name(self, file_path: str) -> str:
+        with open(file_path, "rb") as file:
+            digest = hashlib.file_digest(file, "sha256").hexdigest()
+        _, extension = os.path.splitext(file_path)
+        return f"{digest}{extension.lower()}"
+
+
+class HttpPutContentUploader(PodcastContentUploader):
+    """Upload files with a single streamed HTTP PUT to {container_url}/{content_name}."""
+
+    def __init__(self,
+                 http: urllib3.PoolManager,
+                 container_url: str,
+                 headers: dict = None,
+                 chunk_size: int = 4 * 1024 * 1024):
+        """
+        Initialize the uploader.
+
+        Args:
+            http: Connection pool to upload with, usually the http pool of the client
+            container_url: URL the content name is appended to, its query string (for example a SAS token) is kept
+            headers: Additional headers of every upload request
+            chunk_size: Size of the memory mapped chunks written to the connection
+        """
+        if http is None or container_url is None:
+            raise ValueError
+        if chunk_size is None or chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        self.http = http
+        self.container_url = urllib3.util.parse_url(container_url)
+        self.headers = headers or {}
+        self.chunk_size = chunk_size
+
+    def build_content_url(self, content_name: str) -> Url:
+        path = (self.container_url.path or "").rstrip("/")
+        return self.container_url._replace(path=f"{path}/{content_name}")
+
+    def upload_file(self, file_path: str, content_name: str) -> tuple[bool, str, Url]:
+        url = self.build_content_url(content_name)
+        _, extension = os.path.splitext(file_path)
+        headers = {
+            **self.headers,
+            HTTP_HEADERS_CONTENT_LENGTH: str(os.path.getsize(file_path)),
+            HTTP_HEADERS_CONTENT_TYPE: CONTENT_TYPES.get(extension.lower(), "application/octet-stream"),
+        }
+
+        logger.info("Uploading %s to %s%s", file_path, url.host, url.path)
+        try:
+            # Content-Length is set, so the chunks are written as they are without chunked transfer encoding.
+            # Not retried by the pool, urllib3 cannot rewind an iterable body; upload again instead.
+            response = self.http.request("PUT", url.url, headers=headers,
+                                         body=MappedFileChunks(file_path, self.chunk_size), retries=False)
+        except urllib3.exceptions.HTTPError as exception:
+            logger.error("Failed to upload %s with error: %s", file_path, exception)
+            return False, str(exception), None
+        if response.status not in [200, 201]:
+            logger.error("Failed to upload %s with status %d: %s", file_path, response.status, response.data)
+            return False, response.reason, None
+        return True, None, url
+
+
+class AzureBlobContentUploader(HttpPutContentUploader):
+    """Upload files as block blobs to an Azure Storage container URL with a SAS token granting write and read."""
+
+    def __init__(self,
+                 http: urllib3.PoolManager,
+                 container_url: str,
+                 chunk_size: int = 4 * 1024 * 1024):
+        super().__init__(
+            http=http,
+            container_url=container_url,
+            headers={HTTP_HEADERS_BLOB_TYPE: "BlockBlob"},
+            chunk_size=chunk_size)
+
+
+class LocalContentStorageServer:
+    """
+    Local HTTP stand-in for a storage container, for tests and local runs.
+
+    PUT stores the request body under the request path in directory and GET serves it back,
+    both streamed in chunks.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self,
+                 directory: str,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        if directory is None:
+            raise ValueError
+        # http.server is only needed by this test stand-in, not by the uploads.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+        storage = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_PUT(self):
+                file_path = storage.resolve_file_path(self.path)
+                if file_path is None:
+                    return self.send_empty_response(400)
+                remaining = int(self.headers.get(HTTP_HEADERS_CONTENT_LENGTH, 0))
+                with open(file_path, "wb") as file:
+                    while remaining > 0:
+                        chunk = self.rfile.read(min(remaining, storage.CHUNK_SIZE))
+                        if not chunk:
+                            break
+                        file.write(chunk)
+                        remaining -= len(chunk)
+                self.send_empty_response(201 if remaining == 0 else 400)
+
+            def do_GET(self):
+                file_path = storage.resolve_file_path(self.path)
+                if file_path is None or not os.path.isfile(file_path):
+                    return self.send_empty_response(404)
+                self.send_response(200)
+                self.send_header(HTTP_HEADERS_CONTENT_LENGTH, str(os.path.getsize(file_path)))
+                self.end_headers()
+                with open(file_path, "rb") as file:
+                    shutil.copyfileobj(file, self.wfile, storage.CHUNK_SIZE)
+
+            def send_empty_response(self, status: int):
+                self.send_response(status)
+                self.send_header(HTTP_HEADERS_CONTENT_LENGTH, "0")
+                self.end_headers()
+
+        self._server = ThreadingHTTPServer((host, port), RequestHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-content-storage", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def container_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/content"
+
+    def resolve_file_path(self, request_path: str):
+        content_name = urllib3.util.parse_url(request_path).path.rsplit("/", 1)[-1]
+        if content_name in ["", ".", ".."]:
+            return None
+        return os.path.join(self.directory, content_name)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -1,7 +1,6 @@
 # Copyright (c) Microsoft. All rights reserved.
 # Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
 
-import locale
 from datetime import datetime
 from dataclasses import dataclass
 from urllib3.util import Url
@@ -20,30 +19,46 @@ from microsoft_speech_client_common.client_common_dataclass import (
 )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PodcastGenerationContent:
     url: Url = None
     text: str = None
     kind: Optional[ContentSourceKind] = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PodcastGenerationConfig:
-    locale: locale
+    locale: str
     focus: Optional[str] = None
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PodcastGenerationOutput:
     audioFileUrl: Url
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PodcastGenerationDefinition(StatefulResourceBaseDefinition):
     content: PodcastGenerationContent = None
     config: Optional[PodcastGenerationConfig] = None
     output: PodcastGenerationOutput = None
+    failureReason: Optional[str] = None
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PagedGenerationDefinition:
     value: list[PodcastGenerationDefinition]
     nextLink: Optional[Url] = None
 
+
+@dataclass(kw_only=True, slots=True)
+class PodcastGenerationBatchItem:
+    input_file_url: Url
+    target_locale: str
+    focus: Optional[str] = None
+
+@dataclass(kw_only=True, slots=True)
+class PodcastGenerationBatchResult:
+    item: PodcastGenerationBatchItem
+    success: bool
+    generation_id: Optional[str] = None
+    error: Optional[str] = None
+    generation: Optional[PodcastGenerationDefinition] = None
+    audio_file_path: Optional[str] = None
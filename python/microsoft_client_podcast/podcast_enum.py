@@ -7,3 +7,24 @@ from enum import Enum
 class ContentSourceKind(str, Enum):
     AzureStorageBlobPublicUrl = 'AzureStorageBlobPublicUrl'
     PlainText = 'PlainText'
+
+
+class GenerationIdMode(str, Enum):
+    # Generation ID from the submit time, every submit creates a new generation.
+    Timestamp = 'Timestamp'
+    # Generation ID and Operation-Id derived from the request content, resubmits reuse the existing generation.
+    Content = 'Content'
+
+
+class RouterPlacement(str, Enum):
+    # Backend with the fewest generations in flight relative to its weight.
+    LeastOutstanding = 'LeastOutstanding'
+    # Least outstanding work scaled by the recent request latency of the backend.
+    Latency = 'Latency'
+
+
+class RetentionAgeField(str, Enum):
+    # Age since the generation was created.
+    CreatedDateTime = 'createdDateTime'
+    # Age since the last status change of the generation.
+    LastActionDateTime = 'lastActionDateTime'
@@ -0,0 +1,478 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import dataclasses
+import functools
+import os
+import orjson
+import socketserver
+import threading
+import urllib3
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_CONTENT_LENGTH,
+    HTTP_HEADERS_CONTENT_TYPE
+)
+from microsoft_speech_client_common.client_common_enum import (
+    OperationStatus
+)
+from microsoft_speech_client_common.client_common_operation_poller import (
+    OperationPoller
+)
+from microsoft_client_podcast.podcast_client import (
+    PodcastClient
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationBatchItem
+)
+from microsoft_client_podcast.podcast_job_ledger import (
+    PodcastJobLedger, PodcastJobLedgerRecord
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+class PodcastGateway:
+    """
+    Long-running job queue creating generations for many callers with one shared client.
+
+    Jobs are keyed like batch items in the job ledger, so submitting the same input, locale and
+    focus again returns the existing job instead of creating another generation, unless that job
+    failed: failed creates and failed or timed out generations are queued again. Queued jobs are
+    submitted by one dispatcher thread with at most max_concurrency generations in flight, all
+    watched by one operation poller over the client's connection pool. Every state change is
+    recorded in the ledger, the IDs of a create before it is sent: after a restart, queued jobs are
+    submitted, jobs interrupted while submitting are looked up before being created again and
+    running ones are polled again.
+    """
+
+    def __init__(self,
+                 client: PodcastClient,
+                 ledger: PodcastJobLedger,
+                 max_concurrency: int = 8):
+        """
+        Initialize the gateway, resume the jobs of the ledger and start the dispatcher thread.
+
+        Args:
+            client: Client creating and polling the generations, shared by all jobs
+            ledger: Job ledger recording the jobs and their status
+            max_concurrency: Maximum number of generations running at the same time
+        """
+        if client is None or ledger is None:
+            raise ValueError("client and ledger are required")
+        if max_concurrency is None or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+
+        self.client = client
+        self.ledger = ledger
+        self.max_concurrency = max_concurrency
+        self._poller = OperationPoller(client=client)
+        self._queue = deque()
+        self._queued_job_keys = set()
+        self._in_flight = {}
+        self._completed = deque()
+        self._result_listeners = ()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        with self._condition:
+            for record in ledger.iter_jobs():
+                if record.queued or record.submitting:
+                    self._enqueue(record.job_key, ledger.decode_item(record.item))
+                elif record.submitted and not record.terminated:
+                    logger.info("Resuming generation %s from ledger %s", record.generation_id, ledger.path)
+                    self._watch(record.job_key, ledger.decode_item(record.item) if record.item else None,
+                                record.generation_id, urllib3.util.parse_url(record.operation_location))
+
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def queued_count(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    @property
+    def in_flight_count(self) -> int:
+        with self._condition:
+            return len(self._in_flight)
+
+    def add_result_listener(self, listener: Callable[[PodcastJobLedgerRecord], None]):
+        """Call listener on the dispatcher thread with the ledger record of every terminated job."""
+        with self._condition:
+            self._result_listeners = (*self._result_listeners, listener)
+
+    def submit(self, item: PodcastGenerationBatchItem) -> tuple[bool, PodcastJobLedgerRecord]:
+        """
+        Queue a generation job, unless the same item was submitted before and did not fail.
+
+        Returns:
+            Tuple of (whether a new job was queued, ledger record of the job)
+        """
+        if item is None or item.input_file_url is None or item.target_locale is None:
+            raise ValueError("input_file_url and target_locale are required")
+
+        job_key = self.ledger.build_job_key(item)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Gateway is closed")
+            record = self.ledger.find_job(job_key)
+            # Jobs whose create or generation failed are queued again, everything else is a duplicate.
+            if record is not None and not record.failed:
+                return False, record
+            self.ledger.record_queued(job_key, item)
+            self._enqueue(job_key, item)
+        return True, self.ledger.find_job(job_key)
+
+    def find_job(self, job_key: str) -> Optional[PodcastJobLedgerRecord]:
+        return self.ledger.find_job(job_key)
+
+    def close(self):
+        """Stop the dispatcher; queued and running jobs stay in the ledger and resume on the next start."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._poller.close()
+
+    def _enqueue(self, job_key: str, item: PodcastGenerationBatchItem):
+        if job_key in self._queued_job_keys:
+            return
+        self._queued_job_keys.add(job_key)
+        self._queue.append((job_key, item))
+        self._condition.notify_all()
+
+    def _watch(self, job_key: str, item: PodcastGenerationBatchItem, generation_id: str, operation_location: urllib3.util.Url):
+        future = self._poller.register(
+            operation_location,
+            callback=self._operation_done,
+            status_callback=functools.partial(self.client.record_batch_status, self.ledger, job_key))
+        with self._condition:
+            self._in_flight[future] = (job_key, item, generation_id)
+
+    def _operation_done(self, future: Future):
+        # Called on the poller thread, results are built on the dispatcher thread since that queries the generation.
+        with self._condition:
+            self._completed.append(future)
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._completed and \
+                        not (self._queue and len(self._in_flight) < self.max_concurrency):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                completed = [self._completed.popleft() for _ in range(len(self._completed))]
+                submitting = []
+                while self._queue and len(self._in_flight) + len(submitting) < self.max_concurrency:
+                    job_key, item = self._queue.popleft()
+                    self._queued_job_keys.discard(job_key)
+                    submitting.append((job_key, item))
+
+            for future in completed:
+                with self._condition:
+                    job_key, item, generation_id = self._in_flight.pop(future)
+                try:
+                    self._finish(job_key, item, generation_id, future.result())
+                except Exception as exception:
+                    logger.exception("Failed to query the result of job %s with error: %s", job_key, exception)
+                    self.ledger.record_status(job_key, OperationStatus.Failed, error=str(exception))
+                    self._notify_result(job_key)
+            for job_key, item in submitting:
+                try:
+                    self._submit(job_key, item)
+                except Exception as exception:
+                    logger.exception("Failed to submit job %s with error: %s", job_key, exception)
+                    self.ledger.record_submit_failed(job_key, None, None, str(exception))
+                    self._notify_result(job_key)
+
+    def _submit(self, job_key: str, item: PodcastGenerationBatchItem):
+        # The ledger records the IDs before the create, a job interrupted while submitting is looked up first.
+        record = self.ledger.find_job(job_key)
+        if record is not None and record.queued and record.generation_id is not None:
+            self._delete_failed_generation(record.generation_id)
+        success, error, generation_id, operation_location = self.client.submit_ledger_job(
+            item=item,
+            suffix=job_key[:12],
+            ledger=self.ledger,
+            job_key=job_key,
+            record=record if record is not None and record.submitting else None)
+        if not success:
+            logger.error("Failed to create generation of job %s with error: %s", job_key, error)
+            self._notify_result(job_key)
+            return
+        self._watch(job_key, item, generation_id, operation_location)
+
+    def _delete_failed_generation(self, generation_id: str):
+        """Delete the failed generation of a job queued again, content mode would reuse it instead of creating it."""
+        success, _, generation = self.client.request_get_generation(generation_id)
+        if success and generation is not None and generation.status == OperationStatus.Failed:
+            logger.info("Deleting failed generation %s before submitting its job again", generation_id)
+            self.client.request_delete_generation(generation_id)
+
+    def _finish(self, job_key: str, item: PodcastGenerationBatchItem, generation_id: str, operation_result: tuple):
+        result = self.client.build_batch_result(
+            item=item,
+            generation_id=generation_id,
+            operation_result=operation_result)
+        self.client.record_batch_result(self.ledger, job_key, result)
+        logger.info("Job %s terminated, generation %s %s", job_key, generation_id,
+                    "succeeded" if result.success else "failed")
+        self._notify_result(job_key)
+
+    def _notify_result(self, job_key: str):
+        if not self._result_listeners:
+            return
+        record = self.ledger.find_job(job_key)
+        for listener in self._result_listeners:
+            try:
+                listener(record)
+            except Exception as exception:
+                logger.exception("Gateway result listener failed with error: %s", exception)
+
+
+def encode_job_record(record: PodcastJobLedgerRecord) -> bytes:
+    values = dataclasses.asdict(record)
+    values["item"] = orjson.loads(record.item) if record.item is not None else None
+    values["terminated"] = record.terminated
+    return orjson.dumps(values)
+
+
+def decode_job_item(body: bytes) -> PodcastGenerationBatchItem:
+    """Batch item of a job request, {"input_file_url": ..., "target_locale": ..., "focus": ...}."""
+    values = orjson.loads(body)
+    if not isinstance(values, dict) or not values.get("input_file_url") or not values.get("target_locale"):
+        raise ValueError("input_file_url and target_locale are required")
+    return PodcastGenerationBatchItem(
+        input_file_url=values["input_file_url"],
+        target_locale=values["target_locale"],
+        focus=values.get("focus") or None)
+
+
+class PodcastGatewayServer:
+    """
+    Local HTTP API of a gateway, on a TCP port or a Unix socket.
+
+        POST /jobs              submit {"input_file_url", "target_locale", "focus"}, 202 when queued, also again
+                                after a failure, 200 for a duplicate
+        GET  /jobs/{job_key}    status and result of a job
+        GET  /jobs              every job of the ledger
+        GET  /health            queued and running job counts
+    """
+
+    def __init__(self,
+                 gateway: PodcastGateway,
+                 host: str = "127.0.0.1",
+                 port: int = 8765,
+                 unix_socket_path: str = None):
+        """
+        Initialize the server and start serving on a background thread.
+
+        Args:
+            gateway: Gateway the jobs are submitted to
+            host: Interface to listen on
+            port: TCP port to listen on
+            unix_socket_path: Serve on this Unix socket instead of the TCP port
+        """
+        if gateway is None:
+            raise ValueError("gateway is required")
+        self.gateway = gateway
+        self.unix_socket_path = unix_socket_path
+        server = self
+
+        class GatewayRequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug("Gateway request: " + format, *args)
+
+            def address_string(self):
+                # Unix socket peers have no address.
+                return str(self.client_address[0]) if self.client_address else "unix"
+
+            def do_GET(self):
+                server.handle(self)
+
+            def do_POST(self):
+                server.handle(self)
+
+        if unix_socket_path is not None:
+            if os.path.exists(unix_socket_path):
+                os.remove(unix_socket_path)
+
+            class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+                daemon_threads = True
+
+            self._server = UnixHTTPServer(unix_socket_path, GatewayRequestHandler)
+        else:
+            self._server = ThreadingHTTPServer((host, port), GatewayRequestHandler)
+            self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        if self.unix_socket_path is not None:
+            return f"unix:{self.unix_socket_path}"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle(self, handler: BaseHTTPRequestHandler):
+        path = handler.path.split("?")[0].rstrip("/")
+        if handler.command == "POST" and path == "/jobs":
+            body = handler.rfile.read(int(handler.headers.get(HTTP_HEADERS_CONTENT_LENGTH, 0) or 0))
+            try:
+                item = decode_job_item(body)
+            except (ValueError, orjson.JSONDecodeError) as exception:
+                return self.send(handler, 400, orjson.dumps({"error": str(exception)}))
+            created, record = self.gateway.submit(item)
+            return self.send(handler, 202 if created else 200, encode_job_record(record))
+        if handler.command == "GET" and path == "/jobs":
+            records = b",".join(encode_job_record(record) for record in self.gateway.ledger.iter_jobs())
+            return self.send(handler, 200, b"[" + records + b"]")
+        if handler.command == "GET" and path.startswith("/jobs/"):
+            record = self.gateway.find_job(path[len("/jobs/"):])
+            if record is None:
+                return self.send(handler, 404, orjson.dumps({"error": "Job not found"}))
+            return self.send(handler, 200, encode_job_record(record))
+        if handler.command == "GET" and path == "/health":
+            return self.send(handler, 200, orjson.dumps({
+                "queued": self.gateway.queued_count,
+                "running": self.gateway.in_flight_count,
+            }))
+        self.send(handler, 404, orjson.dumps({"error": "Not found"}))
+
+    def send(self, handler: BaseHTTPRequestHandler, status: int, body: bytes):
+        handler.send_response(status)
+        handler.send_header(HTTP_HEADERS_CONTENT_TYPE, "application/json")
+        handler.send_header(HTTP_HEADERS_CONTENT_LENGTH, str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self.unix_socket_path is not None and os.path.exists(self.unix_socket_path):
+            os.remove(self.unix_socket_path)
+
+
+class PodcastGatewaySpool:
+    """
+    Spool directory feeding a gateway.
+
+    Every *.json job file dropped in the directory, with the body of POST /jobs, is submitted and
+    moved to processed/, or to rejected/ when malformed. Dropping the file of a failed job again
+    submits the job again. When its job terminates, the job record
+    is written to results/ under the same file name. Write job files under another extension and
+    rename them to .json, so a half-written file is never picked up.
+    """
+
+    PROCESSED_DIRECTORY = "processed"
+    REJECTED_DIRECTORY = "rejected"
+    RESULTS_DIRECTORY = "results"
+
+    def __init__(self,
+                 gateway: PodcastGateway,
+                 directory: str,
+                 interval_seconds: float = 1):
+        """
+        Initialize the spool, find jobs processed before a restart and start scanning.
+
+        Args:
+            gateway: Gateway the jobs are submitted to
+            directory: Spool directory, created with its subdirectories if missing
+            interval_seconds: Time between two scans of the directory
+        """
+        if gateway is None or directory is None:
+            raise ValueError("gateway and directory are required")
+        self.gateway = gateway
+        self.directory = directory
+        self.interval_seconds = interval_seconds
+        for subdirectory in [self.PROCESSED_DIRECTORY, self.REJECTED_DIRECTORY, self.RESULTS_DIRECTORY]:
+            os.makedirs(os.path.join(directory, subdirectory), exist_ok=True)
+        # File names of the processed jobs without a result yet, by job key.
+        self._file_names = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        processed_directory = os.path.join(directory, self.PROCESSED_DIRECTORY)
+        for file_name in os.listdir(processed_directory):
+            if os.path.exists(os.path.join(directory, self.RESULTS_DIRECTORY, file_name)):
+                continue
+            try:
+                with open(os.path.join(processed_directory, file_name), "rb") as file:
+                    item = decode_job_item(file.read())
+            except (OSError, ValueError, orjson.JSONDecodeError):
+                continue
+            self._track(self.gateway.ledger.build_job_key(item), file_name)
+
+        gateway.add_result_listener(self.write_result)
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def scan(self):
+        """Submit the job files currently in the spool directory."""
+        for file_name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, file_name)
+            if not file_name.endswith(".json") or not os.path.isfile(path):
+                continue
+            try:
+                with open(path, "rb") as file:
+                    item = decode_job_item(file.read())
+            except (ValueError, orjson.JSONDecodeError) as exception:
+                logger.error("Rejected spool file %s with error: %s", file_name, exception)
+                os.replace(path, os.path.join(self.directory, self.REJECTED_DIRECTORY, file_name))
+                continue
+
+            # Tracked before the submit, so that a job terminating right away still gets its result file.
+            job_key = self.gateway.ledger.build_job_key(item)
+            self._track(job_key, file_name)
+            created, record = self.gateway.submit(item)
+            logger.info("Spool file %s %s job %s", file_name, "queued" if created else "is a duplicate of", job_key)
+            os.replace(path, os.path.join(self.directory, self.PROCESSED_DIRECTORY, file_name))
+            if record.terminated:
+                self.write_result(record)
+
+    def write_result(self, record: PodcastJobLedgerRecord):
+        with self._lock:
+            file_names = self._file_names.pop(record.job_key, [])
+        for file_name in file_names:
+            self._write_result_file(file_name, record)
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _track(self, job_key: str, file_name: str):
+        with self._lock:
+            self._file_names.setdefault(job_key, []).append(file_name)
+
+    def _write_result_file(self, file_name: str, record: PodcastJobLedgerRecord):
+        path = os.path.join(self.directory, self.RESULTS_DIRECTORY, file_name)
+        with open(path + ".tmp", "wb") as file:
+            file.write(encode_job_record(record))
+        os.replace(path + ".tmp", path)
+
+    def _run(self):
+        while True:
+            try:
+                self.scan()
+            except OSError as exception:
+                logger.error("Failed to scan spool directory %s with error: %s", self.directory, exception)
+            if self._stopped.wait(self.interval_seconds):
+                return
@@ -0,0 +1,238 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import hashlib
+import orjson
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from microsoft_speech_client_common.client_common_enum import (
+    OperationStatus
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationBatchItem
+)
+
+
+@dataclass(kw_only=True, slots=True)
+class PodcastJobLedgerRecord:
+    """Latest known state of one batch job, folded from its ledger events."""
+    job_key: str
+    generation_id: Optional[str] = None
+    operation_id: Optional[str] = None
+    operation_location: Optional[str] = None
+    status: Optional[str] = None
+    output_url: Optional[str] = None
+    error: Optional[str] = None
+    # JSON of the batch item, recorded for queued jobs.
+    item: Optional[str] = None
+    updated_at: Optional[float] = None
+
+    @property
+    def queued(self) -> bool:
+        return self.status == PodcastJobLedger.STATUS_QUEUED
+
+    @property
+    def submitting(self) -> bool:
+        """Whether the create was about to be sent when the job was last recorded, it may or may not exist."""
+        return self.status == PodcastJobLedger.STATUS_SUBMITTING
+
+    @property
+    def submitted(self) -> bool:
+        return self.operation_location is not None and self.status != PodcastJobLedger.STATUS_SUBMIT_FAILED
+
+    @property
+    def terminated(self) -> bool:
+        return self.status in [OperationStatus.Succeeded, OperationStatus.Failed, OperationStatus.Canceled]
+
+    @property
+    def failed(self) -> bool:
+        """Whether the create failed, or the generation failed or was not seen terminating in time."""
+        return self.status in [PodcastJobLedger.STATUS_SUBMIT_FAILED, OperationStatus.Failed]
+
+
+class PodcastJobLedger:
+    """
+    Append-only SQLite ledger of batch generation jobs.
+
+    Every create, status transition and final result is appended as an event row keyed by a job key
+    derived from the batch item, so a batch run that died can be restarted with the same ledger:
+    finished jobs are not submitted again and unfinished operations are polled again. The generation
+    ID and Operation-Id of a create are recorded before it is sent, so a create interrupted by a
+    crash is looked up, and created again with the same IDs, instead of being duplicated.
+    """
+
+    STATUS_QUEUED = "Queued"
+    STATUS_SUBMITTING = "Submitting"
+    STATUS_SUBMITTED = "Submitted"
+    STATUS_SUBMIT_FAILED = "SubmitFailed"
+
+    _COLUMNS = ("generation_id", "operation_id", "operation_location", "status", "output_url", "error", "item")
+
+    def __init__(self, path: str):
+        """
+        Open or create the ledger.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        if path is None:
+            raise ValueError("Ledger path is required")
+
+        self.path = path
+        self._lock = threading.Lock()
+        # Events are recorded from the batch loop and from the operation poller thread.
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            "sequence INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "job_key TEXT NOT NULL, "
+            "generation_id TEXT, "
+            "operation_id TEXT, "
+            "operation_location TEXT, "
+            "status TEXT, "
+            "output_url TEXT, "
+            "error TEXT, "
+            "item TEXT, "
+            "recorded_at REAL NOT NULL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS job_events_job_key ON job_events (job_key, sequence)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def build_job_key(item: PodcastGenerationBatchItem) -> str:
+        """Key identifying the same batch item across runs."""
+        encoded_item = orjson.dumps([str(item.input_file_url), item.target_locale, item.focus])
+        return hashlib.sha256(encoded_item).hexdigest()
+
+    @staticmethod
+    def encode_item(item: PodcastGenerationBatchItem) -> str:
+        return orjson.dumps({
+            "input_file_url": str(item.input_file_url),
+            "target_locale": item.target_locale,
+            "focus": item.focus,
+        }).decode("utf-8")
+
+    @staticmethod
+    def decode_item(encoded_item: str) -> PodcastGenerationBatchItem:
+        values = orjson.loads(encoded_item)
+        return PodcastGenerationBatchItem(
+            input_file_url=values["input_file_url"],
+            target_locale=values["target_locale"],
+            focus=values.get("focus"))
+
+    def record_queued(self,
+                      job_key: str,
+                      item: PodcastGenerationBatchItem):
+        self._append(
+            job_key,
+            status=self.STATUS_QUEUED,
+            item=self.encode_item(item))
+
+    def record_submitting(self,
+                          job_key: str,
+                          generation_id: str,
+                          operation_id: str):
+        self._append(
+            job_key,
+            generation_id=generation_id,
+            operation_id=operation_id,
+            status=self.STATUS_SUBMITTING)
+
+    def record_submitted(self,
+                         job_key: str,
+                         generation_id: str,
+                         operation_id: str,
+                         operation_location: str):
+        self._append(
+            job_key,
+            generation_id=generation_id,
+            operation_id=operation_id,
+            operation_location=str(operation_location),
+            status=self.STATUS_SUBMITTED)
+
+    def record_submit_failed(self,
+                             job_key: str,
+                             generation_id: str,
+                             operation_id: str,
+                             error: str):
+        self._append(
+            job_key,
+            generation_id=generation_id,
+            operation_id=operation_id,
+            status=self.STATUS_SUBMIT_FAILED,
+            error=error)
+
+    def record_status(self,
+                      job_key: str,
+                      status: str,
+                      output_url: str = None,
+                      error: str = None):
+        self._append(
+            job_key,
+            status=status,
+            output_url=str(output_url) if output_url is not None else None,
+            error=error)
+
+    def find_job(self, job_key: str) -> Optional[PodcastJobLedgerRecord]:
+        """Return the latest state of a job, None if it was never recorded."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job_key, generation_id, operation_id, operation_location, status, output_url, error, item, recorded_at "
+                "FROM job_events WHERE job_key = ? ORDER BY sequence",
+                (job_key,)).fetchall()
+        record = None
+        for row in rows:
+            record = self._fold(record, row)
+        return record
+
+    def iter_jobs(self) -> Iterator[PodcastJobLedgerRecord]:
+        """Iterate over the latest state of every recorded job."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job_key, generation_id, operation_id, operation_location, status, output_url, error, item, recorded_at "
+                "FROM job_events ORDER BY job_key, sequence").fetchall()
+        record = None
+        for row in rows:
+            if record is not None and record.job_key != row[0]:
+                yield record
+                record = None
+            record = self._fold(record, row)
+        if record is not None:
+            yield record
+
+    def iter_unfinished_jobs(self) -> Iterator[PodcastJobLedgerRecord]:
+        return (record for record in self.iter_jobs() if record.submitted and not record.terminated)
+
+    def _append(self, job_key: str, **values):
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO job_events (job_key, generation_id, operation_id, operation_location, status, output_url, error, item, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_key, *(values.get(column) for column in self._COLUMNS), time.time()))
+
+    def _fold(self, record: Optional[PodcastJobLedgerRecord], row: tuple) -> PodcastJobLedgerRecord:
+        if record is None:
+            record = PodcastJobLedgerRecord(job_key=row[0])
+        for column, value in zip(self._COLUMNS, row[1:-1]):
+            if value is not None:
+                setattr(record, column, value)
+        # A new submit attempt starts from a clean error, a job queued again also from no operation.
+        if row[4] in [self.STATUS_SUBMITTING, self.STATUS_SUBMITTED]:
+            record.error = None
+        elif row[4] == self.STATUS_QUEUED:
+            record.operation_location = record.output_url = record.error = None
+        record.updated_at = row[-1]
+        return record
@@ -0,0 +1,194 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional
+from microsoft_speech_client_common.client_common_enum import (
+    OneApiState
+)
+from microsoft_speech_client_common.client_common_rate_limiter import (
+    TokenBucket
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationDefinition
+)
+from microsoft_client_podcast.podcast_enum import (
+    RetentionAgeField
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(kw_only=True, slots=True)
+class PodcastRetentionPolicy:
+    """
+    Which generations are garbage.
+
+    Only generations in one of statuses are considered, terminated ones by default. Of those,
+    a generation is deleted when its age_field is older than max_age, or when it is not among
+    the keep_latest newest. Generations without the timestamp are kept.
+    """
+    max_age: Optional[timedelta] = None
+    keep_latest: Optional[int] = None
+    statuses: tuple = (OneApiState.Succeeded, OneApiState.Failed)
+    age_field: RetentionAgeField = RetentionAgeField.CreatedDateTime
+
+    def __post_init__(self):
+        if self.max_age is None and self.keep_latest is None:
+            raise ValueError("max_age or keep_latest is required")
+        if self.keep_latest is not None and self.keep_latest < 0:
+            raise ValueError("keep_latest must not be negative")
+
+
+@dataclass(kw_only=True, slots=True)
+class PodcastGcResult:
+    generation_id: str
+    status: Optional[OneApiState] = None
+    timestamp: Optional[datetime] = None
+    # Why the generation was selected: max_age or keep_latest.
+    reason: str
+    deleted: bool = False
+    error: Optional[str] = None
+
+
+@dataclass(kw_only=True, slots=True)
+class PodcastGcSummary:
+    dry_run: bool
+    scanned: int = 0
+    selected: int = 0
+    deleted: int = 0
+    failed: int = 0
+    # Selected generations per status.
+    selected_by_status: dict = field(default_factory=dict)
+
+
+class PodcastRetentionSelector:
+    """
+    Streaming selection of the generations a retention policy deletes.
+
+    Generations are offered one at a time in any order. Expired ones are selected at once;
+    for keep_latest, only the newest generations seen so far are held, in a heap, and the
+    oldest is selected whenever one more arrives.
+    """
+
+    def __init__(self,
+                 policy: PodcastRetentionPolicy,
+                 now: datetime = None):
+        if policy is None:
+            raise ValueError("policy is required")
+        self.policy = policy
+        self.now = now if now is not None else datetime.now(timezone.utc)
+        self.scanned = 0
+        self._statuses = set(policy.statuses)
+        self._newest = []
+        self._sequence = itertools.count()
+
+    def offer(self, generation: PodcastGenerationDefinition) -> Optional[PodcastGcResult]:
+        """Generation selected by this offer, the offered one or an older one pushed out of keep_latest."""
+        self.scanned += 1
+        if generation.status not in self._statuses:
+            return None
+        timestamp = getattr(generation, self.policy.age_field.value)
+        if timestamp is None:
+            logger.debug("Keeping generation %s without %s", generation.id, self.policy.age_field.value)
+            return None
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+        result = PodcastGcResult(generation_id=generation.id, status=generation.status, timestamp=timestamp, reason="max_age")
+        if self.policy.max_age is not None and self.now - timestamp > self.policy.max_age:
+            return result
+        if self.policy.keep_latest is None:
+            return None
+
+        result.reason = "keep_latest"
+        heapq.heappush(self._newest, (timestamp, next(self._sequence), result))
+        if len(self._newest) > self.policy.keep_latest:
+            return heapq.heappop(self._newest)[2]
+        return None
+
+
+def collect_generation_garbage(
+    generations: Iterable[PodcastGenerationDefinition],
+    delete_generation: Callable[[str], tuple[bool, str]],
+    policy: PodcastRetentionPolicy,
+    dry_run: bool = False,
+    max_concurrency: int = 8,
+    deletes_per_second: float = None,
+    result_callback: Callable[[PodcastGcResult], None] = None
+) -> PodcastGcSummary:
+    """
+    Delete the generations selected by a retention policy.
+
+    All generations are scanned before the first delete: deleting while paging would shift the
+    following pages and skip generations. Only the selected generations are held in memory.
+
+    Args:
+        generations: Generations to scan, usually PodcastClient.iter_generations
+        delete_generation: Function deleting one generation by ID, returning (success, error)
+        policy: Retention policy selecting the generations to delete
+        dry_run: Only report the selected generations, delete nothing
+        max_concurrency: Maximum number of deletes in flight
+        deletes_per_second: Optional rate limit of the deletes
+        result_callback: Optional function called with every selected generation, after its delete
+
+    Returns:
+        Summary of the scanned, selected, deleted and failed generations
+    """
+    if max_concurrency is None or max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+
+    summary = PodcastGcSummary(dry_run=dry_run)
+    selector = PodcastRetentionSelector(policy)
+    selected = []
+    for generation in generations:
+        result = selector.offer(generation)
+        if result is not None:
+            selected.append(result)
+    summary.scanned = selector.scanned
+    summary.selected = len(selected)
+    for result in selected:
+        status = result.status.value if result.status is not None else None
+        summary.selected_by_status[status] = summary.selected_by_status.get(status, 0) + 1
+    logger.info("Selected %d of %d generations for deletion", summary.selected, summary.scanned)
+
+    def report(result: PodcastGcResult):
+        if result_callback is not None:
+            result_callback(result)
+
+    if dry_run:
+        for result in selected:
+            report(result)
+        return summary
+
+    bucket = TokenBucket("Delete", deletes_per_second) if deletes_per_second is not None else None
+
+    def delete(result: PodcastGcResult) -> PodcastGcResult:
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            success, error = delete_generation(result.generation_id)
+        except Exception as exception:
+            success, error = False, str(exception)
+        result.deleted = success
+        result.error = error
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="podcast-gc") as executor:
+        for future in as_completed([executor.submit(delete, result) for result in selected]):
+            result = future.result()
+            if result.deleted:
+                summary.deleted += 1
+            else:
+                summary.failed += 1
+                logger.error("Failed to delete generation %s with error: %s", result.generation_id, result.error)
+            report(result)
+    return summary
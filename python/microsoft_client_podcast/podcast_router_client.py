@@ -0,0 +1,457 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import threading
+import time
+import urllib3
+from collections import OrderedDict
+from urllib3.util import Url
+from typing import Iterator, Optional
+from microsoft_speech_client_common.client_common_enum import (
+    CircuitState, OperationStatus
+)
+from microsoft_speech_client_common.client_common_dataclass import (
+    OperationDefinition
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingStatistics
+)
+from microsoft_speech_client_common.client_common_events import (
+    ClientEventHooks
+)
+from microsoft_speech_client_common.client_common_rate_limiter import (
+    RateLimitTimeoutError
+)
+from microsoft_speech_client_common.client_common_util import (
+    is_transient_error
+)
+from microsoft_client_podcast.podcast_enum import (
+    RouterPlacement
+)
+from microsoft_client_podcast.podcast_dataclass import (
+    PodcastGenerationDefinition, PagedGenerationDefinition
+)
+from microsoft_speech_client_common.client_common_client_base import (
+    OperationPollingPolicyMixin
+)
+from microsoft_client_podcast.podcast_client import (
+    PodcastClient, PodcastGenerationWorkflowMixin
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+class PodcastRouterBackend:
+    """One speech resource (region and key) of a PodcastRouterClient, with its load and health."""
+
+    LATENCY_SMOOTHING = 0.2
+
+    def __init__(self,
+                 client: PodcastClient,
+                 weight: float = 1,
+                 name: str = None):
+        """
+        Initialize the backend.
+
+        Args:
+            client: Client of the speech resource, with its own connection pool, retry policy and rate limiter
+            weight: Relative share of the generations placed on this backend, for example its quota
+            name: Name of the backend in statistics, the region of the client by default
+        """
+        if client is None:
+            raise ValueError
+        if weight is None or weight <= 0:
+            raise ValueError("weight must be positive")
+
+        self.client = client
+        self.weight = weight
+        self.name = name if name is not None else client.region
+        self.outstanding_generation_ids = set()
+        self.latency_seconds = None
+        self.unhealthy_until = 0
+        self.created_count = 0
+        self.failover_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def outstanding_count(self) -> int:
+        with self._lock:
+            return len(self.outstanding_generation_ids)
+
+    @property
+    def healthy(self) -> bool:
+        if time.monotonic() < self.unhealthy_until:
+            return False
+        host = self.client.root_url().host
+        return self.client.retry_policy.circuit_breakers.get(host).state != CircuitState.Open
+
+    def score(self, placement: RouterPlacement) -> float:
+        """Placement score, lower is better."""
+        with self._lock:
+            load = (len(self.outstanding_generation_ids) + 1) / self.weight
+            latency_seconds = self.latency_seconds
+        if placement == RouterPlacement.Latency and latency_seconds is not None:
+            return load * latency_seconds
+        return load
+
+    def record_latency(self, seconds: float):
+        with self._lock:
+            if self.latency_seconds is None:
+                self.latency_seconds = seconds
+            else:
+                self.latency_seconds += self.LATENCY_SMOOTHING * (seconds - self.latency_seconds)
+
+    def record_created(self, generation_id: str):
+        with self._lock:
+            self.outstanding_generation_ids.add(generation_id)
+            self.created_count += 1
+
+    def record_terminated(self, generation_id: str):
+        with self._lock:
+            self.outstanding_generation_ids.discard(generation_id)
+
+    def mark_unhealthy(self, seconds: float):
+        with self._lock:
+            self.unhealthy_until = time.monotonic() + seconds
+            self.failover_count += 1
+
+    def to_dict(self) -> dict:
+        healthy = self.healthy
+        with self._lock:
+            return {
+                "outstanding_count": len(self.outstanding_generation_ids),
+                "created_count": self.created_count,
+                "failover_count": self.failover_count,
+                "latency_ms": round(self.latency_seconds * 1000, 1) if self.latency_seconds is not None else None,
+                "healthy": healthy,
+            }
+
+
+class PodcastRouterClient(PodcastGenerationWorkflowMixin, OperationPollingPolicyMixin):
+    """
+    Podcast client spreading generations over several speech resources.
+
+    New generations are placed on the healthy backend with the lowest score (outstanding
+    generations per weight, optionally scaled by latency), and a create failing on a connection
+    error, throttling or a 5xx fails over to the next backend. Gets, deletes and operation polls
+    go to the backend that owns the generation or operation; generations created by another
+    process are looked up on every backend once.
+    The method surface is the one of PodcastClient, whose batch, wait and garbage collection
+    workflows the router shares through PodcastGenerationWorkflowMixin.
+    """
+
+    URL_PATH_ROOT = PodcastClient.URL_PATH_ROOT
+    URL_SEGMENT_NAME_GENERATIONS = PodcastClient.URL_SEGMENT_NAME_GENERATIONS
+
+    def __init__(self,
+                 backends: list[PodcastRouterBackend],
+                 placement: RouterPlacement = RouterPlacement.LeastOutstanding,
+                 unhealthy_seconds: float = 30,
+                 hooks: ClientEventHooks = None,
+                 max_generation_owners: int = 100000):
+        """
+        Initialize the router.
+
+        Args:
+            backends: Speech resources to spread generations over
+            placement: How new generations are placed
+            unhealthy_seconds: How long a backend is skipped for new generations after a create failed on a transient error
+            hooks: Hooks of the operation status events of the router's pollers, the first backend's by default
+            max_generation_owners: Number of generation owners remembered, least recently used ones are looked up again
+        """
+        if not backends:
+            raise ValueError("At least one backend is required")
+        if max_generation_owners is None or max_generation_owners <= 0:
+            raise ValueError("max_generation_owners must be positive")
+
+        self.backends = list(backends)
+        self.placement = placement
+        self.unhealthy_seconds = unhealthy_seconds
+        # Polling settings of the first backend, used by operation pollers of the router.
+        self.polling_policy = self.backends[0].client.polling_policy
+        self.polling_statistics = OperationPollingStatistics()
+        self.notification_source = self.backends[0].client.notification_source
+        self.hooks = hooks if hooks is not None else self.backends[0].client.hooks
+        self.max_generation_owners = max_generation_owners
+        # Owners of the generations the router created, listed or looked up, least recently used first. Bounded, so
+        # paging through every generation keeps memory flat; an evicted owner is looked up again when needed.
+        self._generation_owners = OrderedDict()
+        self._operation_owners = {}
+        self._lock = threading.Lock()
+
+    def close(self):
+        for backend in self.backends:
+            backend.client.close()
+
+    def to_dict(self) -> dict:
+        return {backend.name: backend.to_dict() for backend in self.backends}
+
+    def place_backends(self) -> list[PodcastRouterBackend]:
+        """Backends in the order new generations are tried, unhealthy ones last."""
+        return sorted(self.backends, key=lambda backend: (not backend.healthy, backend.score(self.placement)))
+
+    def find_generation_owner(self,
+                              generation_id: str) -> tuple[bool, str, PodcastRouterBackend]:
+        """Backend owning a generation, looking it up on every backend if it was not created by this router."""
+        if generation_id is None:
+            raise ValueError
+
+        with self._lock:
+            backend = self._generation_owners.get(generation_id)
+            if backend is not None:
+                self._generation_owners.move_to_end(generation_id)
+        if backend is not None:
+            return True, None, backend
+
+        failure = None
+        for backend in self.backends:
+            try:
+                success, error, response = backend.client.request_get_long_running_task(generation_id)
+            except urllib3.exceptions.HTTPError as exception:
+                success, error = False, str(exception)
+            if not success:
+                failure = error
+            elif response is not None:
+                self.record_generation_owner(generation_id, backend)
+                return True, None, backend
+        # Not found anywhere is only an answer if every backend could be asked.
+        if failure is not None:
+            return False, failure, None
+        return True, None, None
+
+    def find_operation_owners(self,
+                              operation_location: Url) -> list[PodcastRouterBackend]:
+        """
+        Backend owning an operation, or the backends it may belong to by host when it was not
+        created by this router.
+        """
+        with self._lock:
+            backend = self._operation_owners.get(operation_location.url)
+        if backend is not None:
+            return [backend]
+        operation_address = (operation_location.host, operation_location.port)
+        backends = [
+            backend for backend in self.backends
+            if (backend.client.root_url().host, backend.client.root_url().port) == operation_address
+        ]
+        return backends if backends else self.backends[:1]
+
+    def record_generation_owner(self,
+                                generation_id: str,
+                                backend: PodcastRouterBackend,
+                                operation_location: Url = None):
+        with self._lock:
+            self._generation_owners[generation_id] = backend
+            self._generation_owners.move_to_end(generation_id)
+            while len(self._generation_owners) > self.max_generation_owners:
+                self._generation_owners.popitem(last=False)
+            if operation_location is not None:
+                self._operation_owners[operation_location.url] = backend
+
+    def upload_input_file(self, input_file_path: str) -> tuple[bool, str, Url]:
+        """Upload a local input file with the content uploader of the first backend having one."""
+        for backend in self.backends:
+            if backend.client.content_uploader is not None:
+                return backend.client.upload_input_file(input_file_path)
+        raise ValueError("content_uploader is required to create generations from local files")
+
+    def submit_generation(
+        self,
+        input_file_url: Url,
+        target_locale: str,
+        focus: str = None,
+        generation_id: str = None,
+        operation_id: str = None
+    ) -> tuple[bool, str, str, Url]:
+        """
+        Create a generation on the best placed backend, failing over to the others.
+
+        The generation ID and Operation-Id are built once, so a generation keeps its ID whichever
+        backend ends up creating it. Only connection errors, 408, 429 and 5xx fail over; a backend
+        failing that way is skipped for new generations for unhealthy_seconds. Other failures,
+        such as a 400 for bad input, are returned as they are and leave the backend healthy.
+        """
+        if input_file_url is None or target_locale is None:
+            raise ValueError
+
+        if generation_id is None:
+            generation_id = self.build_generation_id(
+                target_locale,
+                request_body=self.create_generation_creation_body(input_file_url, target_locale, focus))
+        if operation_id is None:
+            operation_id = self.build_operation_id(generation_id)
+
+        error = None
+        for backend in self.place_backends():
+            start = time.monotonic()
+            try:
+                success, error, generation_id, operation_location = backend.client.submit_generation(
+                    input_file_url=input_file_url,
+                    target_locale=target_locale,
+                    focus=focus,
+                    generation_id=generation_id,
+                    operation_id=operation_id)
+            except (urllib3.exceptions.HTTPError, RateLimitTimeoutError) as exception:
+                # A local rate limit timeout fails over like throttling by the service.
+                success, error = False, str(exception)
+            if success:
+                backend.record_latency(time.monotonic() - start)
+                backend.record_created(generation_id)
+                self.record_generation_owner(generation_id, backend, operation_location)
+                return True, None, generation_id, operation_location
+            if not is_transient_error(error):
+                # Rejected for its content, every other backend would reject it too.
+                return False, error, generation_id, None
+
+            backend.mark_unhealthy(self.unhealthy_seconds)
+            logger.warning("Create of generation %s failed on backend %s, failing over.", generation_id, backend.name)
+        return False, error, generation_id, None
+
+    def build_generation_id(self,
+                            target_locale: str,
+                            suffix: str = None,
+                            request_body: PodcastGenerationDefinition = None) -> str:
+        return self.backends[0].client.build_generation_id(target_locale, suffix=suffix, request_body=request_body)
+
+    def build_operation_id(self,
+                           generation_id: str) -> str:
+        return self.backends[0].client.build_operation_id(generation_id)
+
+    def build_generation_operation_url(self,
+                                       generation_id: str,
+                                       operation_id: str) -> Url:
+        """Operation URL of an existing generation created with operation_id, on the backend owning it."""
+        success, error, backend = self.find_generation_owner(generation_id)
+        if not success or backend is None:
+            raise RuntimeError(f"Failed to find the backend of generation {generation_id} with error: {error}")
+        operation_location = backend.client.build_operation_url(operation_id)
+        self.record_generation_owner(generation_id, backend, operation_location)
+        return operation_location
+
+    def create_generation_creation_body(
+            self,
+            input_file_url: Url,
+            target_locale: str,
+            focus: str = None
+            ) -> PodcastGenerationDefinition:
+        return self.backends[0].client.create_generation_creation_body(input_file_url, target_locale, focus)
+
+    def request_get_generation(self,
+                               generation_id: str) -> tuple[bool, str, PodcastGenerationDefinition]:
+        success, error, backend = self.find_generation_owner(generation_id)
+        if not success or backend is None:
+            return success, error, None
+
+        start = time.monotonic()
+        success, error, response_generation = backend.client.request_get_generation(generation_id)
+        if success:
+            backend.record_latency(time.monotonic() - start)
+        if success and (response_generation is None or backend.client.is_generation_terminated(response_generation)):
+            backend.record_terminated(generation_id)
+        return success, error, response_generation
+
+    def is_generation_terminated(self,
+                                 generation: PodcastGenerationDefinition) -> bool:
+        return self.backends[0].client.is_generation_terminated(generation)
+
+    def request_delete_generation(self,
+                                  generation_id: str) -> tuple[bool, str]:
+        success, error, backend = self.find_generation_owner(generation_id)
+        if not success:
+            return False, error
+        if backend is None:
+            return False, f"Generation {generation_id} not found"
+
+        success, error = backend.client.request_delete_generation(generation_id)
+        if success:
+            backend.record_terminated(generation_id)
+            with self._lock:
+                self._generation_owners.pop(generation_id, None)
+        return success, error
+
+    def request_list_generations(self,
+                                 top: int = None,
+                                 skip: int = None,
+                                 maxPageSize: int = None) -> tuple[bool, str, PagedGenerationDefinition]:
+        """First page of every backend, with top, skip and maxPageSize applied per backend."""
+        generations = []
+        for backend in self.backends:
+            success, error, page = backend.client.request_list_generations(top=top, skip=skip, maxPageSize=maxPageSize)
+            if not success:
+                return False, error, None
+            for generation in page.value:
+                self.record_generation_owner(generation.id, backend)
+            generations.extend(page.value)
+        return True, None, PagedGenerationDefinition(value=generations)
+
+    def iter_generations(self,
+                         maxPageSize: int = None,
+                         prefetch: bool = False) -> Iterator[PodcastGenerationDefinition]:
+        """Iterate over the generations of every backend, one backend after the other."""
+        for backend in self.backends:
+            for generation in backend.client.iter_generations(maxPageSize=maxPageSize, prefetch=prefetch):
+                self.record_generation_owner(generation.id, backend)
+                yield generation
+
+    def request_get_operation(self,
+                              operation_location: Url,
+                              print_url: bool = False) -> tuple[bool, str, OperationDefinition]:
+        success, error, operation, _ = self.request_get_operation_with_retry_after(
+            operation_location=operation_location,
+            print_url=print_url)
+        return success, error, operation
+
+    def request_get_operation_with_retry_after(
+        self,
+        operation_location: Url,
+        print_url: bool = False
+    ) -> tuple[bool, str, OperationDefinition, float]:
+        if operation_location is None:
+            raise ValueError("Operation location is required")
+
+        # Several keys of one region share a host, the first backend knowing the operation owns it.
+        for backend in self.find_operation_owners(operation_location):
+            start = time.monotonic()
+            result = backend.client.request_get_operation_with_retry_after(operation_location, print_url=print_url)
+            success, _, operation, _ = result
+            if success and operation is not None:
+                break
+        if success:
+            backend.record_latency(time.monotonic() - start)
+        with self._lock:
+            if success and operation is not None and \
+                    operation.status not in [OperationStatus.NotStarted, OperationStatus.Running]:
+                self._operation_owners.pop(operation_location.url, None)
+            elif success and operation is not None:
+                self._operation_owners[operation_location.url] = backend
+        return result
+
+    def request_operation_until_terminated(
+        self,
+        operation_location: Url,
+        poll_interval_seconds: int = None,
+        polling_policy=None
+    ) -> Optional[OperationStatus]:
+        if operation_location is None:
+            raise ValueError("Operation location is required")
+        with self._lock:
+            backend = self._operation_owners.get(operation_location.url)
+        if backend is None:
+            success, _, operation, _ = self.request_get_operation_with_retry_after(operation_location)
+            if not success or operation is None:
+                return None
+            with self._lock:
+                backend = self._operation_owners.get(operation_location.url)
+            if backend is None:
+                return operation.status
+        status = backend.client.request_operation_until_terminated(
+            operation_location,
+            poll_interval_seconds=poll_interval_seconds,
+            polling_policy=polling_policy)
+        with self._lock:
+            self._operation_owners.pop(operation_location.url, None)
+        return status
@@ -0,0 +1,272 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import asyncio
+import dataclasses
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from urllib3.util import Url
+from urllib3 import HTTPResponse
+from microsoft_speech_client_common.client_common_enum import (
+    OperationStatus
+)
+from microsoft_speech_client_common.client_common_dataclass import (
+    OperationDefinition
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy
+)
+from microsoft_speech_client_common.client_common_client_base import (
+    SpeechLongRunningTaskClientBase
+)
+from microsoft_speech_client_common.client_common_notification import (
+    build_operation_id
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+class AsyncSpeechLongRunningTaskClientBase:
+    """
+    Asyncio counterpart of SpeechLongRunningTaskClientBase.
+
+    Wraps a sync client and runs its blocking HTTP calls on a bounded thread pool, so URL building,
+    request headers, the connection pool and dataclass decoding are shared with the sync client.
+    Waiting between operation polls is an asyncio sleep, which lets one event loop drive many
+    long-running tasks concurrently while only the in-flight HTTP calls occupy a worker thread.
+    """
+
+    client = None
+    executor = None
+
+    def __init__(self,
+                 client: SpeechLongRunningTaskClientBase,
+                 max_workers: int = 32):
+        """
+        Initialize the async client.
+
+        Args:
+            client: Sync client that performs the HTTP requests
+            max_workers: Maximum number of HTTP requests executed concurrently
+        """
+        if client is None:
+            raise ValueError("Sync client is required")
+        if max_workers is None or max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+
+        self.client = client
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=type(self).__name__)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def close(self):
+        """Release the worker threads, waiting for in-flight requests to finish, and close the client."""
+        self.executor.shutdown(wait=True)
+        self.client.close()
+
+    async def aclose(self):
+        """Close like close, waiting for in-flight requests on a default executor thread instead of blocking the event loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def run_in_executor(self, func, *args, **kwargs):
+        """Run a blocking sync client call on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def request_create_long_running_task_until_terminated(
+            self,
+            id: str,
+            creation_body: dataclasses.dataclass,
+            operation_id: str = None,
+            ) -> tuple[bool, str, HTTPResponse, Url]:
+        if id is None or creation_body is None:
+            raise ValueError
+
+        success, error, response, operation_location_url = await self.request_create_long_running_task_with_id(
+            id=id,
+            creation_body=creation_body,
+            operation_id=operation_id)
+        if not success or operation_location_url is None:
+            logger.error("Failed to create task with ID %s with error: %s", id, error)
+            return False, error, None, None
+
+        await self.request_operation_until_terminated(operation_location_url)
+        success, error, response = await self.request_get_long_running_task(id)
+        if not success:
+            logger.error("Failed to query task %s with error: %s", id, error)
+            return False, error, None, None
+        return True, None, response, operation_location_url
+
+    async def request_create_long_running_task_with_id(
+            self,
+            id: str,
+            creation_body: dataclasses.dataclass,
+            operation_id: str = None,
+            retryable: bool = False,
+            ) -> tuple[bool, str, HTTPResponse, Url]:
+        return await self.run_in_executor(
+            self.client.request_create_long_running_task_with_id,
+            id=id,
+            creation_body=creation_body,
+            operation_id=operation_id,
+            retryable=retryable)
+
+    async def request_create_long_running_task_with_url(
+            self,
+            url: Url,
+            creation_body: dataclasses.dataclass,
+            operation_id: str = None,
+            retryable: bool = False,
+            ) -> tuple[bool, str, HTTPResponse, Url]:
+        return await self.run_in_executor(
+            self.client.request_create_long_running_task_with_url,
+            url=url,
+            creation_body=creation_body,
+            operation_id=operation_id,
+            retryable=retryable)
+
+    async def request_list_long_running_tasks(self,
+                                              top: int = None,
+                                              skip: int = None,
+                                              maxPageSize: int = None) -> tuple[bool, str, HTTPResponse]:
+        return await self.run_in_executor(
+            self.client.request_list_long_running_tasks,
+            top=top,
+            skip=skip,
+            maxPageSize=maxPageSize)
+
+    async def request_list_with_url(self,
+                                    url: Url) -> tuple[bool, str, HTTPResponse]:
+        return await self.run_in_executor(self.client.request_list_with_url, url)
+
+    async def request_list_page_with_url(self,
+                                         url: Url) -> tuple[bool, str, list, Url]:
+        return await self.run_in_executor(self.client.request_list_page_with_url, url)
+
+    async def request_get_long_running_task(self,
+                                            id: str,
+                                            additional_headers: dict = None) -> tuple[bool, str, HTTPResponse]:
+        return await self.run_in_executor(
+            self.client.request_get_long_running_task,
+            id,
+            additional_headers=additional_headers)
+
+    async def request_get_with_url(self,
+                                   url: Url,
+                                   additional_headers: dict = None) -> tuple[bool, str, HTTPResponse]:
+        return await self.run_in_executor(
+            self.client.request_get_with_url,
+            url,
+            additional_headers=additional_headers)
+
+    async def request_get_operation(
+        self,
+        operation_location: Url,
+        print_url: bool = False
+    ) -> tuple[bool, str, OperationDefinition]:
+        return await self.run_in_executor(
+            self.client.request_get_operation,
+            operation_location=operation_location,
+            print_url=print_url)
+
+    async def request_get_operation_with_retry_after(
+        self,
+        operation_location: Url,
+        print_url: bool = False
+    ) -> tuple[bool, str, OperationDefinition, float]:
+        return await self.run_in_executor(
+            self.client.request_get_operation_with_retry_after,
+            operation_location=operation_location,
+            print_url=print_url)
+
+    async def request_delete_long_running_task(self,
+                                               id: str) -> tuple[bool, str]:
+        return await self.run_in_executor(self.client.request_delete_long_running_task, id)
+
+    async def request_operation_until_terminated(
+        self,
+        operation_location: Url,
+        poll_interval_seconds: int = None,
+        polling_policy: OperationPollingPolicy = None
+    ) -> OperationStatus:
+        """
+        Poll a long-running operation until it reaches a terminal state without blocking the event loop.
+
+        Args:
+            operation_location: URL of the operation to poll
+            poll_interval_seconds: Fixed time to wait between polls, overrides the polling policy
+            polling_policy: Polling policy to use instead of the client's one
+
+        Returns:
+            Final operation status, None if the operation could not be queried or the deadline passed
+        """
+        if operation_location is None:
+            raise ValueError("Operation location is required")
+
+        tracker = self.client.resolve_polling_policy(
+            poll_interval_seconds=poll_interval_seconds,
+            polling_policy=polling_policy).start(self.client.polling_statistics)
+        print_url = True
+        last_status = None
+        # Notifications arrive on the receiver thread and wake the loop up through call_soon_threadsafe.
+        loop = asyncio.get_running_loop()
+        notified = asyncio.Event()
+
+        def notification_callback(notification):
+            loop.call_soon_threadsafe(notified.set)
+
+        notification_source = self.client.notification_source
+        operation_id = build_operation_id(operation_location)
+        if notification_source is not None:
+            notification_source.subscribe(operation_id, notification_callback)
+        try:
+            while True:
+                success, error, response_operation, retry_after_seconds = await self.request_get_operation_with_retry_after(
+                    operation_location=operation_location,
+                    print_url=print_url
+                )
+                tracker.record_poll()
+                print_url = False
+
+                if not success or response_operation is None:
+                    logger.error("Failed to query operation from location %s with error: %s", operation_location, error)
+                    return None
+
+                self.client.hooks.emit_operation_status(
+                    operation_location,
+                    response_operation,
+                    last_status,
+                    poll_count=tracker.poll_count,
+                    elapsed_seconds=tracker.elapsed_seconds)
+                if last_status != response_operation.status:
+                    logger.info("Operation %s status: %s", response_operation.id, response_operation.status.value)
+                    last_status = response_operation.status
+
+                if response_operation.status not in [OperationStatus.Running, OperationStatus.NotStarted]:
+                    return response_operation.status
+
+                if tracker.expired:
+                    logger.error("Operation %s did not terminate within %s seconds",
+                                 operation_location, tracker.policy.deadline_seconds)
+                    return None
+
+                try:
+                    await asyncio.wait_for(notified.wait(), tracker.next_delay(retry_after_seconds))
+                    logger.debug("Operation %s notified", operation_location)
+                    notified.clear()
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if notification_source is not None:
+                notification_source.unsubscribe(operation_id, notification_callback)
+            tracker.finish()
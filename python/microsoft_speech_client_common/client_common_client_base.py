@@ -5,12 +5,16 @@ import dataclasses
 import orjson
 import urllib3
 import uuid
-import time
-from termcolor import colored
+import threading
 from urllib3.util import Url
 from urllib3 import HTTPResponse
+from typing import Optional
 from microsoft_speech_client_common.client_common_const import (
-    HTTP_HEADERS_OPERATION_LOCATION
+    HTTP_HEADERS_OPERATION_ID,
+    HTTP_HEADERS_OPERATION_LOCATION,
+    HTTP_HEADERS_RETRY_AFTER,
+    PAGED_RESPONSE_VALUE,
+    PAGED_RESPONSE_NEXT_LINKS
 )
 from microsoft_speech_client_common.client_common_enum import (
     OperationStatus
@@ -19,12 +23,74 @@ from microsoft_speech_client_common.client_common_dataclass import (
     OperationDefinition
 )
 from microsoft_speech_client_common.client_common_util import (
-    dict_to_dataclass,
-    append_url_args
+    ResponseError,
+    append_url_args,
+    parse_retry_after
 )
+from microsoft_speech_client_common.client_common_encoder import (
+    encode_json_bytes
+)
+from microsoft_speech_client_common.client_common_decoder import (
+    decode_json_bytes
+)
+from microsoft_speech_client_common.client_common_http_pool import (
+    HttpPoolConfig,
+    HttpPoolStatistics,
+    create_http_pool
+)
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport,
+    Urllib3Transport
+)
+from microsoft_speech_client_common.client_common_retry_policy import (
+    RetryingTransport,
+    RetryPolicy
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+from microsoft_speech_client_common.client_common_events import (
+    ClientEventHooks,
+    InstrumentedTransport
+)
+from microsoft_speech_client_common.client_common_rate_limiter import (
+    RateLimitedTransport,
+    RateLimiter
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy,
+    OperationPollingStatistics
+)
+from microsoft_speech_client_common.client_common_notification import (
+    OperationNotificationSource,
+    build_operation_id
+)
+
+
+logger = get_logger(__name__)
 
 
-class SpeechLongRunningTaskClientBase:
+class OperationPollingPolicyMixin:
+    """Polling policy resolution shared by clients and routers having polling_policy and notification_source."""
+
+    polling_policy = None
+    notification_source = None
+
+    def resolve_polling_policy(
+        self,
+        poll_interval_seconds: int = None,
+        polling_policy: OperationPollingPolicy = None
+    ) -> OperationPollingPolicy:
+        if poll_interval_seconds is not None:
+            return OperationPollingPolicy.fixed(poll_interval_seconds)
+        if polling_policy is not None:
+            return polling_policy
+        if self.notification_source is not None:
+            return self.notification_source.fallback_polling_policy
+        return self.polling_policy
+
+
+class SpeechLongRunningTaskClientBase(OperationPollingPolicyMixin):
     """Base class for Speech service clients that handle long-running task operations."""
     
     region = ""
@@ -32,14 +98,31 @@ class SpeechLongRunningTaskClientBase:
     api_version = ""
     service_url_segment_name = ""
     long_running_tasks_url_segment_name = ""
+    operations_url_segment_name = "operations"
     http = None
+    owns_http = True
+    transport = None
+    retry_policy = None
+    rate_limiter = None
+    hooks = None
+    notification_source = None
+    polling_policy = None
+    polling_statistics = None
 
     def __init__(self,
                 region: str,
                 sub_key: str,
                 api_version: str,
                 service_url_segment_name: str,
-                long_running_tasks_url_segment_name: str):
+                long_running_tasks_url_segment_name: str,
+                polling_policy: OperationPollingPolicy = None,
+                http_pool_config: HttpPoolConfig = None,
+                http: urllib3.PoolManager = None,
+                transport: HttpTransport = None,
+                retry_policy: RetryPolicy = None,
+                rate_limiter: RateLimiter = None,
+                hooks: ClientEventHooks = None,
+                notification_source: OperationNotificationSource = None):
         """
         Initialize the base client with common configuration.
         
@@ -47,6 +130,15 @@ class SpeechLongRunningTaskClientBase:
             region: Azure region for the service
             sub_key: Subscription key for authentication
             api_version: API version to use
+            polling_policy: How operations are polled, adaptive backoff by default
+            http_pool_config: Settings of the connection pool created for this client
+            http: Pool manager shared with other clients, see create_http_pool, http_pool_config is ignored when provided
+            transport: Transport of the API requests, HTTP/1.1 over the pool manager by default, see Http2Transport
+            retry_policy: Retries, retry budget and circuit breakers of the API requests, see RetryPolicy
+            rate_limiter: Client-side rate limits of the API requests, shared with other clients or processes, none by default
+            hooks: Listeners of requests, retries and operation status changes, can be shared with other clients
+            notification_source: Optional source of operation status notifications, operations are then polled
+                when notified and otherwise only at its fallback polling policy, see WebhookNotificationReceiver
         """
         if region is None or sub_key is None:
             raise ValueError("Region and subscription key are required")
@@ -59,25 +151,35 @@ class SpeechLongRunningTaskClientBase:
         self.api_version = api_version
         self.service_url_segment_name = service_url_segment_name
         self.long_running_tasks_url_segment_name = long_running_tasks_url_segment_name
-
-        # Configure retry logic for transient failures
-        # Not retrying for: 200, 201, 204, 400, 401, 403, 404, 409
-        # not retry for below response code:
-        #   OK = 200,
-        #   Created = 201,
-        #   NoContent = 204,
-        #   BadRequest = 400,
-        #   Unauthorized = 401,
-        #   Forbidden = 403,
-        #   NotFound = 404,
-        #   Conflict = 409,
-        status_forcelist = tuple(
-            set(x for x in range(100, 600))
-            - set([200, 201, 204, 400, 401, 403, 404, 409])
-        )
-        retries = urllib3.Retry(total=5, status_forcelist=status_forcelist)
-        timeout = urllib3.util.Timeout(10)
-        self.http = urllib3.PoolManager(timeout=timeout, retries=retries)
+        self.polling_policy = polling_policy if polling_policy is not None else OperationPollingPolicy()
+        self.polling_statistics = OperationPollingStatistics()
+        self.notification_source = notification_source
+
+        # A shared pool manager is used as is, its owner closes it.
+        self.owns_http = http is None
+        self.http = http if http is not None else create_http_pool(http_pool_config)
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.hooks = hooks if hooks is not None else ClientEventHooks()
+        self.hooks.collection_segment_names.add(long_running_tasks_url_segment_name)
+        # A transport passed in is closed by its owner, the default one lives on self.http.
+        transport = transport if transport is not None else Urllib3Transport(self.http)
+        # Innermost, so request latencies exclude rate limit waits and every attempt is an event.
+        transport = InstrumentedTransport(transport=transport, hooks=self.hooks)
+        if rate_limiter is not None:
+            # Inside the retries, so that every attempt waits for a token and 429s slow down the limiter.
+            transport = RateLimitedTransport(transport=transport, rate_limiter=rate_limiter)
+        self.transport = RetryingTransport(transport=transport, policy=self.retry_policy, hooks=self.hooks)
+
+    @property
+    def http_pool_statistics(self) -> Optional[HttpPoolStatistics]:
+        """Connection statistics of the pool manager, None for a pool manager not created by create_http_pool."""
+        return getattr(self.http, "statistics", None)
+
+    def close(self):
+        """Close the pooled connections, unless the pool manager is shared with other clients."""
+        if self.owns_http:
+            self.http.clear()
 
     def build_url(self,
                   segments: str) -> Url:
@@ -123,6 +225,13 @@ class SpeechLongRunningTaskClientBase:
         path = self.build_long_running_task_path(id)
         return self.build_url(path)
 
+    def build_operation_url(self,
+                            operation_id: str) -> Url:
+        """Build the Operation-Location URL of an operation created with the given Operation-Id."""
+        if operation_id is None:
+            raise ValueError
+        return self.build_url(f"{self.service_url_segment_name}/{self.operations_url_segment_name}/{operation_id}")
+
     def build_long_running_tasks_url(self) -> Url:
         if id is None:
             raise ValueError
@@ -148,13 +257,13 @@ class SpeechLongRunningTaskClientBase:
             return False, error, None, None
         
         if not success or operation_location_url is None:
-            print(colored(f"Failed to create task with ID {operation_location_url} with error: {error}", 'red'))
+            logger.error("Failed to create task with ID %s with error: %s", id, error)
             return False, error, None, None
 
         self.request_operation_until_terminated(operation_location_url)
         success, error, response = self.request_get_long_running_task(id)
         if not success:
-            print(colored(f"Failed to query task {id} with error: {error}", 'red'))
+            logger.error("Failed to query task %s with error: %s", id, error)
             return False, error, None, None
         return True, None, response, operation_location_url
 
@@ -163,6 +272,7 @@ class SpeechLongRunningTaskClientBase:
             id: str,
             creation_body: dataclasses.dataclass,
             operation_id: str = None,
+            retryable: bool = False,
             ) -> tuple[bool, str, HTTPResponse, Url]:
         if id is None or creation_body is None:
             raise ValueError
@@ -170,7 +280,8 @@ class SpeechLongRunningTaskClientBase:
         return self.request_create_long_running_task_with_url(
             url=url,
             creation_body=creation_body,
-            operation_id=operation_id
+            operation_id=operation_id,
+            retryable=retryable
         )
     
     def request_create_long_running_task_with_url(
@@ -178,24 +289,36 @@ class SpeechLongRunningTaskClientBase:
             url: Url,
             creation_body: dataclasses.dataclass,
             operation_id: str = None,
+            retryable: bool = False,
             ) -> tuple[bool, str, HTTPResponse, Url]:
+        """
+        Send the create request of a long-running task.
+
+        Args:
+            url: URL of the task
+            creation_body: Request body
+            operation_id: Operation-Id of the create, a random one by default
+            retryable: Whether operation_id and the task ID are deterministic, so that the retry
+                policy may send the create again on a transient failure; ignored without operation_id
+        """
         if url is None or creation_body is None:
             raise ValueError
-        encoded_creation_body = orjson.dumps(dataclasses.asdict(creation_body))
+        encoded_creation_body = encode_json_bytes(creation_body)
 
         headers = self.build_request_header()
         if operation_id is None:
             operation_id = str(uuid.uuid4())
-        headers["Operation-Id"] = operation_id
+            retryable = False
+        headers[HTTP_HEADERS_OPERATION_ID] = operation_id
         headers["Content-Type"] = "application/json"
 
-        print(f"Requesting http PUT: {url}")
-        response = self.http.request("PUT", url.url, headers=headers, body=encoded_creation_body)
+        logger.debug("Requesting http PUT: %s", url)
+        response = self.transport.request("PUT", url.url, headers=headers, body=encoded_creation_body, retryable=retryable)
 
         #   OK = 200,
         #   Created = 201,
         if response.status not in [200, 201]:
-            error = response.data.decode('utf-8')
+            error = ResponseError(response.data.decode('utf-8'), response.status)
             return False, error, None, None
         operation_location = response.headers[HTTP_HEADERS_OPERATION_LOCATION]
         operation_location_url = urllib3.util.parse_url(operation_location)
@@ -222,8 +345,8 @@ class SpeechLongRunningTaskClientBase:
                               url: Url) -> tuple[bool, str, HTTPResponse]:
         headers = self.build_request_header()
 
-        print(f"Requesting http GET: {url}")
-        response = self.http.request("GET", url.url, headers=headers)
+        logger.debug("Requesting http GET: %s", url)
+        response = self.transport.request("GET", url.url, headers=headers)
 
         #   OK = 200,
         if response.status not in [200]:
@@ -231,27 +354,51 @@ class SpeechLongRunningTaskClientBase:
             return False, error, None
         return True, None, response
 
+    def request_list_page_with_url(self,
+                                   url: Url) -> tuple[bool, str, list, Url]:
+        """
+        Request one page of a paged list API.
+
+        Returns:
+            Tuple of (success, error_message, raw page items, next page URL or None on the last page)
+        """
+        success, error, response = self.request_list_with_url(url)
+        if not success:
+            return False, error, None, None
+
+        response_json = orjson.loads(response.data)
+        next_link = next(
+            (response_json[key] for key in PAGED_RESPONSE_NEXT_LINKS if response_json.get(key)),
+            None)
+        next_url = urllib3.util.parse_url(next_link) if next_link is not None else None
+        return True, None, response_json.get(PAGED_RESPONSE_VALUE, []), next_url
+
     def request_get_long_running_task(self,
-                                     id: str) -> tuple[bool, str, HTTPResponse]:
+                                     id: str,
+                                     additional_headers: dict = None) -> tuple[bool, str, HTTPResponse]:
         if id is None:
             raise ValueError
 
         url = self.build_long_running_task_url(id)
-        return self.request_get_with_url(url)
+        return self.request_get_with_url(url, additional_headers=additional_headers)
 
     def request_get_with_url(self,
-                            url: Url) -> tuple[bool, str, HTTPResponse]:
+                            url: Url,
+                            additional_headers: dict = None) -> tuple[bool, str, HTTPResponse]:
         if url is None:
             raise ValueError
 
         headers = self.build_request_header()
+        if additional_headers:
+            headers.update(additional_headers)
 
-        print(f"Requesting http GET: {url}")
-        response = self.http.request("GET", url.url, headers=headers)
+        logger.debug("Requesting http GET: %s", url)
+        response = self.transport.request("GET", url.url, headers=headers)
 
         #   OK = 200,
+        #   NotModified = 304, only when requested with If-None-Match
         #   NotFound = 404,
-        if response.status == 200:
+        if response.status in [200, 304]:
             return True, None, response
         elif response.status == 404:
             return True, None, None
@@ -269,42 +416,58 @@ class SpeechLongRunningTaskClientBase:
         
         Args:
             operation_location: URL of the operation to query
-            print_url: Whether to print the URL being requested
+            print_url: Whether to log the URL being requested
             
         Returns:
             Tuple of (success, error_message, operation_definition)
         """
+        success, error, operation, _ = self.request_get_operation_with_retry_after(
+            operation_location=operation_location,
+            print_url=print_url)
+        return success, error, operation
+
+    def request_get_operation_with_retry_after(
+        self,
+        operation_location: Url,
+        print_url: bool = False
+    ) -> tuple[bool, str, OperationDefinition, float]:
+        """
+        Query the status of a long-running operation, also returning the Retry-After hint of the response.
+
+        Returns:
+            Tuple of (success, error_message, operation_definition, retry_after_seconds)
+        """
         if operation_location is None:
             raise ValueError("Operation location is required")
 
         headers = self.build_request_header()
 
         if print_url:
-            print(f"Requesting http GET: {operation_location}")
+            logger.debug("Requesting http GET: %s", operation_location)
         
-        response = self.http.request("GET", operation_location.url, headers=headers)
+        response = self.transport.request("GET", operation_location.url, headers=headers)
+        retry_after_seconds = parse_retry_after(response.headers.get(HTTP_HEADERS_RETRY_AFTER))
 
         #   OK = 200
         #   NotFound = 404
         if response.status == 200:
-            response_json = response.json()
-            operation = dict_to_dataclass(
-                data=response_json,
+            operation = decode_json_bytes(
+                data=response.data,
                 dataclass_type=OperationDefinition
             )
-            return True, None, operation
+            return True, None, operation, retry_after_seconds
         elif response.status == 404:
-            return True, None, None
+            return True, None, None, retry_after_seconds
 
-        return False, response.reason, None
+        return False, response.reason, None, retry_after_seconds
 
     def request_delete_long_running_task(self,
                                          id: str) -> tuple[bool, str]:
         url = self.build_long_running_task_url(id)
         headers = self.build_request_header()
 
-        print(f"Requesting http DELETE: {url}")
-        response = self.http.request("DELETE", url.url, headers=headers)
+        logger.debug("Requesting http DELETE: %s", url)
+        response = self.transport.request("DELETE", url.url, headers=headers)
 
         #   NoContent = 204,
         if response.status not in [204]:
@@ -315,53 +478,72 @@ class SpeechLongRunningTaskClientBase:
     def request_operation_until_terminated(
         self,
         operation_location: Url,
-        poll_interval_seconds: int = 5
+        poll_interval_seconds: int = None,
+        polling_policy: OperationPollingPolicy = None
     ) -> OperationStatus:
         """
         Poll a long-running operation until it reaches a terminal state.
         
         Args:
             operation_location: URL of the operation to poll
-            poll_interval_seconds: Time to wait between polls (default: 5 seconds)
+            poll_interval_seconds: Fixed time to wait between polls, overrides the polling policy
+            polling_policy: Polling policy to use instead of the client's one
             
         Returns:
-            Final operation status
+            Final operation status, None if the operation could not be queried or the deadline passed
         """
         if operation_location is None:
             raise ValueError("Operation location is required")
 
-        success, error, response_operation = self.request_get_operation(
-            operation_location=operation_location,
-            print_url=True
-        )
-        
-        if not success or response_operation is None:
-            print(colored(
-                f"Failed to query operation from location {operation_location} with error: {error}",
-                'red'
-            ))
-            return None
-
+        tracker = self.resolve_polling_policy(
+            poll_interval_seconds=poll_interval_seconds,
+            polling_policy=polling_policy).start(self.polling_statistics)
+        print_url = True
         last_status = None
-        while response_operation.status in [OperationStatus.Running, OperationStatus.NotStarted]:
-            success, error, response_operation = self.request_get_operation(
-                operation_location=operation_location,
-                print_url=False
-            )
-            
-            if not success or response_operation is None:
-                print(colored(
-                    f"Failed to query operation from location {operation_location} with error: {error}",
-                    'red'
-                ))
-                return None
-            
-            if last_status != response_operation.status:
-                print(response_operation.status)
-                last_status = response_operation.status
-            
-            print(".", end="", flush=True)
-            time.sleep(poll_interval_seconds)
-
-        print()  # New line after polling dots
-        return response_operation.status
\ No newline at end of file
+        # Set by a notification of the operation, which cuts the wait before the next poll short.
+        notified = threading.Event()
+
+        def notification_callback(notification):
+            notified.set()
+
+        operation_id = build_operation_id(operation_location)
+        if self.notification_source is not None:
+            self.notification_source.subscribe(operation_id, notification_callback)
+        try:
+            while True:
+                success, error, response_operation, retry_after_seconds = self.request_get_operation_with_retry_after(
+                    operation_location=operation_location,
+                    print_url=print_url
+                )
+                tracker.record_poll()
+                print_url = False
+
+                if not success or response_operation is None:
+                    logger.error("Failed to query operation from location %s with error: %s", operation_location, error)
+                    return None
+
+                self.hooks.emit_operation_status(
+                    operation_location,
+                    response_operation,
+                    last_status,
+                    poll_count=tracker.poll_count,
+                    elapsed_seconds=tracker.elapsed_seconds)
+                if last_status != response_operation.status:
+                    logger.info("Operation %s status: %s", operation_location, response_operation.status.value)
+                    last_status = response_operation.status
+
+                if response_operation.status not in [OperationStatus.Running, OperationStatus.NotStarted]:
+                    return response_operation.status
+
+                if tracker.expired:
+                    logger.error("Operation %s did not terminate within %s seconds",
+                                 operation_location, tracker.policy.deadline_seconds)
+                    return None
+
+                if notified.wait(tracker.next_delay(retry_after_seconds)):
+                    logger.debug("Operation %s notified", operation_location)
+                    notified.clear()
+        finally:
+            if self.notification_source is not None:
+                self.notification_source.unsubscribe(operation_id, notification_callback)
+            tracker.finish()
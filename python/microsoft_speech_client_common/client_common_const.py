@@ -2,3 +2,24 @@
 # Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
 
 HTTP_HEADERS_OPERATION_LOCATION = "Operation-Location"
+HTTP_HEADERS_OPERATION_ID = "Operation-Id"
+HTTP_HEADERS_RETRY_AFTER = "Retry-After"
+HTTP_HEADERS_ETAG = "ETag"
+HTTP_HEADERS_IF_NONE_MATCH = "If-None-Match"
+HTTP_HEADERS_RANGE = "Range"
+HTTP_HEADERS_ACCEPT_RANGES = "Accept-Ranges"
+HTTP_HEADERS_CONTENT_LENGTH = "Content-Length"
+HTTP_HEADERS_CONTENT_TYPE = "Content-Type"
+# HMAC-SHA256 of an operation notification body, "sha256=" followed by the hex digest.
+HTTP_HEADERS_NOTIFICATION_SIGNATURE = "X-Notification-Signature"
+
+# Request Timeout, Too Many Requests and transient server errors.
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+# Longest default wait between two polls of an operation.
+OPERATION_POLLING_MAX_INTERVAL_SECONDS = 10
+# Fixed interval operations were polled at before adaptive polling, polls_saved is measured against it.
+OPERATION_POLLING_BASELINE_INTERVAL_SECONDS = 5
+
+PAGED_RESPONSE_VALUE = "value"
+PAGED_RESPONSE_NEXT_LINKS = ("nextLink", "@nextLink")
@@ -1,24 +1,31 @@
 # Copyright (c) Microsoft. All rights reserved.
 # Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
 
-import locale
+import typing
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass, make_dataclass
 from urllib3.util import Url
-from typing import Optional
+from typing import Any, Optional, Type
 
 from microsoft_speech_client_common.client_common_enum import (
     OperationStatus, OneApiState
 )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class OperationDefinition:
     id: str
     status: OperationStatus
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
+class OperationNotification:
+    operation_id: str
+    # Status reported by the sender, None when the notification only says that the operation changed.
+    status: Optional[OperationStatus] = None
+
+
+@dataclass(kw_only=True, slots=True)
 class StatelessResourceBaseDefinition:
     id: Optional[str] = None
     displayName: Optional[str] = None
@@ -26,7 +33,64 @@ class StatelessResourceBaseDefinition:
     createdDateTime: Optional[datetime] = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class StatefulResourceBaseDefinition(StatelessResourceBaseDefinition):
     status: Optional[OneApiState] = None
     lastActionDateTime: Optional[datetime] = None
+
+
+# Variant types already built, keyed by (dataclass type, frozen, slots).
+_dataclass_variants = {}
+
+
+def dataclass_variant(dataclass_type: Type[Any],
+                      frozen: bool = True,
+                      slots: bool = True) -> Type[Any]:
+    """
+    Build a flat copy of a dataclass type with other frozen/slots parameters.
+
+    Inherited fields are flattened into the copy and nested dataclass field types, including inside
+    list[...] and Optional[...], are mapped to their own variant, so the decoder produces a consistent
+    object graph. The default is a frozen slotted variant for read-only snapshots.
+    """
+    key = (dataclass_type, frozen, slots)
+    variant = _dataclass_variants.get(key)
+    if variant is not None:
+        return variant
+    if not is_dataclass(dataclass_type):
+        raise ValueError(f"{dataclass_type} is not a dataclass")
+
+    type_hints = typing.get_type_hints(dataclass_type)
+    variant_fields = []
+    for dataclass_field in fields(dataclass_type):
+        if dataclass_field.default is not MISSING:
+            variant_field = field(default=dataclass_field.default)
+        elif dataclass_field.default_factory is not MISSING:
+            variant_field = field(default_factory=dataclass_field.default_factory)
+        else:
+            variant_field = field()
+        annotation = _variant_annotation(type_hints.get(dataclass_field.name, dataclass_field.type), frozen, slots)
+        variant_fields.append((dataclass_field.name, annotation, variant_field))
+
+    prefix = "Frozen" if frozen else ""
+    suffix = "" if slots else "WithDict"
+    variant = make_dataclass(
+        f"{prefix}{dataclass_type.__name__}{suffix}",
+        variant_fields,
+        kw_only=True,
+        frozen=frozen,
+        slots=slots)
+    variant.__module__ = dataclass_type.__module__
+    _dataclass_variants[key] = variant
+    return variant
+
+
+def _variant_annotation(annotation: Any, frozen: bool, slots: bool) -> Any:
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        return typing.Union[tuple(_variant_annotation(argument, frozen, slots) for argument in typing.get_args(annotation))]
+    if origin is list:
+        return list[tuple(_variant_annotation(argument, frozen, slots) for argument in typing.get_args(annotation))]
+    if isinstance(annotation, type) and is_dataclass(annotation):
+        return dataclass_variant(annotation, frozen=frozen, slots=slots)
+    return annotation
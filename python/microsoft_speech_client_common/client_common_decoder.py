@@ -0,0 +1,88 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import types
+import typing
+import orjson
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Optional, Type
+
+
+# Decode plan of each dataclass type: tuple of (field name, converter or None when the value is kept as is).
+_decode_plans = {}
+
+
+def decode_dataclass(data: dict, dataclass_type: Type[Any]) -> Any:
+    """
+    Decode a JSON object into a dataclass instance.
+
+    Nested dataclasses, lists, Optionals, enums and datetimes are converted following the field
+    annotations, and keys without a matching field are ignored. Url fields keep the URL string,
+    parsing every URL of a large page costs more than the rest of the decoding. The per-type
+    decode plan is built on first use and cached.
+    """
+    plan = _decode_plans.get(dataclass_type)
+    if plan is None:
+        plan = _build_decode_plan(dataclass_type)
+    return _decode_with_plan(data, dataclass_type, plan)
+
+
+def decode_json_bytes(data: bytes, dataclass_type: Type[Any]) -> Any:
+    """Parse a JSON response body with orjson and decode it into a dataclass instance."""
+    return decode_dataclass(orjson.loads(data), dataclass_type)
+
+
+def _decode_with_plan(data: dict, dataclass_type: Type[Any], plan: tuple) -> Any:
+    kwargs = {}
+    for name, converter in plan:
+        if name in data:
+            value = data[name]
+            if converter is not None and value is not None:
+                value = converter(value)
+            kwargs[name] = value
+    return dataclass_type(**kwargs)
+
+
+def _build_decode_plan(dataclass_type: Type[Any]) -> tuple:
+    if not is_dataclass(dataclass_type):
+        raise ValueError(f"{dataclass_type} is not a dataclass")
+
+    try:
+        type_hints = typing.get_type_hints(dataclass_type)
+    except (NameError, TypeError):
+        type_hints = {}
+    plan = tuple(
+        (field.name, _build_converter(type_hints.get(field.name, field.type)))
+        for field in fields(dataclass_type)
+    )
+    _decode_plans[dataclass_type] = plan
+    return plan
+
+
+def _build_converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or origin is types.UnionType:
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        # Only Optional[T] has a single candidate type, other unions are kept as parsed.
+        return _build_converter(arguments[0]) if len(arguments) == 1 else None
+
+    if origin is list:
+        arguments = typing.get_args(annotation)
+        item_converter = _build_converter(arguments[0]) if arguments else None
+        if item_converter is None:
+            return None
+        return lambda values: [item_converter(value) if value is not None else None for value in values]
+
+    if not isinstance(annotation, type):
+        return None
+    if is_dataclass(annotation):
+        return lambda value: decode_dataclass(value, annotation)
+    if issubclass(annotation, Enum):
+        # Values unknown to this client version are kept as the raw string.
+        value_to_member = annotation._value2member_map_
+        return lambda value: value_to_member.get(value, value)
+    if annotation is datetime:
+        return datetime.fromisoformat
+    return None
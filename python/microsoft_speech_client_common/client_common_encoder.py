@@ -0,0 +1,41 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import orjson
+from dataclasses import fields, is_dataclass
+from typing import Any
+from urllib3.util import Url
+
+
+# Field names of each dataclass type, in declaration order.
+_encode_plans = {}
+
+
+def encode_json_bytes(data: Any) -> bytes:
+    """
+    Serialize a request body dataclass into JSON bytes.
+
+    Dataclasses are serialized field by field without dataclasses.asdict, which deep copies the
+    whole object graph: each one becomes a shallow dict referencing the original field values,
+    so large text content is only copied once, by orjson into the output. None fields are left
+    out, Url fields are written as their URL string, enums and datetimes are handled by orjson.
+    """
+    return orjson.dumps(data, default=_encode_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, Url):
+        return value.url
+    value_type = type(value)
+    plan = _encode_plans.get(value_type)
+    if plan is None:
+        if not is_dataclass(value_type):
+            raise TypeError(f"Type is not JSON serializable: {value_type.__name__}")
+        plan = tuple(field.name for field in fields(value_type))
+        _encode_plans[value_type] = plan
+    encoded = {}
+    for name in plan:
+        field_value = getattr(value, name)
+        if field_value is not None:
+            encoded[name] = field_value
+    return encoded
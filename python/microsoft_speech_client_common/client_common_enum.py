@@ -23,3 +23,21 @@ class OperationStatus(str, Enum):
     Canceled = 'Canceled'
 
 
+class CircuitState(str, Enum):
+    Closed = 'Closed'
+    Open = 'Open'
+    HalfOpen = 'HalfOpen'
+
+
+class RateLimitCategory(str, Enum):
+    Create = 'Create'
+    Read = 'Read'
+    Poll = 'Poll'
+
+
+class ClientEventType(str, Enum):
+    RequestStart = 'RequestStart'
+    RequestEnd = 'RequestEnd'
+    Retry = 'Retry'
+    StatusChanged = 'StatusChanged'
+    Terminated = 'Terminated'
@@ -0,0 +1,194 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import itertools
+import threading
+import time
+import urllib3
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+from urllib3.util import Url
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_OPERATION_ID
+)
+from microsoft_speech_client_common.client_common_enum import (
+    ClientEventType, OperationStatus
+)
+from microsoft_speech_client_common.client_common_dataclass import (
+    OperationDefinition
+)
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(kw_only=True, slots=True)
+class ClientEvent:
+    type: ClientEventType
+    # Links the RequestStart and RequestEnd events of one attempt.
+    request_id: Optional[int] = None
+    method: Optional[str] = None
+    url: Optional[str] = None
+    # Method and URL path with resource IDs replaced by {id}, for example GET /podcast/generations/{id}.
+    endpoint: Optional[str] = None
+    # Operation-Id of a create, or ID of a polled operation.
+    operation_id: Optional[str] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+    attempt: Optional[int] = None
+    # Request latency, backoff before a retry, or polling time until an operation terminated.
+    duration_seconds: Optional[float] = None
+    operation_status: Optional[OperationStatus] = None
+    poll_count: Optional[int] = None
+    time: float = field(default_factory=time.time)
+
+
+class ClientEventHooks:
+    """
+    Listeners of the requests, retries and operation status changes of clients.
+
+    Events are only built when a listener is attached, so a client without listeners pays one
+    attribute check per request. Listeners are called on the thread sending the request and must
+    be thread-safe and fast; an exception of a listener is logged and ignored.
+    """
+
+    def __init__(self,
+                 collection_segment_names: Iterable[str] = (),
+                 operations_segment_name: str = "operations"):
+        """
+        Initialize the hooks.
+
+        Args:
+            collection_segment_names: URL segments followed by a resource ID, replaced by {id} in endpoints
+            operations_segment_name: URL segment followed by the ID of an operation
+        """
+        # Copied on write, so emitting needs no lock.
+        self._listeners = ()
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self.collection_segment_names = {*collection_segment_names, operations_segment_name}
+        self.operations_segment_name = operations_segment_name
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._listeners)
+
+    def add_listener(self, listener: Callable[[ClientEvent], None]):
+        with self._lock:
+            self._listeners = (*self._listeners, listener)
+
+    def remove_listener(self, listener: Callable[[ClientEvent], None]):
+        with self._lock:
+            self._listeners = tuple(existing for existing in self._listeners if existing is not listener)
+
+    def emit(self, event: ClientEvent):
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as exception:
+                logger.exception("Client event listener failed with error: %s", exception)
+
+    def next_request_id(self) -> int:
+        return next(self._request_ids)
+
+    def build_endpoint(self, method: str, url: str) -> str:
+        segments = (urllib3.util.parse_url(url).path or "/").split("/")
+        for index in range(1, len(segments)):
+            if segments[index - 1] in self.collection_segment_names:
+                segments[index] = "{id}"
+        return f"{method.upper()} {'/'.join(segments)}"
+
+    def build_operation_id(self, url: str, headers: dict = None) -> Optional[str]:
+        """Operation-Id header of a create, or the ID of an operation URL."""
+        if headers is not None and headers.get(HTTP_HEADERS_OPERATION_ID) is not None:
+            return headers[HTTP_HEADERS_OPERATION_ID]
+        segments = (urllib3.util.parse_url(url).path or "").split("/")
+        if len(segments) >= 2 and segments[-2] == self.operations_segment_name:
+            return segments[-1]
+        return None
+
+    def emit_operation_status(self,
+                              operation_location: Url,
+                              operation: OperationDefinition,
+                              previous_status: Optional[OperationStatus],
+                              poll_count: int = None,
+                              elapsed_seconds: float = None):
+        """Emit StatusChanged when a polled operation changed status, and Terminated when it reached a terminal one."""
+        if not self._listeners or operation.status == previous_status:
+            return
+
+        operation_id = self.build_operation_id(operation_location.url)
+        self.emit(ClientEvent(
+            type=ClientEventType.StatusChanged,
+            url=operation_location.url,
+            operation_id=operation_id,
+            operation_status=operation.status))
+        if operation.status not in [OperationStatus.NotStarted, OperationStatus.Running]:
+            self.emit(ClientEvent(
+                type=ClientEventType.Terminated,
+                url=operation_location.url,
+                operation_id=operation_id,
+                operation_status=operation.status,
+                poll_count=poll_count,
+                duration_seconds=elapsed_seconds))
+
+
+class InstrumentedTransport(HttpTransport):
+    """Transport emitting RequestStart and RequestEnd events around each request of another transport."""
+
+    def __init__(self,
+                 transport: HttpTransport,
+                 hooks: ClientEventHooks):
+        if transport is None or hooks is None:
+            raise ValueError
+        self.transport = transport
+        self.hooks = hooks
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                body: bytes = None):
+        hooks = self.hooks
+        if not hooks.enabled:
+            return self.transport.request(method, url, headers=headers, body=body)
+
+        request_id = hooks.next_request_id()
+        endpoint = hooks.build_endpoint(method, url)
+        operation_id = hooks.build_operation_id(url, headers)
+        hooks.emit(ClientEvent(
+            type=ClientEventType.RequestStart,
+            request_id=request_id,
+            method=method,
+            url=url,
+            endpoint=endpoint,
+            operation_id=operation_id))
+
+        start = time.perf_counter()
+        response, error = None, None
+        try:
+            response = self.transport.request(method, url, headers=headers, body=body)
+            return response
+        except urllib3.exceptions.HTTPError as exception:
+            error = str(exception)
+            raise
+        finally:
+            hooks.emit(ClientEvent(
+                type=ClientEventType.RequestEnd,
+                request_id=request_id,
+                method=method,
+                url=url,
+                endpoint=endpoint,
+                operation_id=operation_id,
+                status=response.status if response is not None else None,
+                error=error,
+                duration_seconds=time.perf_counter() - start))
+
+    def close(self):
+        self.transport.close()
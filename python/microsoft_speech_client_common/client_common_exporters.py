@@ -0,0 +1,266 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import bisect
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_CONTENT_LENGTH,
+    HTTP_HEADERS_CONTENT_TYPE
+)
+from microsoft_speech_client_common.client_common_enum import (
+    ClientEventType, OperationStatus
+)
+from microsoft_speech_client_common.client_common_events import (
+    ClientEvent
+)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusExporter:
+    """
+    Client event listener aggregating metrics in the Prometheus text exposition format.
+
+    Requests are counted and timed per method, endpoint and status, retries per endpoint, and
+    terminated operations by status with their poll count and polling time. render returns the
+    metrics page; serve exposes it on /metrics for a Prometheus server to scrape.
+    """
+
+    REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    OPERATION_DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+    OPERATION_POLL_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+    def __init__(self, namespace: str = "speech_client"):
+        self.namespace = namespace
+        self._requests = {}
+        self._request_durations = {}
+        self._retries = {}
+        self._status_changes = {}
+        self._terminated = {}
+        self._operation_polls = _Histogram(self.OPERATION_POLL_BUCKETS)
+        self._operation_durations = _Histogram(self.OPERATION_DURATION_BUCKETS)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ClientEvent):
+        with self._lock:
+            if event.type == ClientEventType.RequestEnd:
+                status = str(event.status) if event.status is not None else "error"
+                key = (("method", event.method), ("endpoint", event.endpoint), ("status", status))
+                self._requests[key] = self._requests.get(key, 0) + 1
+                key = (("method", event.method), ("endpoint", event.endpoint))
+                histogram = self._request_durations.get(key)
+                if histogram is None:
+                    histogram = self._request_durations[key] = _Histogram(self.REQUEST_DURATION_BUCKETS)
+                histogram.observe(event.duration_seconds)
+            elif event.type == ClientEventType.Retry:
+                key = (("method", event.method), ("endpoint", event.endpoint))
+                self._retries[key] = self._retries.get(key, 0) + 1
+            elif event.type == ClientEventType.StatusChanged:
+                key = (("status", event.operation_status.value),)
+                self._status_changes[key] = self._status_changes.get(key, 0) + 1
+            elif event.type == ClientEventType.Terminated:
+                key = (("status", event.operation_status.value),)
+                self._terminated[key] = self._terminated.get(key, 0) + 1
+                if event.poll_count is not None:
+                    self._operation_polls.observe(event.poll_count)
+                if event.duration_seconds is not None:
+                    self._operation_durations.observe(event.duration_seconds)
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        namespace = self.namespace
+        lines = []
+        with self._lock:
+            self._render_counter(lines, f"{namespace}_requests_total", "API requests sent, by response status.", self._requests)
+            lines.append(f"# HELP {namespace}_request_duration_seconds Latency of API requests.")
+            lines.append(f"# TYPE {namespace}_request_duration_seconds histogram")
+            for labels, histogram in self._request_durations.items():
+                self._render_histogram(lines, f"{namespace}_request_duration_seconds", labels, histogram)
+            self._render_counter(lines, f"{namespace}_retries_total", "API requests retried.", self._retries)
+            self._render_counter(lines, f"{namespace}_operation_status_changes_total",
+                                 "Operation status changes observed by polling.", self._status_changes)
+            self._render_counter(lines, f"{namespace}_operations_terminated_total",
+                                 "Operations polled until a terminal status.", self._terminated)
+            lines.append(f"# HELP {namespace}_operation_polls Polls per terminated operation.")
+            lines.append(f"# TYPE {namespace}_operation_polls histogram")
+            self._render_histogram(lines, f"{namespace}_operation_polls", (), self._operation_polls)
+            lines.append(f"# HELP {namespace}_operation_duration_seconds Polling time until an operation terminated.")
+            lines.append(f"# TYPE {namespace}_operation_duration_seconds histogram")
+            self._render_histogram(lines, f"{namespace}_operation_duration_seconds", (), self._operation_durations)
+        lines.append("")
+        return "\n".join(lines)
+
+    def _render_counter(self, lines: list, name: str, help: str, values: dict):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in values.items():
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    def _render_histogram(self, lines: list, name: str, labels: tuple, histogram: _Histogram):
+        cumulative = 0
+        for bucket, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels((*labels, ('le', bucket)))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels((*labels, ('le', '+Inf')))} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def serve(self,
+              host: str = "127.0.0.1",
+              port: int = 9464) -> ThreadingHTTPServer:
+        """Serve the metrics on http://host:port/metrics from a background thread, shut down by the returned server."""
+        exporter = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header(HTTP_HEADERS_CONTENT_TYPE, "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header(HTTP_HEADERS_CONTENT_LENGTH, str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=type(self).__name__, daemon=True).start()
+        return server
+
+
+class OpenTelemetryExporter:
+    """
+    Client event listener recording OpenTelemetry spans.
+
+    Every request attempt is a client span. Requests of one operation, its create (by
+    Operation-Id) and its polls, are children of an operation span that records status changes
+    and retries as span events and ends when the operation terminates. Requires the optional
+    dependency opentelemetry-api, with an SDK configured to export the spans:
+        pip3 install opentelemetry-sdk
+    """
+
+    def __init__(self,
+                 tracer=None,
+                 max_open_operations: int = 10000):
+        """
+        Initialize the exporter.
+
+        Args:
+            tracer: Tracer creating the spans, the one of the global tracer provider by default
+            max_open_operations: Operation spans kept open at most, the oldest are ended beyond it
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as exception:
+            raise ImportError("OpenTelemetryExporter requires opentelemetry: pip3 install opentelemetry-sdk") from exception
+
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer("microsoft_speech_client_common")
+        self.max_open_operations = max_open_operations
+        self._request_spans = {}
+        self._operation_spans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, event: ClientEvent):
+        if event.type == ClientEventType.RequestStart:
+            self._start_request_span(event)
+        elif event.type == ClientEventType.RequestEnd:
+            self._end_request_span(event)
+        elif event.type == ClientEventType.Retry:
+            operation_span = self._get_operation_span(event.operation_id, create=False)
+            if operation_span is not None:
+                operation_span.add_event("retry", {
+                    "http.request.method": event.method,
+                    "http.response.status_code": event.status if event.status is not None else 0,
+                    "retry.attempt": event.attempt,
+                    "retry.backoff_seconds": event.duration_seconds,
+                })
+        elif event.type == ClientEventType.StatusChanged:
+            operation_span = self._get_operation_span(event.operation_id, create=True)
+            if operation_span is not None:
+                operation_span.add_event("status_changed", {"operation.status": event.operation_status.value})
+        elif event.type == ClientEventType.Terminated:
+            with self._lock:
+                operation_span = self._operation_spans.pop(event.operation_id, None)
+            if operation_span is not None:
+                operation_span.set_attribute("operation.status", event.operation_status.value)
+                operation_span.set_attribute("operation.poll_count", event.poll_count or 0)
+                if event.operation_status != OperationStatus.Succeeded:
+                    operation_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+                operation_span.end()
+
+    def _start_request_span(self, event: ClientEvent):
+        context = None
+        operation_span = self._get_operation_span(event.operation_id, create=event.method == "PUT")
+        if operation_span is not None:
+            context = self._trace.set_span_in_context(operation_span)
+        attributes = {"http.request.method": event.method, "url.full": event.url}
+        if event.operation_id is not None:
+            attributes["operation.id"] = event.operation_id
+        span = self.tracer.start_span(
+            event.endpoint,
+            context=context,
+            kind=self._trace.SpanKind.CLIENT,
+            attributes=attributes)
+        with self._lock:
+            self._request_spans[event.request_id] = span
+
+    def _end_request_span(self, event: ClientEvent):
+        with self._lock:
+            span = self._request_spans.pop(event.request_id, None)
+        if span is None:
+            return
+        if event.status is not None:
+            span.set_attribute("http.response.status_code", event.status)
+        if event.error is not None or (event.status is not None and event.status >= 500):
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, event.error))
+        span.end()
+
+    def _get_operation_span(self, operation_id: str, create: bool):
+        if operation_id is None:
+            return None
+        evicted = []
+        with self._lock:
+            span = self._operation_spans.get(operation_id)
+            if span is None and create:
+                span = self.tracer.start_span(
+                    "operation",
+                    kind=self._trace.SpanKind.INTERNAL,
+                    attributes={"operation.id": operation_id})
+                self._operation_spans[operation_id] = span
+                while len(self._operation_spans) > self.max_open_operations:
+                    evicted.append(self._operation_spans.popitem(last=False)[1])
+        for evicted_span in evicted:
+            evicted_span.end()
+        return span
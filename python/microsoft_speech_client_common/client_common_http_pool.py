@@ -0,0 +1,160 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import socket
+import threading
+import urllib3
+from dataclasses import dataclass
+from urllib3.connection import HTTPConnection
+from microsoft_speech_client_common.client_common_const import (
+    RETRY_STATUSES
+)
+
+
+@dataclass(kw_only=True, slots=True)
+class HttpPoolConfig:
+    """
+    Connection pool settings of a client.
+
+    maxsize is per host: it should be at least the number of threads sending requests at the same
+    time, connections opened above it are closed after one request instead of being kept alive.
+    """
+    num_pools: int = 10
+    maxsize: int = 32
+    # Wait for a free connection instead of opening one above maxsize.
+    block: bool = False
+    connect_timeout_seconds: float = 10
+    read_timeout_seconds: float = 10
+    retries_total: int = 5
+    tcp_keepalive: bool = True
+
+
+class HttpPoolStatistics:
+    """Thread-safe counters of connections opened, reused and discarded by a pool manager."""
+
+    def __init__(self):
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.connections_discarded = 0
+        self._lock = threading.Lock()
+
+    def record_opened(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_reused(self):
+        with self._lock:
+            self.connections_reused += 1
+
+    def record_discarded(self):
+        with self._lock:
+            self.connections_discarded += 1
+
+    @property
+    def reuse_ratio(self) -> float:
+        with self._lock:
+            requests = self.connections_opened + self.connections_reused
+            return self.connections_reused / requests if requests > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        reuse_ratio = self.reuse_ratio
+        with self._lock:
+            return {
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+                "connections_discarded": self.connections_discarded,
+                "reuse_ratio": round(reuse_ratio, 3),
+            }
+
+
+class _StatisticsPoolMixin:
+    statistics = None
+
+    def _new_conn(self):
+        connection = super()._new_conn()
+        connection.opened_by_pool = True
+        if self.statistics is not None:
+            self.statistics.record_opened()
+        return connection
+
+    def _get_conn(self, timeout=None):
+        connection = super()._get_conn(timeout)
+        if getattr(connection, "opened_by_pool", False):
+            connection.opened_by_pool = False
+        elif self.statistics is not None:
+            # A pooled connection whose socket was dropped, or closed after the last response, connects again.
+            if connection.sock is None:
+                self.statistics.record_opened()
+            else:
+                self.statistics.record_reused()
+        return connection
+
+    def _put_conn(self, connection):
+        # A connection returned to a full pool is closed by urllib3 instead of being kept alive.
+        if connection is not None and self.statistics is not None and self.pool is not None and self.pool.full():
+            self.statistics.record_discarded()
+        super()._put_conn(connection)
+
+
+class StatisticsHTTPConnectionPool(_StatisticsPoolMixin, urllib3.HTTPConnectionPool):
+    pass
+
+
+class StatisticsHTTPSConnectionPool(_StatisticsPoolMixin, urllib3.HTTPSConnectionPool):
+    pass
+
+
+class StatisticsPoolManager(urllib3.PoolManager):
+    """PoolManager whose per-host connection pools report to one HttpPoolStatistics."""
+
+    def __init__(self, statistics: HttpPoolStatistics = None, **kwargs):
+        super().__init__(**kwargs)
+        self.statistics = statistics if statistics is not None else HttpPoolStatistics()
+        self.pool_classes_by_scheme = {
+            "http": StatisticsHTTPConnectionPool,
+            "https": StatisticsHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.statistics = self.statistics
+        return pool
+
+
+def build_default_retries(retries_total: int) -> urllib3.Retry:
+    """
+    Retries of requests sent straight through the pool manager, such as audio downloads and uploads.
+
+    API requests of the clients are sent with retries disabled here and retried by RetryPolicy.
+    """
+    return urllib3.Retry(
+        total=retries_total,
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        respect_retry_after_header=True)
+
+
+def create_http_pool(config: HttpPoolConfig = None) -> StatisticsPoolManager:
+    """
+    Create a connection pool manager.
+
+    The pool manager keeps one pool per host, so a single one can be shared by several clients,
+    including clients of different regions.
+    """
+    if config is None:
+        config = HttpPoolConfig()
+    if config.maxsize is None or config.maxsize <= 0:
+        raise ValueError("maxsize must be positive")
+
+    socket_options = list(HTTPConnection.default_socket_options)
+    if config.tcp_keepalive:
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+    return StatisticsPoolManager(
+        num_pools=config.num_pools,
+        maxsize=config.maxsize,
+        block=config.block,
+        timeout=urllib3.util.Timeout(connect=config.connect_timeout_seconds, read=config.read_timeout_seconds),
+        retries=build_default_retries(config.retries_total),
+        socket_options=socket_options)
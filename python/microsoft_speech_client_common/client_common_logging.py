@@ -0,0 +1,76 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import logging
+import orjson
+from datetime import datetime, timezone
+from typing import Any
+from microsoft_speech_client_common.client_common_util import (
+    dataclass_to_json_string, json_default
+)
+
+
+LIBRARY_LOGGER_NAMES = ("microsoft_speech_client_common", "microsoft_client_podcast")
+
+# Quiet unless the application configures logging.
+for library_logger_name in LIBRARY_LOGGER_NAMES:
+    logging.getLogger(library_logger_name).addHandler(logging.NullHandler())
+
+# Attributes of every LogRecord, anything else was passed with extra= and is a structured field.
+_LOG_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger of a library module, silent until the application adds handlers."""
+    return logging.getLogger(name)
+
+
+class LazyJson:
+    """Log argument serializing a dataclass to indented JSON only when the message is emitted."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __str__(self) -> str:
+        return dataclass_to_json_string(self.data)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, fields passed with extra= and the exception."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _LOG_RECORD_ATTRIBUTES:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=_json_log_default).decode("utf-8")
+
+
+def _json_log_default(value: Any) -> Any:
+    try:
+        return json_default(value)
+    except TypeError:
+        return str(value)
+
+
+def configure_logging(level: int = logging.INFO,
+                      json_output: bool = False,
+                      stream=None):
+    """Log the library to stderr (or stream), as JSON lines or as text, for command line tools."""
+    handler = logging.StreamHandler(stream)
+    if json_output:
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root_logger = logging.getLogger()
+    root_logger.handlers[:] = [handler]
+    root_logger.setLevel(level)
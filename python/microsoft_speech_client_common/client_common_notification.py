@@ -0,0 +1,232 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import hashlib
+import hmac
+import ipaddress
+import orjson
+import threading
+import urllib3
+from typing import Callable
+from urllib3.util import Url
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_CONTENT_LENGTH,
+    HTTP_HEADERS_NOTIFICATION_SIGNATURE,
+    HTTP_HEADERS_OPERATION_LOCATION
+)
+from microsoft_speech_client_common.client_common_enum import (
+    OperationStatus
+)
+from microsoft_speech_client_common.client_common_dataclass import (
+    OperationNotification
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+def build_operation_id(operation_location: Url) -> str:
+    """ID of an operation, the last segment of its Operation-Location path."""
+    return (operation_location.path or "").rstrip("/").rsplit("/", 1)[-1]
+
+
+class OperationNotificationSource:
+    """
+    Source of notifications that long-running operations changed status, sent by the service.
+
+    Clients subscribe to the operations they wait for and poll one as soon as a notification
+    for it arrives; the notification is a wake-up call, the status is always confirmed with a
+    poll. Notifications can be lost, so operations are still polled with fallback_polling_policy,
+    much less often than without notifications. Subclasses deliver notifications with notify.
+    """
+
+    # Slow safety net for lost notifications.
+    DEFAULT_FALLBACK_POLLING_POLICY = OperationPollingPolicy(
+        initial_interval_seconds=30,
+        backoff_multiplier=2,
+        max_interval_seconds=300)
+
+    def __init__(self,
+                 fallback_polling_policy: OperationPollingPolicy = None):
+        """
+        Initialize the source.
+
+        Args:
+            fallback_polling_policy: Polling policy of operations waited for with notifications
+        """
+        self.fallback_polling_policy = fallback_polling_policy if fallback_polling_policy is not None \
+            else self.DEFAULT_FALLBACK_POLLING_POLICY
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def subscribe(self,
+                  operation_id: str,
+                  callback: Callable[[OperationNotification], None]):
+        """Call callback with every notification of the operation until unsubscribed."""
+        with self._lock:
+            self._subscriptions[operation_id] = (*self._subscriptions.get(operation_id, ()), callback)
+
+    def unsubscribe(self,
+                    operation_id: str,
+                    callback: Callable[[OperationNotification], None]):
+        with self._lock:
+            callbacks = tuple(existing for existing in self._subscriptions.get(operation_id, ()) if existing is not callback)
+            if callbacks:
+                self._subscriptions[operation_id] = callbacks
+            else:
+                self._subscriptions.pop(operation_id, None)
+
+    def notify(self, notification: OperationNotification) -> bool:
+        """
+        Deliver a notification to the subscribers of its operation.
+
+        Returns:
+            Whether anyone was waiting for the operation
+        """
+        with self._lock:
+            callbacks = self._subscriptions.get(notification.operation_id, ())
+        for callback in callbacks:
+            try:
+                callback(notification)
+            except Exception as exception:
+                logger.exception("Operation notification callback failed with error: %s", exception)
+        return bool(callbacks)
+
+    def close(self):
+        pass
+
+
+def is_loopback_host(host: str) -> bool:
+    """Whether host only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class WebhookNotificationReceiver(OperationNotificationSource):
+    """
+    Embedded HTTP server receiving operation notifications as webhook callbacks.
+
+    The service, or a relay such as an Event Grid subscription, POSTs a JSON object to
+    callback_url with the operation ID as operationId or id, or its operationLocation, and
+    optionally its status. With a secret, the body must be signed with HMAC-SHA256 in the
+    X-Notification-Signature header as sha256=<hex digest>, otherwise it is rejected with 401. A
+    secret is required to listen on an interface other machines can reach. Accepted callbacks are
+    answered 202, whether or not anyone waits for the operation.
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 path: str = "/notifications",
+                 secret: str = None,
+                 public_url: str = None,
+                 fallback_polling_policy: OperationPollingPolicy = None):
+        """
+        Initialize the receiver and start serving on a background thread.
+
+        Args:
+            host: Interface to listen on, 0.0.0.0 to accept callbacks from other machines
+            port: Port to listen on, a free one by default
+            path: URL path of the callbacks
+            secret: Shared secret the callback bodies are signed with, required unless host is a loopback address
+            public_url: URL the service reaches the receiver at when behind a proxy,
+                callback_url is built from host and port by default
+            fallback_polling_policy: Polling policy of operations waited for with notifications
+        """
+        if secret is None and not is_loopback_host(host):
+            raise ValueError(f"A notification secret is required to receive notifications on {host}")
+
+        # Imported here: every client imports this module for OperationNotificationSource, only receivers serve HTTP.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        super().__init__(fallback_polling_policy=fallback_polling_policy)
+        self.path = path
+        self.public_url = public_url
+        self._secret = secret.encode("utf-8") if secret is not None else None
+        receiver = self
+
+        class NotificationRequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get(HTTP_HEADERS_CONTENT_LENGTH, 0) or 0))
+                status = receiver.receive(self.path, self.headers, body)
+                self.send_response(status)
+                self.send_header(HTTP_HEADERS_CONTENT_LENGTH, "0")
+                self.end_headers()
+
+        self._server = ThreadingHTTPServer((host, port), NotificationRequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    @property
+    def callback_url(self) -> str:
+        """URL to register with the service as the notification target."""
+        if self.public_url is not None:
+            return self.public_url
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    def receive(self,
+                path: str,
+                headers,
+                body: bytes) -> int:
+        """Handle one callback and return the HTTP status to answer it with."""
+        if path.split("?")[0] != self.path:
+            return 404
+        if self._secret is not None:
+            expected = "sha256=" + hmac.new(self._secret, body, hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(expected, headers.get(HTTP_HEADERS_NOTIFICATION_SIGNATURE, "")):
+                logger.warning("Rejected operation notification with an invalid signature")
+                return 401
+
+        notification = self.parse_notification(body, headers)
+        if notification is None:
+            logger.warning("Rejected malformed operation notification: %s", body[:200])
+            return 400
+        logger.debug("Received notification of operation %s status %s", notification.operation_id, notification.status)
+        self.notify(notification)
+        return 202
+
+    def parse_notification(self,
+                           body: bytes,
+                           headers) -> OperationNotification:
+        try:
+            payload = orjson.loads(body) if body else {}
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(payload, dict):
+            return None
+
+        operation_id = payload.get("operationId") or payload.get("id")
+        operation_location = payload.get("operationLocation") or headers.get(HTTP_HEADERS_OPERATION_LOCATION)
+        if operation_id is None and operation_location:
+            operation_id = build_operation_id(urllib3.util.parse_url(operation_location))
+        if not operation_id or not isinstance(operation_id, str):
+            return None
+        try:
+            status = OperationStatus(payload["status"]) if payload.get("status") is not None else None
+        except ValueError:
+            status = None
+        return OperationNotification(operation_id=operation_id, status=status)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,288 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Callable
+from urllib3.util import Url
+from microsoft_speech_client_common.client_common_enum import (
+    OperationStatus
+)
+from microsoft_speech_client_common.client_common_dataclass import (
+    OperationDefinition
+)
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy,
+    OperationPollingTracker
+)
+from microsoft_speech_client_common.client_common_client_base import (
+    SpeechLongRunningTaskClientBase
+)
+from microsoft_speech_client_common.client_common_notification import (
+    build_operation_id
+)
+from microsoft_speech_client_common.client_common_logging import (
+    get_logger
+)
+
+
+logger = get_logger(__name__)
+
+
+class OperationPoller:
+    """
+    Watch many long-running operations from a single scheduler thread.
+
+    Callers register Operation-Location URLs and get back a future that resolves to the
+    (success, error, operation) tuple of the last request_get_operation call, once the
+    operation reaches a terminal status, can no longer be queried or passes the policy
+    deadline. The scheduler thread only picks the operations that are due and hands their polls
+    to a small worker pool, so a slow poll does not hold back the others. All polls go through the client's shared connection pool, each operation
+    follows its own polling policy backoff, and the first poll is spread over the initial
+    interval so operations registered together do not hit the service in the same instant.
+    With a notification source on the client, a notified operation is polled right away and
+    the others only at the fallback polling policy of the source.
+    """
+
+    client = None
+    polling_policy = None
+
+    def __init__(self,
+                 client: SpeechLongRunningTaskClientBase,
+                 polling_policy: OperationPollingPolicy = None,
+                 max_workers: int = 4):
+        """
+        Initialize the poller and start its scheduler thread.
+
+        Args:
+            client: Client used to query operations
+            polling_policy: Polling policy of every registered operation, the client's one if not provided
+            max_workers: Maximum number of polls in flight at once
+        """
+        if client is None:
+            raise ValueError("Client is required")
+        if max_workers is None or max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+
+        self.client = client
+        self.polling_policy = client.resolve_polling_policy(polling_policy=polling_policy)
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="operation-poller")
+        self._thread = threading.Thread(
+            target=self._run,
+            name=type(self).__name__,
+            daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of operations still being watched."""
+        with self._condition:
+            return sum(1 for poll_time, _, watched_operation in self._schedule if poll_time == watched_operation.poll_time)
+
+    def register(self,
+                 operation_location: Url,
+                 callback: Callable[[Future], None] = None,
+                 status_callback: Callable[[OperationDefinition], None] = None) -> Future:
+        """
+        Start watching an operation.
+
+        Args:
+            operation_location: URL of the operation to poll
+            callback: Optional function called with the future once it is resolved
+            status_callback: Optional function called on a poller worker thread with the polled operation
+                whenever its status changes
+
+        Returns:
+            Future resolving to (success, error, operation)
+        """
+        if operation_location is None:
+            raise ValueError("Operation location is required")
+
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        watched_operation = _WatchedOperation(
+            operation_location=operation_location,
+            future=future,
+            tracker=self.polling_policy.start(self.client.polling_statistics),
+            status_callback=status_callback)
+        # The first poll lands anywhere in the first interval to spread out operations registered together.
+        first_poll_time = time.monotonic() + random.uniform(0, self.polling_policy.initial_interval_seconds)
+        notification_source = self.client.notification_source
+        if notification_source is not None:
+            watched_operation.notification_callback = lambda notification: self._poll_now(watched_operation)
+            notification_source.subscribe(build_operation_id(operation_location), watched_operation.notification_callback)
+        with self._condition:
+            if not self._closed:
+                self._push(first_poll_time, watched_operation)
+                return future
+        self._unsubscribe(watched_operation)
+        raise RuntimeError("Poller is closed")
+
+    def close(self):
+        """Stop the scheduler; operations still being watched are resolved as failed."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            remaining = [watched_operation for poll_time, _, watched_operation in self._schedule
+                         if poll_time == watched_operation.poll_time]
+            self._schedule = []
+            self._condition.notify_all()
+        self._thread.join()
+        # Polls in flight see the poller closed and resolve their operation as failed.
+        self._executor.shutdown(wait=True)
+        for watched_operation in remaining:
+            self._resolve(watched_operation, (
+                False,
+                f"Poller closed before operation {watched_operation.operation_location} terminated",
+                None))
+
+    def _push(self,
+              poll_time: float,
+              watched_operation: "_WatchedOperation"):
+        # Entries whose time is no longer the poll time of their operation are stale and skipped.
+        watched_operation.poll_time = poll_time
+        heapq.heappush(self._schedule, (poll_time, next(self._sequence), watched_operation))
+        self._condition.notify()
+
+    def _poll_now(self, watched_operation: "_WatchedOperation"):
+        """Move the next poll of a notified operation to now, or right after the poll in flight."""
+        with self._condition:
+            if self._closed or watched_operation.future.done():
+                return
+            if watched_operation.poll_time is None:
+                watched_operation.notified = True
+            elif watched_operation.poll_time > time.monotonic():
+                self._push(time.monotonic(), watched_operation)
+
+    def _unsubscribe(self, watched_operation: "_WatchedOperation"):
+        if watched_operation.notification_callback is not None:
+            self.client.notification_source.unsubscribe(
+                build_operation_id(watched_operation.operation_location),
+                watched_operation.notification_callback)
+
+    def _resolve(self,
+                 watched_operation: "_WatchedOperation",
+                 result: tuple):
+        self._unsubscribe(watched_operation)
+        watched_operation.resolve(result)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._schedule:
+                        wait_seconds = self._schedule[0][0] - time.monotonic()
+                        if wait_seconds <= 0:
+                            break
+                        self._condition.wait(wait_seconds)
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+                poll_time, _, watched_operation = heapq.heappop(self._schedule)
+                if poll_time != watched_operation.poll_time:
+                    continue
+                watched_operation.poll_time = None
+                watched_operation.notified = False
+
+            # Cancelled by the caller, stop watching it.
+            if watched_operation.future.cancelled():
+                self._unsubscribe(watched_operation)
+                continue
+            self._executor.submit(self._poll, watched_operation)
+
+    def _poll(self, watched_operation: "_WatchedOperation"):
+        """Poll an operation on a worker thread, then schedule its next poll or resolve it."""
+        operation_location = watched_operation.operation_location
+        tracker = watched_operation.tracker
+        try:
+            success, error, response_operation, retry_after_seconds = \
+                self.client.request_get_operation_with_retry_after(operation_location)
+        except Exception as exception:
+            success, error, response_operation, retry_after_seconds = False, str(exception), None, None
+        tracker.record_poll()
+        if success and response_operation is not None:
+            self.client.hooks.emit_operation_status(
+                operation_location,
+                response_operation,
+                watched_operation.last_status,
+                poll_count=tracker.poll_count,
+                elapsed_seconds=tracker.elapsed_seconds)
+            watched_operation.report_status(response_operation)
+
+        if success and response_operation is not None and \
+                response_operation.status in [OperationStatus.Running, OperationStatus.NotStarted]:
+            if tracker.expired:
+                success, error, response_operation = (
+                    False,
+                    f"Operation {operation_location} did not terminate within {tracker.policy.deadline_seconds} seconds",
+                    None)
+            else:
+                poll_time = time.monotonic() + tracker.next_delay(retry_after_seconds)
+                with self._condition:
+                    if not self._closed:
+                        # Notified while the poll was in flight, the status may have changed since.
+                        self._push(time.monotonic() if watched_operation.notified else poll_time, watched_operation)
+                        return
+                success, error, response_operation = (
+                    False, f"Poller closed before operation {operation_location} terminated", None)
+
+        self._resolve(watched_operation, (success, error, response_operation))
+
+
+class _WatchedOperation:
+    """State of one operation registered with an OperationPoller."""
+
+    __slots__ = ("operation_location", "future", "tracker", "status_callback", "last_status",
+                 "poll_time", "notified", "notification_callback")
+
+    def __init__(self,
+                 operation_location: Url,
+                 future: Future,
+                 tracker: OperationPollingTracker,
+                 status_callback: Callable[[OperationDefinition], None] = None):
+        self.operation_location = operation_location
+        self.future = future
+        self.tracker = tracker
+        self.status_callback = status_callback
+        self.last_status = None
+        # Time of the next scheduled poll, None while a poll is in flight.
+        self.poll_time = None
+        self.notified = False
+        self.notification_callback = None
+
+    def report_status(self, operation: OperationDefinition):
+        if operation.status == self.last_status:
+            return
+        self.last_status = operation.status
+        if self.status_callback is not None:
+            try:
+                self.status_callback(operation)
+            except Exception as exception:
+                # A failing listener must not stop the scheduler thread.
+                logger.exception("Operation status callback failed with error: %s", exception)
+
+    def resolve(self, result: tuple):
+        self.tracker.finish()
+        try:
+            self.future.set_result(result)
+        except InvalidStateError:
+            # Cancelled by the caller.
+            pass
@@ -0,0 +1,143 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from microsoft_speech_client_common.client_common_const import (
+    OPERATION_POLLING_BASELINE_INTERVAL_SECONDS,
+    OPERATION_POLLING_MAX_INTERVAL_SECONDS
+)
+
+
+@dataclass(kw_only=True)
+class OperationPollingPolicy:
+    """
+    How often a long-running operation is polled.
+
+    The first poll waits initial_interval_seconds, every following wait is multiplied by
+    backoff_multiplier up to max_interval_seconds, and each wait is spread by +/- jitter_ratio.
+    A Retry-After header returned by the operation endpoint extends the wait when honored,
+    and polling gives up once deadline_seconds have elapsed.
+    """
+    initial_interval_seconds: float = 1
+    backoff_multiplier: float = 1.5
+    max_interval_seconds: float = OPERATION_POLLING_MAX_INTERVAL_SECONDS
+    jitter_ratio: float = 0.1
+    honor_retry_after: bool = True
+    deadline_seconds: Optional[float] = None
+
+    def __post_init__(self):
+        if self.initial_interval_seconds <= 0 or self.max_interval_seconds <= 0:
+            raise ValueError("Polling intervals must be positive")
+        if self.backoff_multiplier < 1:
+            raise ValueError("backoff_multiplier must be at least 1")
+        if not 0 <= self.jitter_ratio <= 1:
+            raise ValueError("jitter_ratio must be between 0 and 1")
+
+    @classmethod
+    def fixed(cls, interval_seconds: float) -> "OperationPollingPolicy":
+        """Policy polling at a constant interval, the behavior before adaptive polling."""
+        return cls(
+            initial_interval_seconds=interval_seconds,
+            backoff_multiplier=1,
+            max_interval_seconds=interval_seconds,
+            jitter_ratio=0)
+
+    def start(self, statistics: "OperationPollingStatistics" = None) -> "OperationPollingTracker":
+        """Start tracking the polling of one operation."""
+        return OperationPollingTracker(policy=self, statistics=statistics)
+
+
+class OperationPollingTracker:
+    """Polling state of one operation under an OperationPollingPolicy."""
+
+    def __init__(self,
+                 policy: OperationPollingPolicy,
+                 statistics: "OperationPollingStatistics" = None):
+        self.policy = policy
+        self.statistics = statistics
+        self.start_time = time.monotonic()
+        self.poll_count = 0
+        self.interval_seconds = policy.initial_interval_seconds
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.start_time
+
+    @property
+    def expired(self) -> bool:
+        return self.policy.deadline_seconds is not None and self.elapsed_seconds >= self.policy.deadline_seconds
+
+    def record_poll(self):
+        self.poll_count += 1
+
+    def next_delay(self,
+                   retry_after_seconds: float = None) -> float:
+        """Return how long to wait before the next poll, and advance the backoff."""
+        jitter = self.interval_seconds * self.policy.jitter_ratio
+        delay = self.interval_seconds + random.uniform(-jitter, jitter)
+        if self.policy.honor_retry_after and retry_after_seconds is not None:
+            delay = max(delay, retry_after_seconds)
+        self.interval_seconds = min(
+            self.interval_seconds * self.policy.backoff_multiplier,
+            self.policy.max_interval_seconds)
+
+        if self.policy.deadline_seconds is not None:
+            delay = min(delay, max(0, self.policy.deadline_seconds - self.elapsed_seconds))
+        return delay
+
+    def finish(self):
+        """Report the finished polling to the statistics, if any."""
+        if self.statistics is not None:
+            self.statistics.record(
+                poll_count=self.poll_count,
+                elapsed_seconds=self.elapsed_seconds)
+
+
+class OperationPollingStatistics:
+    """
+    Thread-safe counters of operation polling.
+
+    baseline_poll_count estimates the polls a fixed baseline_interval_seconds loop would have
+    sent for the same operations, so polls_saved measures what the policy saved. The baseline is
+    the fixed 5 seconds interval operations were polled at before adaptive polling.
+    """
+
+    def __init__(self,
+                 baseline_interval_seconds: float = OPERATION_POLLING_BASELINE_INTERVAL_SECONDS):
+        if baseline_interval_seconds <= 0:
+            raise ValueError("baseline_interval_seconds must be positive")
+        self.baseline_interval_seconds = baseline_interval_seconds
+        self.operation_count = 0
+        self.poll_count = 0
+        self.baseline_poll_count = 0
+        self.elapsed_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def polls_saved(self) -> int:
+        return self.baseline_poll_count - self.poll_count
+
+    def record(self,
+               poll_count: int,
+               elapsed_seconds: float):
+        baseline_poll_count = 1 + math.ceil(elapsed_seconds / self.baseline_interval_seconds)
+        with self._lock:
+            self.operation_count += 1
+            self.poll_count += poll_count
+            self.baseline_poll_count += baseline_poll_count
+            self.elapsed_seconds += elapsed_seconds
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "operation_count": self.operation_count,
+                "poll_count": self.poll_count,
+                "baseline_poll_count": self.baseline_poll_count,
+                "polls_saved": self.baseline_poll_count - self.poll_count,
+                "elapsed_seconds": self.elapsed_seconds,
+            }
@@ -0,0 +1,282 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import orjson
+import threading
+import time
+from typing import Optional
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_RETRY_AFTER
+)
+from microsoft_speech_client_common.client_common_enum import (
+    RateLimitCategory
+)
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport
+)
+from microsoft_speech_client_common.client_common_util import (
+    parse_retry_after
+)
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class RateLimitTimeoutError(TimeoutError):
+    """
+    Raised when a request waited longer than max_wait_seconds for its rate limit.
+
+    Not a urllib3 HTTPError: the request was never sent, so it is neither retried nor counted as a
+    failure of the host by the retry policy.
+    """
+
+
+class RateLimitStateFile:
+    """
+    Token bucket states kept in a local file, so processes sharing the file share the rate limits.
+
+    Every access holds an exclusive flock on the file, which makes it POSIX only.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise OSError("Sharing rate limits across processes requires fcntl file locks (POSIX)")
+        if path is None:
+            raise ValueError
+        self.path = path
+        self._file = open(path, "a+b")
+
+    def update(self, bucket_name: str, update_state) -> float:
+        """Apply update_state to the stored state of a bucket under the file lock, returning its result."""
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            self._file.seek(0)
+            content = self._file.read()
+            states = orjson.loads(content) if content else {}
+            state = states.setdefault(bucket_name, {})
+            result = update_state(state)
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(orjson.dumps(states))
+            self._file.flush()
+            return result
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        self._file.close()
+
+
+class TokenBucket:
+    """
+    Token bucket admitting rate_per_second requests on average with bursts of burst requests.
+
+    A throttled response pauses the bucket for its Retry-After and halves the rate, which then
+    grows back by a twentieth of the configured rate per successful request.
+    """
+
+    DEFAULT_THROTTLE_PAUSE_SECONDS = 1
+    MIN_RATE_RATIO = 0.05
+
+    def __init__(self,
+                 name: str,
+                 rate_per_second: float,
+                 burst: float = None,
+                 state_file: RateLimitStateFile = None):
+        if rate_per_second is None or rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+
+        self.name = name
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst if burst is not None else rate_per_second)
+        self.acquired_count = 0
+        self.throttled_count = 0
+        self.wait_seconds = 0.0
+        self._state = {}
+        self._state_file = state_file
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait_seconds: float = None) -> bool:
+        """Wait for a token, returning False if none was available within max_wait_seconds."""
+        start = time.monotonic()
+        while True:
+            wait = self._update(self._take_token)
+            if wait <= 0:
+                waited = time.monotonic() - start
+                with self._lock:
+                    self.acquired_count += 1
+                    self.wait_seconds += waited
+                return True
+            if max_wait_seconds is not None:
+                remaining = max_wait_seconds - (time.monotonic() - start)
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def throttled(self, retry_after_seconds: Optional[float]):
+        pause_seconds = retry_after_seconds if retry_after_seconds is not None else self.DEFAULT_THROTTLE_PAUSE_SECONDS
+        with self._lock:
+            self.throttled_count += 1
+
+        def update_state(state: dict) -> float:
+            self._refill(state, time.time())
+            state["pausedUntil"] = max(state.get("pausedUntil", 0), time.time() + pause_seconds)
+            state["rate"] = max(self.rate_per_second * self.MIN_RATE_RATIO, state["rate"] / 2)
+            state["tokens"] = 0
+            return 0
+        self._update(update_state)
+
+    def succeeded(self):
+        def update_state(state: dict) -> float:
+            self._refill(state, time.time())
+            state["rate"] = min(self.rate_per_second, state["rate"] + self.rate_per_second / 20)
+            return 0
+        self._update(update_state)
+
+    @property
+    def current_rate_per_second(self) -> float:
+        return self._update(lambda state: self._refill(state, time.time()) or state["rate"])
+
+    def to_dict(self) -> dict:
+        current_rate = self.current_rate_per_second
+        with self._lock:
+            return {
+                "rate_per_second": round(current_rate, 3),
+                "acquired_count": self.acquired_count,
+                "throttled_count": self.throttled_count,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+    def _update(self, update_state) -> float:
+        if self._state_file is not None:
+            with self._lock:
+                return self._state_file.update(self.name, update_state)
+        with self._lock:
+            return update_state(self._state)
+
+    def _refill(self, state: dict, now: float):
+        # Wall clock time, so states written by other processes can be compared.
+        if "rate" not in state:
+            state.update(tokens=self.burst, rate=self.rate_per_second, updatedAt=now, pausedUntil=0)
+        elapsed = max(0, now - state["updatedAt"])
+        state["tokens"] = min(self.burst, state["tokens"] + elapsed * state["rate"])
+        state["updatedAt"] = now
+
+    def _take_token(self, state: dict) -> float:
+        now = time.time()
+        self._refill(state, now)
+        if state["pausedUntil"] > now:
+            return state["pausedUntil"] - now
+        if state["tokens"] >= 1:
+            state["tokens"] -= 1
+            return 0
+        return (1 - state["tokens"]) / state["rate"]
+
+
+class RateLimiter:
+    """
+    Client-side rate limits of creates, reads (get, list, delete) and operation polls.
+
+    Requests wait for a token of their category instead of being sent and rejected with 429, and
+    429 responses slow the category down. A category whose rate is None is not limited, which is
+    the default of reads and polls. One RateLimiter can be shared by several clients, and with
+    lock_path by several processes on the same machine.
+    """
+
+    def __init__(self,
+                 create_per_second: float = 1,
+                 read_per_second: float = None,
+                 poll_per_second: float = None,
+                 burst_seconds: float = 1,
+                 max_wait_seconds: float = None,
+                 lock_path: str = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            create_per_second: Creates per second, None for no limit
+            read_per_second: Gets, lists and deletes per second, None for no limit
+            poll_per_second: Operation polls per second, None for no limit
+            burst_seconds: Seconds of unused rate that can be spent at once
+            max_wait_seconds: Maximum wait of a request for its rate limit, None waits as long as needed
+            lock_path: Optional state file shared with other processes using the same rate limits
+        """
+        self.max_wait_seconds = max_wait_seconds
+        self._state_file = RateLimitStateFile(lock_path) if lock_path is not None else None
+        self.buckets = {
+            category: TokenBucket(
+                name=category.value,
+                rate_per_second=rate_per_second,
+                burst=rate_per_second * burst_seconds,
+                state_file=self._state_file)
+            for category, rate_per_second in [
+                (RateLimitCategory.Create, create_per_second),
+                (RateLimitCategory.Read, read_per_second),
+                (RateLimitCategory.Poll, poll_per_second),
+            ]
+            if rate_per_second is not None
+        }
+
+    def classify(self, method: str, url: str) -> RateLimitCategory:
+        if method.upper() in ["PUT", "POST"]:
+            return RateLimitCategory.Create
+        if "/operations/" in url:
+            return RateLimitCategory.Poll
+        return RateLimitCategory.Read
+
+    def acquire(self, category: RateLimitCategory):
+        bucket = self.buckets.get(category)
+        if bucket is not None and not bucket.acquire(self.max_wait_seconds):
+            raise RateLimitTimeoutError(f"No {category.value} rate limit token within {self.max_wait_seconds} seconds")
+
+    def record_response(self,
+                        category: RateLimitCategory,
+                        status: int,
+                        retry_after_seconds: Optional[float] = None):
+        bucket = self.buckets.get(category)
+        if bucket is None:
+            return
+        if status == 429:
+            bucket.throttled(retry_after_seconds)
+        elif status < 500:
+            bucket.succeeded()
+
+    def to_dict(self) -> dict:
+        return {category.value: bucket.to_dict() for category, bucket in self.buckets.items()}
+
+    def close(self):
+        if self._state_file is not None:
+            self._state_file.close()
+
+
+class RateLimitedTransport(HttpTransport):
+    """Transport admitting requests through a RateLimiter before sending them with another transport."""
+
+    def __init__(self,
+                 transport: HttpTransport,
+                 rate_limiter: RateLimiter):
+        if transport is None or rate_limiter is None:
+            raise ValueError
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                body: bytes = None):
+        category = self.rate_limiter.classify(method, url)
+        self.rate_limiter.acquire(category)
+        response = self.transport.request(method, url, headers=headers, body=body)
+        retry_after = response.headers.get(HTTP_HEADERS_RETRY_AFTER)
+        self.rate_limiter.record_response(
+            category,
+            response.status,
+            parse_retry_after(retry_after) if retry_after is not None else None)
+        return response
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,128 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Optional
+
+
+@dataclass(kw_only=True, slots=True)
+class ResourceCacheEntry:
+    resource: Any
+    etag: Optional[str] = None
+    # None for resources in a terminal state, which never change again.
+    expires_at: Optional[float] = None
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at is None or time.monotonic() < self.expires_at
+
+
+class ResourceCache:
+    """
+    Thread-safe LRU cache of decoded resources keyed by resource ID.
+
+    Resources in a terminal state are kept until evicted, resources still in flight expire after
+    in_flight_ttl_seconds. Expired entries keep their ETag so the next request can be revalidated
+    with If-None-Match instead of downloading the resource again. Resources are copied when cached
+    and when looked up, so callers may modify the resources they get without changing the cache.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 in_flight_ttl_seconds: float = 5):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached resources, least recently used ones are evicted first
+            in_flight_ttl_seconds: Time a resource not yet in a terminal state is served from the cache
+        """
+        if max_entries is None or max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if in_flight_ttl_seconds is None or in_flight_ttl_seconds < 0:
+            raise ValueError("in_flight_ttl_seconds must not be negative")
+
+        self.max_entries = max_entries
+        self.in_flight_ttl_seconds = in_flight_ttl_seconds
+        self.hit_count = 0
+        self.miss_count = 0
+        self.revalidation_count = 0
+        self.eviction_count = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def lookup(self, key: str) -> tuple[bool, Optional[ResourceCacheEntry]]:
+        """
+        Look up a resource.
+
+        Returns:
+            Tuple of (hit, entry): hit is True when the entry is fresh and can be served as is,
+            otherwise entry is the stale entry to revalidate, or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.miss_count += 1
+                return False, None
+            self._entries.move_to_end(key)
+            hit = entry.fresh
+            if hit:
+                self.hit_count += 1
+            else:
+                self.miss_count += 1
+            entry = replace(entry)
+        entry.resource = copy.deepcopy(entry.resource)
+        return hit, entry
+
+    def put(self,
+            key: str,
+            resource: Any,
+            terminal: bool,
+            etag: str = None):
+        """Cache a resource, forever when it is in a terminal state."""
+        expires_at = None if terminal else time.monotonic() + self.in_flight_ttl_seconds
+        resource = copy.deepcopy(resource)
+        with self._lock:
+            self._entries[key] = ResourceCacheEntry(resource=resource, etag=etag, expires_at=expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.eviction_count += 1
+
+    def revalidated(self,
+                    key: str,
+                    terminal: bool) -> bool:
+        """Extend the freshness of an entry the service confirmed unchanged, returning whether it is still cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            self.revalidation_count += 1
+            entry.expires_at = None if terminal else time.monotonic() + self.in_flight_ttl_seconds
+            return True
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "entry_count": len(self._entries),
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "revalidation_count": self.revalidation_count,
+                "eviction_count": self.eviction_count,
+            }
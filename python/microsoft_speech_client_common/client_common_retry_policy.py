@@ -0,0 +1,351 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import random
+import threading
+import time
+import urllib3
+from dataclasses import dataclass, field
+from typing import Optional
+from microsoft_speech_client_common.client_common_const import (
+    HTTP_HEADERS_RETRY_AFTER,
+    RETRY_STATUSES
+)
+from microsoft_speech_client_common.client_common_enum import (
+    CircuitState, ClientEventType
+)
+from microsoft_speech_client_common.client_common_events import (
+    ClientEvent,
+    ClientEventHooks
+)
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport
+)
+from microsoft_speech_client_common.client_common_util import (
+    parse_retry_after
+)
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "DELETE")
+
+
+class CircuitOpenError(urllib3.exceptions.HTTPError):
+    """Raised instead of sending a request to a host whose circuit breaker is open."""
+
+
+class RetryStatistics:
+    """Thread-safe counters of requests, retries and requests the retry policy gave up on."""
+
+    def __init__(self):
+        self.request_count = 0
+        self.retry_count = 0
+        self.exhausted_count = 0
+        self.budget_rejection_count = 0
+        self.circuit_rejection_count = 0
+        self.circuit_open_count = 0
+        self._lock = threading.Lock()
+
+    def increment(self, counter_name: str):
+        with self._lock:
+            setattr(self, counter_name, getattr(self, counter_name) + 1)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "request_count": self.request_count,
+                "retry_count": self.retry_count,
+                "exhausted_count": self.exhausted_count,
+                "budget_rejection_count": self.budget_rejection_count,
+                "circuit_rejection_count": self.circuit_rejection_count,
+                "circuit_open_count": self.circuit_open_count,
+            }
+
+
+class RetryBudget:
+    """
+    Token bucket bounding retries to a share of the requests sent.
+
+    Every request deposits ratio tokens and every retry withdraws one, with min_retries_per_second
+    tokens refilled over time so rare failures are always retried. During an outage the retries
+    sent by all clients sharing the budget stay at about ratio of the requests instead of
+    multiplying the load.
+    """
+
+    def __init__(self,
+                 ratio: float = 0.2,
+                 min_retries_per_second: float = 5,
+                 max_tokens: float = 100):
+        if ratio < 0 or min_retries_per_second < 0 or max_tokens < 1:
+            raise ValueError("Retry budget settings must not be negative and max_tokens at least 1")
+
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._last_refill_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire_retry(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_tokens, self._tokens + (now - self._last_refill_time) * self.min_retries_per_second)
+            self._last_refill_time = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return self._tokens
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one host.
+
+    failure_threshold consecutive failures (connection errors and 5xx responses) open the circuit,
+    requests then fail fast with CircuitOpenError for open_seconds. After that a single probe
+    request is let through: its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 open_seconds: float = 30):
+        if failure_threshold is None or failure_threshold <= 0:
+            raise ValueError("failure_threshold must be positive")
+
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CircuitState.Closed
+        self._failure_count = 0
+        self._open_until = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CircuitState.Closed:
+                return True
+            if self.state == CircuitState.Open:
+                if time.monotonic() < self._open_until:
+                    return False
+                self.state = CircuitState.HalfOpen
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = CircuitState.Closed
+            self._failure_count = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Let another request probe the circuit, after a probe that ended without an outcome."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Record a failed request, returning True when it opened the circuit."""
+        with self._lock:
+            self._failure_count += 1
+            if self.state == CircuitState.HalfOpen or \
+                    (self.state == CircuitState.Closed and self._failure_count >= self.failure_threshold):
+                self.state = CircuitState.Open
+                self._open_until = time.monotonic() + self.open_seconds
+                self._probe_in_flight = False
+                return True
+            return False
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers by host, so one failing region does not fail fast the others."""
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 open_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._circuit_breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            circuit_breaker = self._circuit_breakers.get(host)
+            if circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(failure_threshold=self.failure_threshold, open_seconds=self.open_seconds)
+                self._circuit_breakers[host] = circuit_breaker
+            return circuit_breaker
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {host: circuit_breaker.state.value for host, circuit_breaker in self._circuit_breakers.items()}
+
+
+# Shared by every client of the process unless a policy is given its own.
+default_retry_budget = RetryBudget()
+default_circuit_breakers = CircuitBreakerRegistry()
+
+
+@dataclass(kw_only=True)
+class RetryPolicy:
+    """
+    Which requests are retried and how long to wait in between.
+
+    Safe requests (GET, HEAD, OPTIONS, DELETE) are tried up to max_attempts times. Creates (PUT)
+    are only retried when the client marks them retryable, because their generation ID and
+    Operation-Id are deterministic and let the service recognize the repeated request, up to
+    max_create_attempts times; other requests are sent once. Connection
+    errors and RETRY_STATUSES responses are retried after an exponential backoff with full jitter,
+    or after Retry-After when it is longer. Retries draw from the retry budget, and requests to a
+    host whose circuit breaker is open fail fast.
+    """
+    max_attempts: int = 4
+    max_create_attempts: int = 3
+    backoff_initial_seconds: float = 0.5
+    backoff_max_seconds: float = 30
+    honor_retry_after: bool = True
+    retry_statuses: tuple = RETRY_STATUSES
+    budget: RetryBudget = None
+    circuit_breakers: CircuitBreakerRegistry = None
+    statistics: RetryStatistics = field(default_factory=RetryStatistics)
+
+    def __post_init__(self):
+        if self.max_attempts <= 0 or self.max_create_attempts <= 0:
+            raise ValueError("Attempt counts must be positive")
+        if self.backoff_initial_seconds < 0 or self.backoff_max_seconds < 0:
+            raise ValueError("Backoff must not be negative")
+        if self.budget is None:
+            self.budget = default_retry_budget
+        if self.circuit_breakers is None:
+            self.circuit_breakers = default_circuit_breakers
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """Policy sending every request once, with its own budget and circuit breakers."""
+        return cls(
+            max_attempts=1,
+            max_create_attempts=1,
+            circuit_breakers=CircuitBreakerRegistry(failure_threshold=2 ** 31))
+
+    def max_attempts_for(self, method: str, retryable: bool = False) -> int:
+        method = method.upper()
+        if method in SAFE_METHODS:
+            return self.max_attempts
+        if method == "PUT" and retryable:
+            return self.max_create_attempts
+        return 1
+
+    def backoff_seconds(self, retry_number: int, retry_after_seconds: Optional[float] = None) -> float:
+        ceiling = min(self.backoff_max_seconds, self.backoff_initial_seconds * 2 ** (retry_number - 1))
+        backoff = random.uniform(0, ceiling)
+        if self.honor_retry_after and retry_after_seconds is not None:
+            backoff = max(backoff, min(retry_after_seconds, self.backoff_max_seconds))
+        return backoff
+
+    def to_dict(self) -> dict:
+        return {
+            **self.statistics.to_dict(),
+            "budget_tokens": round(self.budget.tokens, 2),
+            "circuit_states": self.circuit_breakers.to_dict(),
+        }
+
+
+class RetryingTransport(HttpTransport):
+    """Transport sending requests through another transport under a RetryPolicy."""
+
+    def __init__(self,
+                 transport: HttpTransport,
+                 policy: RetryPolicy,
+                 hooks: ClientEventHooks = None):
+        if transport is None or policy is None:
+            raise ValueError
+        self.transport = transport
+        self.policy = policy
+        self.hooks = hooks
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                body: bytes = None,
+                retryable: bool = False):
+        """Send a request, retryable marks a create that is safe to send again with the same headers and body."""
+        policy = self.policy
+        statistics = policy.statistics
+        host = urllib3.util.parse_url(url).host
+        circuit_breaker = policy.circuit_breakers.get(host)
+        max_attempts = policy.max_attempts_for(method, retryable)
+        policy.budget.record_request()
+        statistics.increment("request_count")
+
+        attempt = 0
+        while True:
+            if not circuit_breaker.allow_request():
+                statistics.increment("circuit_rejection_count")
+                if attempt == 0:
+                    raise CircuitOpenError(f"Circuit breaker of {host} is open, not sending {method} {url}")
+                # The circuit opened while retrying, return the last failure.
+                break
+
+            response, error = None, None
+            try:
+                response = self.transport.request(method, url, headers=headers, body=body)
+            except urllib3.exceptions.HTTPError as exception:
+                error = exception
+            finally:
+                if response is None and error is None:
+                    # Raised something else, the request is neither a success nor a failure of the host.
+                    circuit_breaker.release_probe()
+
+            if error is not None or response.status >= 500:
+                if circuit_breaker.record_failure():
+                    statistics.increment("circuit_open_count")
+            else:
+                circuit_breaker.record_success()
+
+            if error is None and response.status not in policy.retry_statuses:
+                return response
+
+            attempt += 1
+            if attempt >= max_attempts:
+                if max_attempts > 1:
+                    statistics.increment("exhausted_count")
+                break
+            if not policy.budget.try_acquire_retry():
+                statistics.increment("budget_rejection_count")
+                break
+
+            retry_after_seconds = None
+            if response is not None:
+                retry_after = response.headers.get(HTTP_HEADERS_RETRY_AFTER)
+                retry_after_seconds = parse_retry_after(retry_after) if retry_after is not None else None
+            statistics.increment("retry_count")
+            backoff_seconds = policy.backoff_seconds(attempt, retry_after_seconds)
+            if self.hooks is not None and self.hooks.enabled:
+                self.hooks.emit(ClientEvent(
+                    type=ClientEventType.Retry,
+                    method=method,
+                    url=url,
+                    endpoint=self.hooks.build_endpoint(method, url),
+                    operation_id=self.hooks.build_operation_id(url, headers),
+                    status=response.status if response is not None else None,
+                    error=str(error) if error is not None else None,
+                    attempt=attempt,
+                    duration_seconds=backoff_seconds))
+            time.sleep(backoff_seconds)
+
+        if error is not None:
+            raise error
+        return response
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,115 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import urllib3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(kw_only=True, slots=True)
+class HttpTransportResponse:
+    status: int
+    reason: str
+    # Case-insensitive mapping of the response headers.
+    headers: Any
+    data: bytes
+
+
+class HttpTransport(ABC):
+    """
+    Sends the API requests of a client.
+
+    Responses expose status, reason, headers with case-insensitive get, and the body as data.
+    Connection failures raise urllib3.exceptions.HTTPError whatever the transport.
+    """
+
+    @abstractmethod
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                body: bytes = None):
+        pass
+
+    def close(self):
+        pass
+
+
+class Urllib3Transport(HttpTransport):
+    """HTTP/1.1 transport over a urllib3 pool manager, the default transport, sending each request once."""
+
+    def __init__(self, http: urllib3.PoolManager):
+        if http is None:
+            raise ValueError
+        self.http = http
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                body: bytes = None) -> urllib3.HTTPResponse:
+        # Retries are left to RetryingTransport, not to the retries of the pool manager.
+        return self.http.request(method, url, headers=headers, body=body, retries=False)
+
+    def close(self):
+        self.http.clear()
+
+
+class Http2Transport(HttpTransport):
+    """
+    HTTP/2 transport multiplexing concurrent requests over a few connections, based on httpx.
+
+    Thousands of operation polls in flight share max_connections connections instead of needing
+    one connection each. Requires the optional dependency httpx with HTTP/2 support:
+        pip3 install httpx[http2]
+    """
+
+    def __init__(self,
+                 max_connections: int = 4,
+                 connect_timeout_seconds: float = 10,
+                 read_timeout_seconds: float = 10,
+                 prior_knowledge: bool = False):
+        """
+        Initialize the transport.
+
+        Args:
+            max_connections: Maximum number of connections per host
+            connect_timeout_seconds: Timeout of establishing a connection
+            read_timeout_seconds: Timeout of reading a response
+            prior_knowledge: Speak HTTP/2 without negotiation, needed for cleartext http:// servers
+        """
+        try:
+            import httpx
+        except ImportError as exception:
+            raise ImportError("Http2Transport requires httpx with HTTP/2 support: pip3 install httpx[http2]") from exception
+
+        if max_connections is None or max_connections <= 0:
+            raise ValueError("max_connections must be positive")
+
+        self._httpx = httpx
+        self._client = httpx.Client(
+            timeout=httpx.Timeout(read_timeout_seconds, connect=connect_timeout_seconds),
+            transport=httpx.HTTPTransport(
+                http1=not prior_knowledge,
+                http2=True,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)))
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                body: bytes = None) -> HttpTransportResponse:
+        try:
+            response = self._client.request(method, url, headers=headers, content=body)
+        except self._httpx.TransportError as exception:
+            raise urllib3.exceptions.ProtocolError(str(exception)) from exception
+
+        return HttpTransportResponse(
+            status=response.status_code,
+            reason=response.reason_phrase,
+            headers=response.headers,
+            data=response.content)
+
+    def close(self):
+        self._client.close()
@@ -1,30 +1,32 @@
 # Copyright (c) Microsoft. All rights reserved.
 # Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
 
-from dataclasses import fields, is_dataclass
-from typing import Any, Type
+import orjson
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional, Type
 from urllib3.util import Url
 from urllib.parse import urlencode
 import urllib3
+from microsoft_speech_client_common.client_common_decoder import (
+    decode_dataclass
+)
 
 
 def dict_to_dataclass(data: dict, dataclass_type: Type[Any]) -> Any:
-    if not is_dataclass(dataclass_type):
-        raise ValueError(f"{dataclass_type} is not a dataclass")
+    return decode_dataclass(data, dataclass_type)
 
-    # Retrieve the dataclass fields
-    field_names = {field.name: field.type for field in fields(dataclass_type)}
-    filtered_data = {}
 
-    for key, value in data.items():
-        if key in field_names:
-            field_type = field_names[key]
-            if is_dataclass(field_type):  # Check for nested dataclass
-                filtered_data[key] = dict_to_dataclass(value, field_type)
-            else:
-                filtered_data[key] = value
+def dataclass_to_json_string(data: Any) -> str:
+    """Serialize a dataclass instance into indented JSON for display."""
+    return orjson.dumps(data, default=json_default, option=orjson.OPT_INDENT_2).decode('utf-8')
 
-    return dataclass_type(**filtered_data)
+
+def json_default(value: Any) -> Any:
+    """orjson default serializing Url values as their URL string."""
+    if isinstance(value, Url):
+        return value.url
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
 
 
 def append_url_args(url: Url, args: dict) -> Url:
@@ -36,3 +38,36 @@ def append_url_args(url: Url, args: dict) -> Url:
     else:
         url_str = f"{url.url}?{encoded_args}"
     return urllib3.util.parse_url(url_str)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parse a Retry-After header value, either delay seconds or an HTTP date, into seconds."""
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_time = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_time.tzinfo is None:
+        retry_time = retry_time.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_time - datetime.now(timezone.utc)).total_seconds())
+
+
+class ResponseError(str):
+    """Error message of a failed response, a str that also carries the HTTP status of the response."""
+
+    status: int = None
+
+    def __new__(cls, message: str, status: int = None):
+        error = super().__new__(cls, message)
+        error.status = status
+        return error
+
+
+def is_transient_error(error: str) -> bool:
+    """Whether a request failed on a connection error, a timeout, throttling or a 5xx, rather than on its content."""
+    status = getattr(error, "status", None)
+    return status is None or status in [408, 429] or status >= 500
@@ -0,0 +1,79 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import os
+import sys
+import time
+
+import pytest
+
+# The packages and the benchmark fake are imported from the python folder, like main_podcast.py does.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark.fake_podcast_service import FakePodcastService, FakePodcastServiceConfig  # noqa: E402
+from microsoft_speech_client_common.client_common_polling_policy import OperationPollingPolicy  # noqa: E402
+from microsoft_speech_client_common.client_common_retry_policy import (  # noqa: E402
+    CircuitBreakerRegistry, RetryBudget, RetryPolicy
+)
+from microsoft_client_podcast.podcast_client import PodcastClient  # noqa: E402
+from microsoft_client_podcast.podcast_dataclass import PodcastGenerationBatchItem  # noqa: E402
+from microsoft_client_podcast.podcast_enum import GenerationIdMode  # noqa: E402
+
+
+@pytest.fixture
+def fake_service_config(request) -> FakePodcastServiceConfig:
+    """Config of the fake service, overridden by indirect parametrization with a dict of fields."""
+    return FakePodcastServiceConfig(**{"generation_seconds": 0.2, **getattr(request, "param", {})})
+
+
+@pytest.fixture
+def fake_service(fake_service_config):
+    service = FakePodcastService(fake_service_config).start()
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def make_client(fake_service):
+    """Build clients of the fake service, or of another one, polling fast, with retries isolated from other tests."""
+    clients = []
+
+    def make_client(generation_id_mode: GenerationIdMode = GenerationIdMode.Timestamp,
+                    service: FakePodcastService = None,
+                    **kwargs) -> PodcastClient:
+        client = PodcastClient(
+            region=(service if service is not None else fake_service).url,
+            sub_key="key",
+            api_version="2026-01-01-preview",
+            polling_policy=OperationPollingPolicy.fixed(0.05),
+            generation_id_mode=generation_id_mode,
+            retry_policy=RetryPolicy(
+                backoff_initial_seconds=0.01,
+                budget=RetryBudget(),
+                circuit_breakers=CircuitBreakerRegistry(failure_threshold=100)),
+            **kwargs)
+        clients.append(client)
+        return client
+
+    yield make_client
+    for client in clients:
+        client.close()
+
+
+def build_items(count: int, label: str = "input") -> list[PodcastGenerationBatchItem]:
+    return [
+        PodcastGenerationBatchItem(input_file_url=f"https://storage/{label}/{index}.txt", target_locale="en-US")
+        for index in range(count)
+    ]
+
+
+def count_requests(service: FakePodcastService, endpoint: str) -> int:
+    return service.statistics()["requests"].get(endpoint, 0)
+
+
+def wait_until(condition, timeout_seconds: float = 10):
+    deadline = time.monotonic() + timeout_seconds
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.05)
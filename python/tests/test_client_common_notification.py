@@ -0,0 +1,65 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import hashlib
+import hmac
+import http.client
+
+import orjson
+import pytest
+import urllib3
+
+from microsoft_speech_client_common.client_common_enum import OperationStatus
+from microsoft_speech_client_common.client_common_notification import WebhookNotificationReceiver
+
+SECRET = "notification-secret"
+
+
+def post(receiver: WebhookNotificationReceiver, body: bytes, headers: dict = None, path: str = None) -> int:
+    url = urllib3.util.parse_url(receiver.callback_url)
+    connection = http.client.HTTPConnection(url.host, url.port, timeout=10)
+    try:
+        connection.request("POST", path or url.path, body=body, headers=headers or {})
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+def sign(body: bytes, secret: str = SECRET) -> dict:
+    return {"X-Notification-Signature": "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()}
+
+
+def test_signed_notifications_are_delivered_to_subscribers():
+    notifications = []
+    body = orjson.dumps({"operationId": "operation", "status": "Succeeded"})
+
+    with WebhookNotificationReceiver(secret=SECRET) as receiver:
+        receiver.subscribe("operation", notifications.append)
+        assert post(receiver, body, sign(body)) == 202
+
+    assert [(notification.operation_id, notification.status) for notification in notifications] == \
+        [("operation", OperationStatus.Succeeded)]
+
+
+def test_unsigned_or_wrongly_signed_notifications_are_rejected():
+    notifications = []
+    body = orjson.dumps({"operationId": "operation", "status": "Succeeded"})
+
+    with WebhookNotificationReceiver(secret=SECRET) as receiver:
+        receiver.subscribe("operation", notifications.append)
+        assert post(receiver, body) == 401
+        assert post(receiver, body, sign(body, secret="other-secret")) == 401
+        assert post(receiver, body + b" ", sign(body)) == 401
+
+    assert notifications == []
+
+
+def test_malformed_notifications_and_unknown_paths_are_rejected():
+    with WebhookNotificationReceiver(secret=SECRET) as receiver:
+        assert post(receiver, b"[]", sign(b"[]")) == 400
+        assert post(receiver, b"{}", sign(b"{}"), path="/other") == 404
+
+
+def test_secret_is_required_off_loopback():
+    with pytest.raises(ValueError):
+        WebhookNotificationReceiver(host="0.0.0.0")
@@ -0,0 +1,54 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import threading
+
+from urllib3.util import parse_url
+
+from microsoft_speech_client_common.client_common_dataclass import OperationDefinition
+from microsoft_speech_client_common.client_common_enum import OperationStatus
+from microsoft_speech_client_common.client_common_operation_poller import OperationPoller
+
+
+def test_slow_poll_does_not_hold_back_other_operations(fake_service, make_client, monkeypatch):
+    client = make_client()
+    slow_location = parse_url(f"{fake_service.url}/podcast/operations/slow")
+    fast_location = parse_url(f"{fake_service.url}/podcast/operations/fast")
+    slow_poll_started = threading.Event()
+    release_slow_poll = threading.Event()
+
+    def request_get_operation_with_retry_after(operation_location):
+        if operation_location == slow_location:
+            slow_poll_started.set()
+            release_slow_poll.wait(10)
+        return True, None, OperationDefinition(id=operation_location.path, status=OperationStatus.Succeeded), None
+    monkeypatch.setattr(client, "request_get_operation_with_retry_after", request_get_operation_with_retry_after)
+
+    with OperationPoller(client=client, max_workers=2) as poller:
+        slow_future = poller.register(slow_location)
+        assert slow_poll_started.wait(5)
+        fast_future = poller.register(fast_location)
+
+        fast_success, _, fast_operation = fast_future.result(timeout=5)
+        assert fast_success and fast_operation.status == OperationStatus.Succeeded
+        assert not slow_future.done()
+
+        release_slow_poll.set()
+        assert slow_future.result(timeout=5)[0]
+
+
+def test_close_resolves_watched_operations_as_failed(fake_service, make_client, monkeypatch):
+    client = make_client()
+
+    def request_get_operation_with_retry_after(operation_location):
+        return True, None, OperationDefinition(id=operation_location.path, status=OperationStatus.Running), None
+    monkeypatch.setattr(client, "request_get_operation_with_retry_after", request_get_operation_with_retry_after)
+
+    poller = OperationPoller(client=client)
+    future = poller.register(parse_url(f"{fake_service.url}/podcast/operations/running"))
+    poller.close()
+
+    success, error, operation = future.result(timeout=5)
+    assert not success
+    assert "Poller closed" in error
+    assert operation is None
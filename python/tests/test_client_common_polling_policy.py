@@ -0,0 +1,55 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import pytest
+
+from microsoft_speech_client_common.client_common_polling_policy import (
+    OperationPollingPolicy, OperationPollingStatistics
+)
+
+
+def simulate_polls(policy: OperationPollingPolicy, operation_seconds: float) -> tuple[int, float]:
+    """Polls sent and time elapsed until a poll sees an operation running operation_seconds terminated."""
+    tracker = policy.start()
+    elapsed_seconds = 0
+    poll_count = 1
+    while elapsed_seconds < operation_seconds:
+        elapsed_seconds += tracker.next_delay()
+        poll_count += 1
+    return poll_count, elapsed_seconds
+
+
+@pytest.mark.parametrize("operation_seconds", [120, 600])
+def test_default_policy_saves_polls_on_long_operations(operation_seconds):
+    statistics = OperationPollingStatistics()
+    poll_count, elapsed_seconds = simulate_polls(OperationPollingPolicy(jitter_ratio=0), operation_seconds)
+
+    statistics.record(poll_count=poll_count, elapsed_seconds=elapsed_seconds)
+
+    assert statistics.polls_saved > 0
+    assert statistics.to_dict()["polls_saved"] == statistics.baseline_poll_count - poll_count
+
+
+def test_fixed_baseline_interval_saves_nothing():
+    statistics = OperationPollingStatistics()
+    poll_count, elapsed_seconds = simulate_polls(
+        OperationPollingPolicy.fixed(statistics.baseline_interval_seconds), 120)
+
+    statistics.record(poll_count=poll_count, elapsed_seconds=elapsed_seconds)
+
+    assert statistics.polls_saved == 0
+
+
+def test_backoff_grows_to_max_interval_and_honors_retry_after():
+    policy = OperationPollingPolicy(initial_interval_seconds=1, backoff_multiplier=2, max_interval_seconds=4, jitter_ratio=0)
+    tracker = policy.start()
+
+    assert [tracker.next_delay() for _ in range(4)] == [1, 2, 4, 4]
+    assert tracker.next_delay(retry_after_seconds=7) == 7
+
+
+def test_deadline_bounds_the_delay():
+    tracker = OperationPollingPolicy(initial_interval_seconds=5, jitter_ratio=0, deadline_seconds=0).start()
+
+    assert tracker.next_delay() == 0
+    assert tracker.expired
@@ -0,0 +1,99 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import pytest
+
+from microsoft_speech_client_common.client_common_enum import CircuitState, RateLimitCategory
+from microsoft_speech_client_common.client_common_rate_limiter import (
+    RateLimitedTransport, RateLimiter, RateLimitTimeoutError
+)
+from microsoft_speech_client_common.client_common_retry_policy import (
+    CircuitBreakerRegistry, RetryBudget, RetryingTransport, RetryPolicy
+)
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport, HttpTransportResponse
+)
+
+
+class StubTransport(HttpTransport):
+    def __init__(self):
+        self.request_count = 0
+
+    def request(self, method, url, headers=None, body=None):
+        self.request_count += 1
+        return HttpTransportResponse(status=200, reason="OK", headers={}, data=b"")
+
+
+def test_rate_limit_timeout_does_not_open_the_circuit_breaker():
+    stub = StubTransport()
+    rate_limiter = RateLimiter(read_per_second=0.01, max_wait_seconds=0)
+    policy = RetryPolicy(
+        backoff_initial_seconds=0,
+        budget=RetryBudget(),
+        circuit_breakers=CircuitBreakerRegistry(failure_threshold=1))
+    transport = RetryingTransport(RateLimitedTransport(stub, rate_limiter), policy)
+    url = "https://eastus.api.cognitive.microsoft.com/podcast/generations/1"
+
+    transport.request("GET", url)
+    for _ in range(3):
+        with pytest.raises(RateLimitTimeoutError):
+            transport.request("GET", url)
+
+    assert stub.request_count == 1
+    assert policy.circuit_breakers.get("eastus.api.cognitive.microsoft.com").state == CircuitState.Closed
+    assert policy.statistics.retry_count == 0
+    # The timed out requests released their slot, the next request is still let through.
+    assert policy.circuit_breakers.get("eastus.api.cognitive.microsoft.com").allow_request()
+
+
+def test_bucket_admits_its_burst_then_times_out():
+    rate_limiter = RateLimiter(create_per_second=2, burst_seconds=1, max_wait_seconds=0)
+
+    rate_limiter.acquire(RateLimitCategory.Create)
+    rate_limiter.acquire(RateLimitCategory.Create)
+    with pytest.raises(RateLimitTimeoutError):
+        rate_limiter.acquire(RateLimitCategory.Create)
+
+    assert rate_limiter.to_dict()["Create"]["acquired_count"] == 2
+
+
+def test_reads_and_polls_are_not_limited_by_default():
+    rate_limiter = RateLimiter(max_wait_seconds=0)
+
+    for _ in range(100):
+        rate_limiter.acquire(RateLimitCategory.Read)
+        rate_limiter.acquire(RateLimitCategory.Poll)
+
+    assert set(rate_limiter.to_dict()) == {"Create"}
+    assert rate_limiter.classify("PUT", "https://host/podcast/generations/1") == RateLimitCategory.Create
+    assert rate_limiter.classify("GET", "https://host/podcast/operations/1") == RateLimitCategory.Poll
+    assert rate_limiter.classify("DELETE", "https://host/podcast/generations/1") == RateLimitCategory.Read
+
+
+def test_throttled_response_pauses_and_slows_down_the_category():
+    rate_limiter = RateLimiter(create_per_second=10, max_wait_seconds=0)
+
+    rate_limiter.record_response(RateLimitCategory.Create, 429, retry_after_seconds=60)
+
+    with pytest.raises(RateLimitTimeoutError):
+        rate_limiter.acquire(RateLimitCategory.Create)
+    statistics = rate_limiter.to_dict()["Create"]
+    assert statistics["throttled_count"] == 1
+    assert statistics["rate_per_second"] == pytest.approx(5, abs=0.1)
+
+
+def test_rate_limiters_with_the_same_lock_path_share_their_tokens(tmp_path):
+    lock_path = str(tmp_path / "rate_limits")
+    first = RateLimiter(create_per_second=2, burst_seconds=1, max_wait_seconds=0, lock_path=lock_path)
+    second = RateLimiter(create_per_second=2, burst_seconds=1, max_wait_seconds=0, lock_path=lock_path)
+    try:
+        first.acquire(RateLimitCategory.Create)
+        first.acquire(RateLimitCategory.Create)
+        with pytest.raises(RateLimitTimeoutError):
+            second.acquire(RateLimitCategory.Create)
+
+        second.record_response(RateLimitCategory.Create, 429, retry_after_seconds=60)
+        assert first.buckets[RateLimitCategory.Create].current_rate_per_second == pytest.approx(1, abs=0.1)
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,82 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import orjson
+
+from microsoft_speech_client_common.client_common_enum import OneApiState
+from microsoft_speech_client_common.client_common_resource_cache import ResourceCache
+from microsoft_speech_client_common.client_common_retry_policy import RetryPolicy
+from microsoft_speech_client_common.client_common_transport import HttpTransport, HttpTransportResponse
+from microsoft_client_podcast.podcast_client import PodcastClient
+
+
+class GenerationTransport(HttpTransport):
+    """Serves one generation with an ETag, answering 304 to a matching If-None-Match."""
+
+    ETAG = '"1"'
+
+    def __init__(self, status: str):
+        self.status = status
+        self.requests = []
+
+    def request(self, method, url, headers=None, body=None):
+        if_none_match = (headers or {}).get("If-None-Match")
+        self.requests.append(if_none_match)
+        if if_none_match == self.ETAG:
+            return HttpTransportResponse(status=304, reason="Not Modified", headers={"ETag": self.ETAG}, data=b"")
+        data = orjson.dumps({"id": "generation", "status": self.status})
+        return HttpTransportResponse(status=200, reason="OK", headers={"ETag": self.ETAG}, data=data)
+
+
+def build_client(transport: HttpTransport, cache: ResourceCache) -> PodcastClient:
+    return PodcastClient(
+        region="http://127.0.0.1:1",
+        sub_key="key",
+        api_version="2026-01-01-preview",
+        generation_cache=cache,
+        transport=transport,
+        retry_policy=RetryPolicy.disabled())
+
+
+def test_stale_generation_is_revalidated_with_its_etag():
+    transport = GenerationTransport(OneApiState.Running)
+    cache = ResourceCache(in_flight_ttl_seconds=0)
+    client = build_client(transport, cache)
+    try:
+        first = client.request_get_generation("generation")
+        second = client.request_get_generation("generation")
+    finally:
+        client.close()
+
+    assert first[0] and second[0]
+    assert second[2].status == OneApiState.Running
+    assert transport.requests == [None, GenerationTransport.ETAG]
+    assert cache.to_dict()["revalidation_count"] == 1
+
+
+def test_terminated_generation_is_served_from_the_cache():
+    transport = GenerationTransport(OneApiState.Succeeded)
+    cache = ResourceCache()
+    client = build_client(transport, cache)
+    try:
+        client.request_get_generation("generation")
+        success, _, generation = client.request_get_generation("generation")
+    finally:
+        client.close()
+
+    assert success and generation.status == OneApiState.Succeeded
+    assert len(transport.requests) == 1
+    assert cache.hit_count == 1
+
+
+def test_cache_evicts_least_recently_used_entries_and_copies_resources():
+    cache = ResourceCache(max_entries=2)
+    cache.put("a", {"value": 1}, terminal=True)
+    cache.put("b", {"value": 2}, terminal=True)
+    cache.lookup("a")[1].resource["value"] = 10
+    cache.put("c", {"value": 3}, terminal=True)
+
+    assert cache.lookup("b") == (False, None)
+    hit, entry = cache.lookup("a")
+    assert hit and entry.resource == {"value": 1}
+    assert cache.eviction_count == 1
@@ -0,0 +1,143 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import time
+
+import pytest
+import urllib3
+
+from microsoft_speech_client_common.client_common_enum import CircuitState
+from microsoft_speech_client_common.client_common_retry_policy import (
+    CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, RetryBudget, RetryingTransport, RetryPolicy
+)
+from microsoft_speech_client_common.client_common_transport import (
+    HttpTransport, HttpTransportResponse
+)
+
+URL = "https://eastus.api.cognitive.microsoft.com/podcast/generations/1"
+HOST = "eastus.api.cognitive.microsoft.com"
+
+
+class ScriptedTransport(HttpTransport):
+    """Answers requests with the given statuses in order, raising the exceptions among them."""
+
+    def __init__(self, outcomes: list):
+        self.outcomes = list(outcomes)
+        self.methods = []
+
+    def request(self, method, url, headers=None, body=None):
+        self.methods.append(method)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return HttpTransportResponse(status=outcome, reason=str(outcome), headers={}, data=b"")
+
+
+def build_policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(**{
+        "backoff_initial_seconds": 0,
+        "budget": RetryBudget(),
+        "circuit_breakers": CircuitBreakerRegistry(failure_threshold=100),
+        **kwargs})
+
+
+def test_safe_requests_are_retried_until_they_succeed():
+    transport = ScriptedTransport([503, urllib3.exceptions.ProtocolError("reset"), 200])
+    policy = build_policy()
+
+    response = RetryingTransport(transport, policy).request("GET", URL)
+
+    assert response.status == 200
+    assert len(transport.methods) == 3
+    assert policy.statistics.retry_count == 2
+
+
+def test_creates_are_only_retried_when_retryable():
+    policy = build_policy(max_create_attempts=3)
+
+    sent_once = ScriptedTransport([503])
+    assert RetryingTransport(sent_once, policy).request("PUT", URL).status == 503
+    retried = ScriptedTransport([503])
+    assert RetryingTransport(retried, policy).request("PUT", URL, retryable=True).status == 503
+
+    assert len(sent_once.methods) == 1
+    assert len(retried.methods) == 3
+    assert policy.statistics.exhausted_count == 1
+
+
+def test_client_errors_are_not_retried():
+    transport = ScriptedTransport([400])
+
+    assert RetryingTransport(transport, build_policy()).request("GET", URL).status == 400
+    assert len(transport.methods) == 1
+
+
+def test_retry_budget_bounds_retries():
+    budget = RetryBudget(ratio=0, min_retries_per_second=0, max_tokens=2)
+    transport = ScriptedTransport([503])
+    policy = build_policy(budget=budget, max_attempts=10)
+
+    RetryingTransport(transport, policy).request("GET", URL)
+
+    assert len(transport.methods) == 3
+    assert policy.statistics.budget_rejection_count == 1
+    assert budget.tokens < 1
+
+
+def test_retry_budget_refills_with_requests():
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0, max_tokens=10)
+    while budget.try_acquire_retry():
+        pass
+
+    budget.record_request()
+    assert not budget.try_acquire_retry()
+    budget.record_request()
+    assert budget.try_acquire_retry()
+
+
+def test_circuit_breaker_opens_after_consecutive_failures_and_fails_fast():
+    transport = ScriptedTransport([503])
+    policy = build_policy(max_attempts=1, circuit_breakers=CircuitBreakerRegistry(failure_threshold=3))
+    retrying_transport = RetryingTransport(transport, policy)
+
+    for _ in range(3):
+        assert retrying_transport.request("GET", URL).status == 503
+    with pytest.raises(CircuitOpenError):
+        retrying_transport.request("GET", URL)
+
+    assert len(transport.methods) == 3
+    assert policy.circuit_breakers.get(HOST).state == CircuitState.Open
+    assert policy.circuit_breakers.get("westus.api.cognitive.microsoft.com").state == CircuitState.Closed
+    assert policy.statistics.circuit_open_count == 1
+
+
+def test_circuit_breaker_lets_one_probe_through_after_open_seconds():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, open_seconds=0.05)
+    assert circuit_breaker.record_failure()
+    assert not circuit_breaker.allow_request()
+
+    time.sleep(0.06)
+    assert circuit_breaker.allow_request()
+    assert circuit_breaker.state == CircuitState.HalfOpen
+    assert not circuit_breaker.allow_request()
+
+    # A probe failing opens the circuit again, a succeeding one closes it.
+    assert circuit_breaker.record_failure()
+    time.sleep(0.06)
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CircuitState.Closed
+
+
+def test_probe_without_outcome_releases_the_half_open_circuit():
+    transport = ScriptedTransport([ValueError("not a failure of the host"), 200])
+    policy = build_policy(circuit_breakers=CircuitBreakerRegistry(failure_threshold=1, open_seconds=0))
+    circuit_breaker = policy.circuit_breakers.get(HOST)
+    circuit_breaker.record_failure()
+    retrying_transport = RetryingTransport(transport, policy)
+
+    with pytest.raises(ValueError):
+        retrying_transport.request("GET", URL)
+
+    assert retrying_transport.request("GET", URL).status == 200
+    assert circuit_breaker.state == CircuitState.Closed
@@ -0,0 +1,119 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import orjson
+import pytest
+import urllib3
+
+from microsoft_client_podcast.podcast_audio_downloader import PodcastAudioDownloader
+
+AUDIO = bytes(range(256)) * 40
+
+
+class RangeServer:
+    """Serves AUDIO with Accept-Ranges, recording the Range headers and failing the GETs listed in fail_ranges."""
+
+    def __init__(self):
+        self.ranges = []
+        self.fail_ranges = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(AUDIO)))
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("ETag", '"audio"')
+                self.end_headers()
+
+            def do_GET(self):
+                range_header = self.headers.get("Range")
+                server.ranges.append(range_header)
+                if range_header in server.fail_ranges:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                match = re.match(r"bytes=(\d+)-(\d*)", range_header or "")
+                start = int(match.group(1)) if match else 0
+                end = int(match.group(2)) + 1 if match and match.group(2) else len(AUDIO)
+                self.send_response(206 if match else 200)
+                self.send_header("Content-Length", str(end - start))
+                self.end_headers()
+                self.wfile.write(AUDIO[start:end])
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/audio/generation.wav"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def range_server():
+    server = RangeServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def http():
+    pool = urllib3.PoolManager(retries=False)
+    yield pool
+    pool.clear()
+
+
+def test_sequential_download_resumes_from_the_part_file(range_server, http, tmp_path):
+    file_path = str(tmp_path / "generation.wav")
+    with open(file_path + PodcastAudioDownloader.PART_FILE_SUFFIX, "wb") as part_file:
+        part_file.write(AUDIO[:1000])
+
+    with PodcastAudioDownloader(http, str(tmp_path), max_segments_per_file=1) as downloader:
+        success, error, path = downloader.download(range_server.url, file_path)
+
+    assert success, error
+    assert range_server.ranges == ["bytes=1000-"]
+    with open(path, "rb") as file:
+        assert file.read() == AUDIO
+
+
+def test_segmented_download_only_fetches_missing_segments_after_a_failure(range_server, http, tmp_path):
+    file_path = str(tmp_path / "generation.wav")
+    segment_size = 2048
+    range_server.fail_ranges.add("bytes=2048-4095")
+
+    with PodcastAudioDownloader(http, str(tmp_path), segment_size=segment_size) as downloader:
+        success, _, _ = downloader.download(range_server.url, file_path)
+        assert not success
+        with open(file_path + PodcastAudioDownloader.STATE_FILE_SUFFIX, "rb") as state_file:
+            assert orjson.loads(state_file.read())["doneSegments"] == [0, 2, 3, 4]
+
+        range_server.fail_ranges.clear()
+        range_server.ranges.clear()
+        success, error, path = downloader.download(range_server.url, file_path)
+
+    assert success, error
+    assert range_server.ranges == ["bytes=2048-4095"]
+    with open(path, "rb") as file:
+        assert file.read() == AUDIO
+
+
+def test_complete_file_is_not_downloaded_again(range_server, http, tmp_path):
+    file_path = str(tmp_path / "generation.wav")
+    with open(file_path, "wb") as file:
+        file.write(AUDIO)
+
+    with PodcastAudioDownloader(http, str(tmp_path)) as downloader:
+        assert downloader.download(range_server.url, file_path)[0]
+
+    assert range_server.ranges == []
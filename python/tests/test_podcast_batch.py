@@ -0,0 +1,56 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import pytest
+
+from conftest import build_items, count_requests
+from microsoft_speech_client_common.client_common_enum import OperationStatus
+from microsoft_speech_client_common.client_common_operation_poller import OperationPoller
+from microsoft_client_podcast.podcast_enum import GenerationIdMode
+
+
+def test_batch_creates_every_item_once(fake_service, make_client):
+    client = make_client()
+    items = build_items(6)
+
+    results = list(client.create_generations_in_batch(items, max_concurrency=2))
+
+    assert len(results) == len(items)
+    assert all(result.success for result in results)
+    assert {result.item.input_file_url for result in results} == {item.input_file_url for item in items}
+    assert len({result.generation_id for result in results}) == len(items)
+    assert count_requests(fake_service, "PUT generation") == len(items)
+
+
+@pytest.mark.parametrize("fake_service_config", [{"failure_ratio": 1}], indirect=True)
+def test_batch_reports_failed_generations(make_client):
+    client = make_client()
+
+    results = list(client.create_generations_in_batch(build_items(3), max_concurrency=3))
+
+    assert [result.success for result in results] == [False] * 3
+    assert all(result.error is not None for result in results)
+
+
+def test_operation_poller_resolves_registered_operations(make_client):
+    # Content generation IDs, timestamp ones only differ by the suffix the batch adds.
+    client = make_client(GenerationIdMode.Content)
+    operation_locations = []
+    for item in build_items(4):
+        success, error, _, operation_location = client.submit_generation(
+            input_file_url=item.input_file_url,
+            target_locale=item.target_locale)
+        assert success, error
+        operation_locations.append(operation_location)
+
+    statuses = []
+    with OperationPoller(client=client) as poller:
+        futures = [
+            poller.register(operation_location, status_callback=lambda operation: statuses.append(operation.status))
+            for operation_location in operation_locations
+        ]
+        operation_results = [future.result(timeout=10) for future in futures]
+
+    assert all(success for success, _, _ in operation_results)
+    assert all(operation.status == OperationStatus.Succeeded for _, _, operation in operation_results)
+    assert statuses.count(OperationStatus.Succeeded) == len(operation_locations)
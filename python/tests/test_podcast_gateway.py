@@ -0,0 +1,116 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import http.client
+
+import orjson
+import pytest
+
+from conftest import build_items, count_requests, wait_until
+from microsoft_client_podcast.podcast_enum import GenerationIdMode
+from microsoft_client_podcast.podcast_gateway import PodcastGateway, PodcastGatewayServer
+from microsoft_client_podcast.podcast_job_ledger import PodcastJobLedger
+
+
+def test_gateway_runs_jobs_and_deduplicates_them(fake_service, make_client, tmp_path):
+    client = make_client(GenerationIdMode.Content)
+    items = build_items(4)
+    terminated = []
+
+    with PodcastJobLedger(str(tmp_path / "ledger.sqlite")) as ledger, \
+            PodcastGateway(client, ledger, max_concurrency=2) as gateway:
+        gateway.add_result_listener(terminated.append)
+        assert all(gateway.submit(item)[0] for item in items)
+        created, record = gateway.submit(items[0])
+        assert not created and record.job_key == ledger.build_job_key(items[0])
+
+        wait_until(lambda: len(terminated) == len(items))
+        records = list(ledger.iter_jobs())
+
+    assert all(record.terminated and record.output_url is not None for record in records)
+    assert count_requests(fake_service, "PUT generation") == len(items)
+
+
+def test_gateway_resumes_jobs_after_a_restart(fake_service, make_client, tmp_path):
+    client = make_client(GenerationIdMode.Content)
+    queued, interrupted = build_items(2)
+
+    with PodcastJobLedger(str(tmp_path / "ledger.sqlite")) as ledger:
+        ledger.record_queued(ledger.build_job_key(queued), queued)
+        # A create the previous gateway sent right before it died.
+        interrupted_job_key = ledger.build_job_key(interrupted)
+        ledger.record_queued(interrupted_job_key, interrupted)
+        generation_id = client.build_generation_id(
+            interrupted.target_locale,
+            request_body=client.create_generation_creation_body(interrupted.input_file_url, interrupted.target_locale))
+        operation_id = client.build_operation_id(generation_id)
+        ledger.record_submitting(interrupted_job_key, generation_id, operation_id)
+        client.request_create_generation(
+            generation_id=generation_id,
+            request_body=client.create_generation_creation_body(interrupted.input_file_url, interrupted.target_locale),
+            operation_id=operation_id)
+
+        with PodcastGateway(client, ledger):
+            wait_until(lambda: all(record.terminated for record in ledger.iter_jobs()))
+        records = {record.job_key: record for record in ledger.iter_jobs()}
+
+    assert len(records) == 2
+    assert records[interrupted_job_key].generation_id == generation_id
+    assert all(record.output_url is not None for record in records.values())
+    assert count_requests(fake_service, "PUT generation") == 2
+
+
+def test_gateway_server_api(make_client, tmp_path):
+    client = make_client(GenerationIdMode.Content)
+    body = orjson.dumps({"input_file_url": "https://storage/input/0.txt", "target_locale": "en-US"})
+
+    with PodcastJobLedger(str(tmp_path / "ledger.sqlite")) as ledger, PodcastGateway(client, ledger) as gateway:
+        server = PodcastGatewayServer(gateway, port=0)
+        try:
+            host, port = server.url[len("http://"):].split(":")
+
+            def request(method: str, path: str, request_body: bytes = None) -> tuple[int, object]:
+                connection = http.client.HTTPConnection(host, int(port), timeout=10)
+                try:
+                    connection.request(method, path, body=request_body)
+                    response = connection.getresponse()
+                    return response.status, orjson.loads(response.read())
+                finally:
+                    connection.close()
+
+            status, job = request("POST", "/jobs", body)
+            assert status == 202
+            assert request("POST", "/jobs", body)[0] == 200
+            assert request("POST", "/jobs", b"{}")[0] == 400
+
+            wait_until(lambda: request("GET", f"/jobs/{job['job_key']}")[1]["terminated"])
+            assert request("GET", f"/jobs/{job['job_key']}")[1]["status"] == "Succeeded"
+            assert request("GET", "/jobs/unknown")[0] == 404
+            assert request("GET", "/health") == (200, {"queued": 0, "running": 0})
+        finally:
+            server.close()
+
+
+@pytest.mark.parametrize("fake_service_config", [{"failure_ratio": 1}], indirect=True)
+def test_gateway_queues_failed_jobs_again(fake_service, make_client, tmp_path):
+    client = make_client(GenerationIdMode.Content)
+    item = build_items(1)[0]
+
+    with PodcastJobLedger(str(tmp_path / "ledger.sqlite")) as ledger, PodcastGateway(client, ledger) as gateway:
+        created, record = gateway.submit(item)
+        assert created
+        wait_until(lambda: gateway.find_job(record.job_key).terminated)
+        failed_record = gateway.find_job(record.job_key)
+        assert failed_record.failed
+
+        fake_service.config.failure_ratio = 0
+        created, record = gateway.submit(item)
+        assert created and record.queued and record.operation_location is None
+        wait_until(lambda: gateway.find_job(record.job_key).terminated)
+        record = gateway.find_job(record.job_key)
+
+        assert not gateway.submit(item)[0]
+
+    assert record.status == "Succeeded" and record.output_url is not None
+    assert record.generation_id == failed_record.generation_id
+    assert count_requests(fake_service, "PUT generation") == 2
@@ -0,0 +1,57 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import pytest
+
+from conftest import build_items, count_requests
+from microsoft_client_podcast.podcast_enum import GenerationIdMode
+
+
+def test_content_mode_reuses_the_existing_generation(fake_service, make_client):
+    client = make_client(GenerationIdMode.Content)
+    item = build_items(1)[0]
+
+    first = client.submit_generation(input_file_url=item.input_file_url, target_locale=item.target_locale)
+    second = client.submit_generation(input_file_url=item.input_file_url, target_locale=item.target_locale)
+
+    assert first[0] and second[0]
+    assert first[2] == second[2]
+    assert first[3].url == second[3].url
+    assert count_requests(fake_service, "PUT generation") == 1
+    assert fake_service.statistics()["generations"] == 1
+
+
+@pytest.mark.parametrize("fake_service_config", [{"error_ratio": 0.5, "seed": 1}], indirect=True)
+def test_content_mode_retries_failed_creates_without_duplicates(fake_service, make_client):
+    client = make_client(GenerationIdMode.Content)
+    items = build_items(5)
+
+    results = [client.submit_generation(input_file_url=item.input_file_url, target_locale=item.target_locale)
+               for item in items]
+
+    assert all(success for success, _, _, _ in results)
+    assert fake_service.statistics()["generations"] == len(items)
+    assert count_requests(fake_service, "failed") > 0
+
+
+@pytest.mark.parametrize("fake_service_config", [{"error_ratio": 1}], indirect=True)
+def test_timestamp_mode_sends_creates_once(fake_service, make_client):
+    client = make_client(GenerationIdMode.Timestamp)
+    item = build_items(1)[0]
+
+    success, error, _, _ = client.submit_generation(input_file_url=item.input_file_url, target_locale=item.target_locale)
+
+    assert not success
+    assert error.status == 503
+    assert count_requests(fake_service, "PUT generation") == 1
+
+
+@pytest.mark.parametrize("fake_service_config", [{"error_ratio": 1}], indirect=True)
+def test_content_mode_sends_creates_up_to_max_create_attempts(fake_service, make_client):
+    client = make_client(GenerationIdMode.Content)
+    item = build_items(1)[0]
+
+    success, _, _, _ = client.submit_generation(input_file_url=item.input_file_url, target_locale=item.target_locale)
+
+    assert not success
+    assert count_requests(fake_service, "PUT generation") == client.retry_policy.max_create_attempts
@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+from conftest import build_items, count_requests
+from microsoft_client_podcast.podcast_job_ledger import PodcastJobLedger
+
+
+def test_resumed_batch_does_not_create_submitted_items_again(fake_service, make_client, tmp_path):
+    client = make_client()
+    items = build_items(6)
+    ledger_path = str(tmp_path / "ledger.sqlite")
+
+    with PodcastJobLedger(ledger_path) as ledger:
+        results = client.create_generations_in_batch(items, max_concurrency=3, ledger=ledger)
+        first_result = next(results)
+        # The batch dies with generations still running.
+        results.close()
+        unfinished_generation_ids = {record.generation_id for record in ledger.iter_unfinished_jobs()}
+    assert first_result.success
+    assert unfinished_generation_ids
+    submitted_count = count_requests(fake_service, "PUT generation")
+
+    with PodcastJobLedger(ledger_path) as ledger:
+        results = list(client.create_generations_in_batch(items, max_concurrency=3, ledger=ledger))
+        records = list(ledger.iter_jobs())
+
+    assert len(results) == len(items)
+    assert all(result.success for result in results)
+    assert unfinished_generation_ids <= {result.generation_id for result in results}
+    assert submitted_count < len(items)
+    assert count_requests(fake_service, "PUT generation") == len(items)
+    assert all(record.terminated and record.output_url is not None for record in records)
+
+
+def test_resumed_batch_looks_up_interrupted_creates(fake_service, make_client, tmp_path):
+    client = make_client()
+    reached_service, lost = build_items(2)
+
+    with PodcastJobLedger(str(tmp_path / "ledger.sqlite")) as ledger:
+        for index, item in enumerate([reached_service, lost]):
+            generation_id = client.build_generation_id(item.target_locale, suffix=f"interrupted{index}")
+            operation_id = client.build_operation_id(generation_id)
+            ledger.record_submitting(ledger.build_job_key(item), generation_id, operation_id)
+            if item is reached_service:
+                success, error, _, _ = client.submit_generation(
+                    input_file_url=item.input_file_url,
+                    target_locale=item.target_locale,
+                    generation_id=generation_id,
+                    operation_id=operation_id)
+                assert success, error
+        submitted_count = count_requests(fake_service, "PUT generation")
+
+        results = list(client.create_generations_in_batch([reached_service, lost], ledger=ledger))
+        records = {record.job_key: record for record in ledger.iter_jobs()}
+
+    assert all(result.success for result in results)
+    # Only the create that never reached the service is sent again, with its recorded IDs.
+    assert count_requests(fake_service, "PUT generation") - submitted_count == 1
+    for result in results:
+        assert records[PodcastJobLedger.build_job_key(result.item)].generation_id == result.generation_id
+
+
+def test_ledger_folds_events_into_the_latest_record(tmp_path):
+    item = build_items(1)[0]
+    with PodcastJobLedger(str(tmp_path / "ledger.sqlite")) as ledger:
+        job_key = ledger.build_job_key(item)
+        ledger.record_queued(job_key, item)
+        assert ledger.find_job(job_key).queued
+
+        ledger.record_submitting(job_key, "generation", "operation")
+        record = ledger.find_job(job_key)
+        assert record.submitting and not record.submitted
+
+        ledger.record_submitted(job_key, "generation", "operation", "http://service/operations/operation")
+        record = ledger.find_job(job_key)
+        assert record.submitted and not record.terminated
+        assert ledger.decode_item(record.item) == item
@@ -0,0 +1,79 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+from datetime import datetime, timedelta, timezone
+
+from microsoft_speech_client_common.client_common_enum import OneApiState
+from microsoft_client_podcast.podcast_dataclass import PodcastGenerationDefinition
+from microsoft_client_podcast.podcast_enum import RetentionAgeField
+from microsoft_client_podcast.podcast_retention import (
+    PodcastRetentionPolicy, PodcastRetentionSelector, collect_generation_garbage
+)
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def build_generation(generation_id: str, age_days: float, status: OneApiState = OneApiState.Succeeded,
+                     **kwargs) -> PodcastGenerationDefinition:
+    return PodcastGenerationDefinition(
+        id=generation_id,
+        status=status,
+        createdDateTime=NOW - timedelta(days=age_days),
+        **kwargs)
+
+
+def select(policy: PodcastRetentionPolicy, generations: list) -> dict:
+    selector = PodcastRetentionSelector(policy, now=NOW)
+    results = [selector.offer(generation) for generation in generations]
+    return {result.generation_id: result.reason for result in results if result is not None}
+
+
+def test_max_age_selects_old_terminated_generations_only():
+    generations = [
+        build_generation("old", 40),
+        build_generation("old-failed", 40, OneApiState.Failed),
+        build_generation("old-running", 40, OneApiState.Running),
+        build_generation("recent", 10),
+        PodcastGenerationDefinition(id="no-timestamp", status=OneApiState.Succeeded),
+    ]
+
+    assert select(PodcastRetentionPolicy(max_age=timedelta(days=30)), generations) == \
+        {"old": "max_age", "old-failed": "max_age"}
+
+
+def test_keep_latest_selects_all_but_the_newest_in_any_order():
+    generations = [build_generation(f"generation-{age}", age) for age in [3, 1, 5, 2, 4]]
+
+    assert select(PodcastRetentionPolicy(keep_latest=2), generations) == {
+        "generation-3": "keep_latest",
+        "generation-4": "keep_latest",
+        "generation-5": "keep_latest",
+    }
+
+
+def test_age_field_can_be_the_last_action():
+    generations = [
+        build_generation("created-long-ago", 40, lastActionDateTime=NOW - timedelta(days=1)),
+        build_generation("acted-long-ago", 40, lastActionDateTime=NOW - timedelta(days=35)),
+    ]
+    policy = PodcastRetentionPolicy(max_age=timedelta(days=30), age_field=RetentionAgeField.LastActionDateTime)
+
+    assert select(policy, generations) == {"acted-long-ago": "max_age"}
+
+
+def test_collect_garbage_deletes_the_selected_generations():
+    generations = [build_generation(f"generation-{age}", age) for age in range(5)]
+    deleted = []
+
+    def delete_generation(generation_id: str) -> tuple[bool, str]:
+        deleted.append(generation_id)
+        return (False, "Conflict") if generation_id == "generation-4" else (True, None)
+
+    policy = PodcastRetentionPolicy(keep_latest=2)
+    dry_run = collect_generation_garbage(generations, delete_generation, policy, dry_run=True)
+    summary = collect_generation_garbage(generations, delete_generation, policy, deletes_per_second=100)
+
+    assert (dry_run.scanned, dry_run.selected, dry_run.deleted) == (5, 3, 0)
+    assert sorted(deleted) == ["generation-2", "generation-3", "generation-4"]
+    assert (summary.selected, summary.deleted, summary.failed) == (3, 2, 1)
+    assert summary.selected_by_status == {"Succeeded": 3}
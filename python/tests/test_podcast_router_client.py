@@ -0,0 +1,40 @@
+# Copyright (c) Microsoft. All rights reserved.
+# Licensed under the MIT license. See LICENSE.md file in the project root for full license information.
+
+import pytest
+
+from benchmark.fake_podcast_service import FakePodcastService, FakePodcastServiceConfig
+from conftest import build_items, count_requests
+from microsoft_speech_client_common.client_common_enum import OperationStatus
+from microsoft_client_podcast.podcast_enum import GenerationIdMode
+from microsoft_client_podcast.podcast_router_client import PodcastRouterBackend, PodcastRouterClient
+
+
+@pytest.fixture
+def failing_service():
+    service = FakePodcastService(FakePodcastServiceConfig(error_ratio=1)).start()
+    yield service
+    service.close()
+
+
+def test_router_fails_over_to_a_healthy_backend(fake_service, failing_service, make_client):
+    healthy_client = make_client(GenerationIdMode.Content)
+    failing_client = make_client(GenerationIdMode.Content, service=failing_service)
+    # The failing backend is placed first by its weight.
+    failing_backend = PodcastRouterBackend(failing_client, weight=10, name="failing")
+    healthy_backend = PodcastRouterBackend(healthy_client, name="healthy")
+    router = PodcastRouterClient([failing_backend, healthy_backend])
+    first, second = build_items(2)
+
+    success, error, generation_id, operation_location = router.submit_generation(
+        input_file_url=first.input_file_url, target_locale=first.target_locale)
+    assert success, error
+    assert not failing_backend.healthy and failing_backend.failover_count == 1
+    assert router.find_generation_owner(generation_id)[2] is healthy_backend
+
+    assert router.submit_generation(input_file_url=second.input_file_url, target_locale=second.target_locale)[0]
+    # The second create skipped the unhealthy backend.
+    assert count_requests(failing_service, "PUT generation") == failing_client.retry_policy.max_create_attempts
+    assert count_requests(fake_service, "PUT generation") == 2
+
+    assert router.request_operation_until_terminated(operation_location) == OperationStatus.Succeeded